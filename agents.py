@@ -0,0 +1,164 @@
+"""
+The page's 10 architect agents.
+- Each role (catalog "agents") reads its own sliders and looks after its own focus services.
+- A backend turns (role, sliders, selected services) into a proposal: RuleBasedBackend (the
+  default) explains which threshold rules fired for the role; LocalModelBackend prompts a local
+  model callable, a deterministic stand-in unless one is plugged in.
+- run_agents() runs the roles on a thread pool with a per-agent timeout and yields each proposal
+  as soon as it is ready; proposals are memoized on the sliders the role reads.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from catalog import PARAM_KEYS, PARAM_NAMES, get_catalog
+from sections import cached, memoized
+
+AGENT_BACKEND_ENV = "AI_ARCHITECT_AGENT_BACKEND"
+AGENT_TIMEOUT_S = 5.0
+AGENT_WORKERS = 16
+
+
+def focus_services(catalog, i, services):
+    """Agent i's focus services that are selected, in focus order."""
+    return [s for s in catalog.agents[i][2] if s in services]
+
+
+class RuleBasedBackend:
+    """Explains, per slider the role reads, which threshold rule fired and what it added."""
+
+    name = "rules"
+
+    def propose(self, catalog, i, params, services):
+        _, declared, focus = catalog.agents[i]
+        reads = catalog.agent_params(i)
+        reasoning = []
+        for idx, threshold, above, below in catalog.service_rules:
+            if idx not in reads:
+                continue
+            value = params[PARAM_KEYS[idx]]
+            fired = above if value > threshold else below
+            side = f"above {threshold}" if value > threshold else f"at or below {threshold}"
+            relevant = [s for s in fired if s in focus]
+            if relevant:
+                reasoning.append(f"{PARAM_NAMES[idx]} is {value} ({side}): {', '.join(relevant)}.")
+            elif idx in declared:
+                reasoning.append(f"{PARAM_NAMES[idx]} is {value} ({side}): nothing extra in this area.")
+        emitted = set().union(*(above + below for _, _, above, below in catalog.service_rules))
+        held_back = [s for s in focus if s in emitted and s not in services]
+        if held_back:
+            reasoning.append(f"Held back at these settings: {', '.join(held_back)}.")
+        return {"services": focus_services(catalog, i, services), "reasoning": reasoning}
+
+
+class StandInModel:
+    """Deterministic placeholder for a local model: prompt in, one recommendation per line out."""
+
+    def __init__(self, latency_s=0.1):
+        self.latency_s = latency_s
+
+    def __call__(self, prompt):
+        time.sleep(self.latency_s)
+        lines = []
+        for line in prompt.splitlines():
+            name, sep, value = line.removeprefix("- ").rpartition(": ")
+            if not (line.startswith("- ") and sep and value.isdigit()):
+                continue
+            v = int(value)
+            if v >= 8:
+                lines.append(f"{name} is a priority at {v}/10; favour managed, horizontally scalable options.")
+            elif v <= 3:
+                lines.append(f"{name} is low at {v}/10; prefer the simplest serverless option.")
+            else:
+                lines.append(f"{name} is moderate at {v}/10; keep the default design.")
+        selected = next((line.split(": ", 1)[1] for line in prompt.splitlines() if line.startswith("Selected for your area: ")), "")
+        lines.append(f"Recommended: {selected or 'the shared platform services'}.")
+        return "\n".join(lines)
+
+
+class LocalModelBackend:
+    """Prompts generate(prompt) -> text; each non-empty line of the reply is one reasoning step."""
+
+    name = "local-model"
+
+    def __init__(self, generate=None, latency_s=0.1):
+        self.generate = generate or StandInModel(latency_s)
+
+    def prompt(self, catalog, i, params, services):
+        role, _, focus = catalog.agents[i]
+        sliders = "\n".join(f"- {PARAM_NAMES[k]}: {params[PARAM_KEYS[k]]}" for k in catalog.agent_params(i))
+        return (f"You are the {role} architect for an AWS ML platform.\n"
+                f"Sliders (1-10):\n{sliders}\n"
+                f"Your area covers: {', '.join(focus)}\n"
+                f"Selected for your area: {', '.join(focus_services(catalog, i, services))}\n"
+                "Reply with one recommendation per line.")
+
+    def propose(self, catalog, i, params, services):
+        reply = self.generate(self.prompt(catalog, i, params, services))
+        return {"services": focus_services(catalog, i, services),
+                "reasoning": [line.strip().lstrip("-* ") for line in reply.splitlines() if line.strip()]}
+
+
+BACKENDS = {RuleBasedBackend.name: RuleBasedBackend, LocalModelBackend.name: LocalModelBackend}
+
+def get_backend(name=None):
+    """Backend instance by name, defaulting to $AI_ARCHITECT_AGENT_BACKEND or "rules"."""
+    name = name or os.environ.get(AGENT_BACKEND_ENV) or RuleBasedBackend.name
+    if name not in BACKENDS:
+        raise ValueError(f"unknown agent backend {name!r} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="agent")
+        return _pool
+
+def _proposal(role, backend, status, body=None, error=None):
+    return {"role": role, "backend": backend.name, "status": status,
+            "services": (body or {}).get("services", []), "reasoning": (body or {}).get("reasoning", []),
+            "error": error}
+
+def run_agents(params, services, backend=None, timeout_s=AGENT_TIMEOUT_S, catalog=None):
+    """Yield (agent index, proposal, memo hit) for every catalog agent, memo hits first, then as each finishes.
+
+    proposal["status"] is "ok", "timeout" (no answer within timeout_s of its own submission) or "error".
+    Each agent's deadline runs from its submit time, so time the caller spends between yields (e.g.
+    rendering a panel) only times out agents that really are still running. Only "ok" proposals are
+    memoized; one that finishes after its timeout is still stored for the next rerun.
+    """
+    cat = catalog or get_catalog()
+    backend = backend or get_backend()
+    deadlines = {}  # future -> (agent index, monotonic deadline)
+    for i, (role, _, _) in enumerate(cat.agents):
+        hit, proposal = cached(f"agent:{role}", params, cat, backend.name)
+        if hit:
+            yield i, proposal, True
+            continue
+
+        def build(i=i, role=role):
+            return _proposal(role, backend, "ok", backend.propose(cat, i, params, services))
+
+        future = _get_pool().submit(memoized, f"agent:{role}", params, build, None, cat, backend.name)
+        deadlines[future] = (i, time.monotonic() + timeout_s)
+    while deadlines:
+        wait_s = max(0.0, min(d for _, d in deadlines.values()) - time.monotonic())
+        done, _ = wait(deadlines, timeout=wait_s, return_when=FIRST_COMPLETED)
+        for future in sorted(done, key=lambda f: deadlines[f][0]):
+            i, _ = deadlines.pop(future)
+            try:
+                yield i, future.result(), False
+            except Exception as e:
+                yield i, _proposal(cat.agents[i][0], backend, "error", error=str(e)), False
+        now = time.monotonic()
+        for future, (i, deadline) in list(deadlines.items()):
+            if deadline <= now and not future.done():
+                del deadlines[future]
+                yield i, _proposal(cat.agents[i][0], backend, "timeout", error=f"no answer within {timeout_s:g}s"), False
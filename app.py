@@ -5,8 +5,38 @@ AI Architect with AWS Components (Slider-Driven Version)
 - Final AWS-based AI Architecture dynamically proposed + diagram.
 """
 
+import sqlite3
+import time
+
 import streamlit as st
 
+from agents import get_backend, run_agents
+from bulk import OUTPUT_FORMATS, detect_format, export_file, parquet_available, read_chunks, summarize
+from catalog import PARAM_NAMES, catalog_error, get_catalog
+from costs import get_cost_model, get_price_index
+from engine import build_report, evaluate
+from diagram_cache import DIAGRAM_CACHE, dot_to_svg
+from diagrams import CTO_PNG_ARGS, SECTION_GRAPHS
+from disk_cache import get_disk_cache
+from graph import to_dot, to_mermaid, to_png
+from metrics import REGISTRY, profiling_enabled, record_rerun
+from prewarm import prewarm_in_background
+from regions import get_region_table
+from sections import RerunTimer, memo_counts, memoized, section_deps
+from scenarios import get_scenario_store, parse_filter
+from solver import OBJECTIVES, solve
+from static_export import EXPORTS, export_key
+from sweep import METRICS, sweep_pairs, sweep_sliders
+
+# Per-section timings for this rerun (shown in the sidebar at the end)
+timer = RerunTimer()
+
+# Compiled rule catalog (cached per process, hot-reloaded when rules/catalog.json changes)
+catalog = get_catalog()
+
+# Agent reasoning backend ("rules" unless $AI_ARCHITECT_AGENT_BACKEND picks another)
+agent_backend = get_backend()
+
 st.set_page_config(page_title="AI Architect with AWS Components", layout="wide")
 
 st.title("🤖 AI Architect with AWS Components")
@@ -16,93 +46,86 @@ st.caption("Set 10 architectural parameters below. Agentic AI Architects will pr
 # 10 Parameters via Sliders
 # --------------------------
 st.sidebar.header("⚙️ Configure AI Architecture Parameters")
-
-params = {
-    "Data Volume (1=GB, 10=PB)": st.sidebar.slider("Data Volume", 1, 10, 1),
-    "Data Variety (1=structured, 10=multi-modal)": st.sidebar.slider("Data Variety", 1, 10, 1),
-    "Real-Time Requirement (1=batch, 10=real-time)": st.sidebar.slider("Real-Time Requirement", 1, 10, 1),
-    "Model Complexity (1=basic ML, 10=advanced GenAI)": st.sidebar.slider("Model Complexity", 1, 10, 1),
-    "Scalability Need (1=small, 10=global enterprise)": st.sidebar.slider("Scalability Need", 1, 10, 1),
-    "Security & Compliance (1=basic, 10=finance/healthcare)": st.sidebar.slider("Security & Compliance", 1, 10, 9),
-    "Integration Needs (1=standalone, 10=deep ERP/SAP)": st.sidebar.slider("Integration Needs", 1, 10, 9),
-    "Cost Sensitivity (1=performance, 10=cost savings)": st.sidebar.slider("Cost Sensitivity", 1, 10, 1),
-    "Automation (1=manual, 10=full CI/CD)": st.sidebar.slider("Automation & CI/CD", 1, 10, 9),
-    "User Experience (1=API only, 10=rich end-user app)": st.sidebar.slider("User Experience Priority", 1, 10, 1),
-}
+if catalog_error():
+    st.sidebar.warning(f"Rule catalog reload failed; still using version {catalog.version}.\n\n{catalog_error()}")
+# Opt-in: per-step timings, a waterfall at the bottom of the page and OpenMetrics export (metrics.py)
+timer.profile = st.sidebar.toggle("🔬 Profile reruns", value=profiling_enabled(),
+                                  help="Time every section step, show a waterfall and export OpenMetrics.")
+
+def show_graph(graph):
+    """Render a diagram once per distinct graph (server-side SVG, shared across sessions)."""
+    with timer.step(f"{graph.name} dot"):
+        dot = to_dot(graph)
+    with timer.step(f"{graph.name} svg"):
+        svg = dot_to_svg(dot)
+    if svg is None:
+        # No Graphviz executable on this host: let the browser lay it out
+        st.graphviz_chart(dot, use_container_width=True)
+    else:
+        st.image(svg, use_container_width=True)
+    with st.expander("Mermaid source"), timer.step(f"{graph.name} mermaid"):
+        st.code(to_mermaid(graph), language="mermaid")
+
+with timer.section("widgets"):
+    params = {
+        "Data Volume (1=GB, 10=PB)": st.sidebar.slider("Data Volume", 1, 10, 1),
+        "Data Variety (1=structured, 10=multi-modal)": st.sidebar.slider("Data Variety", 1, 10, 1),
+        "Real-Time Requirement (1=batch, 10=real-time)": st.sidebar.slider("Real-Time Requirement", 1, 10, 1),
+        "Model Complexity (1=basic ML, 10=advanced GenAI)": st.sidebar.slider("Model Complexity", 1, 10, 1),
+        "Scalability Need (1=small, 10=global enterprise)": st.sidebar.slider("Scalability Need", 1, 10, 1),
+        "Security & Compliance (1=basic, 10=finance/healthcare)": st.sidebar.slider("Security & Compliance", 1, 10, 9),
+        "Integration Needs (1=standalone, 10=deep ERP/SAP)": st.sidebar.slider("Integration Needs", 1, 10, 9),
+        "Cost Sensitivity (1=performance, 10=cost savings)": st.sidebar.slider("Cost Sensitivity", 1, 10, 1),
+        "Automation (1=manual, 10=full CI/CD)": st.sidebar.slider("Automation & CI/CD", 1, 10, 9),
+        "User Experience (1=API only, 10=rich end-user app)": st.sidebar.slider("User Experience Priority", 1, 10, 1),
+    }
 
 # --------------------------
-# Agent Roles
+# Agent Roles (catalog "agents"; each reads its own sliders, see agents.py)
 # --------------------------
-AGENT_ROLES = [
-    "Data Ingestion & Storage",
-    "Processing & ETL",
-    "Modeling & LLMs",
-    "Knowledge Graph & Search",
-    "Integration",
-    "Infrastructure & Deployment",
-    "Scalability",
-    "Monitoring & Observability",
-    "Security & Compliance",
-    "UX & APIs"
-]
+AGENT_ROLES = [role for role, _, _ in catalog.agents]
+
+def show_agent(i, proposal):
+    role = AGENT_ROLES[i]
+    st.markdown(f"### {i+1}. {role}")
+    if proposal["status"] != "ok":
+        st.warning(f"{role} agent {proposal['status']}: {proposal['error']}")
+        return
+    st.write(f"As {role}, I recommend AWS components based on your parameters.")
+    st.write(f"**Candidate Services:** {', '.join(proposal['services']) or 'none beyond the shared platform'}")
+    st.markdown("\n".join(f"- {line}" for line in proposal["reasoning"]))
 
 # --------------------------
 # Agent Proposals (based on slider values)
 # --------------------------
 st.markdown("## 🔎 10 Agent Proposals")
 
-def map_services(params):
-    """Map slider values to AWS service recommendations."""
-    services = set(["S3"])  # Always central
-    
-    if params["Data Volume (1=GB, 10=PB)"] > 7:
-        services.update(["Redshift", "Glue"])
-    else:
-        services.update(["RDS", "DynamoDB"])
-    
-    if params["Data Variety (1=structured, 10=multi-modal)"] > 6:
-        services.update(["S3", "OpenSearch", "Kendra"])
-    
-    if params["Real-Time Requirement (1=batch, 10=real-time)"] > 6:
-        services.update(["Kinesis", "MSK", "Lambda"])
-    
-    if params["Model Complexity (1=basic ML, 10=advanced GenAI)"] > 6:
-        services.update(["Bedrock", "SageMaker"])
-    else:
-        services.update(["Comprehend"])
-    
-    if params["Scalability Need (1=small, 10=global enterprise)"] > 7:
-        services.update(["ECS Fargate", "EKS", "CloudFront"])
-    else:
-        services.update(["Lambda", "API Gateway"])
-    
-    if params["Security & Compliance (1=basic, 10=finance/healthcare)"] > 7:
-        services.update(["IAM", "KMS", "GuardDuty", "Macie"])
-    else:
-        services.update(["IAM"])
-    
-    if params["Integration Needs (1=standalone, 10=deep ERP/SAP)"] > 7:
-        services.update(["AppFlow", "StepFunctions"])
-    
-    if params["Cost Sensitivity (1=performance, 10=cost savings)"] > 7:
-        services.update(["S3 Intelligent-Tiering", "Spot Instances"])
-    
-    if params["Automation (1=manual, 10=full CI/CD)"] > 6:
-        services.update(["CodePipeline", "CodeBuild"])
-    
-    if params["User Experience (1=API only, 10=rich end-user app)"] > 6:
-        services.update(["Amplify", "CloudFront", "QuickSight"])
-    
-    return services
-
-# Run agents
-all_services = map_services(params)
-cols = st.columns(2)
-for i, role in enumerate(AGENT_ROLES):
-    with cols[i % 2]:
-        st.markdown(f"### {i+1}. {role}")
-        st.write(f"As {role}, I recommend AWS components based on your parameters.")
-        st.write(f"**Candidate Services:** {', '.join(sorted(all_services))}")
+# Run agents (every output comes from the precomputed threshold-region table)
+with timer.section("engine"):
+    with timer.step("region table"):
+        region_table = get_region_table(catalog)
+    with timer.step("region lookup"):
+        result = region_table.lookup(params)
+    if timer.profile:
+        # Also time the per-stage rule evaluation the region table has precomputed
+        evaluate(params, catalog, timer.step)
+    all_services = set(result["selected_services"])
+
+with timer.section("agents"):
+    # One placeholder per agent; each panel streams in as its agent finishes
+    cols = st.columns(2)
+    slots = [cols[i % 2].empty() for i in range(len(AGENT_ROLES))]
+    for i, role in enumerate(AGENT_ROLES):
+        slots[i].markdown(f"### {i+1}. {role}\n\n_Thinking…_")
+    hits = []
+    for i, proposal, hit in run_agents(params, all_services, agent_backend, catalog=catalog):
+        hits.append(hit)
+        with slots[i].container():
+            show_agent(i, proposal)
+    timer.mark("agents", hit=all(hits))
+
+# First paint is out; load the plotting stack for the CTO section off the critical path
+prewarm_in_background()
 
 # --------------------------
 # Synthesized Architecture
@@ -110,46 +133,43 @@ for i, role in enumerate(AGENT_ROLES):
 st.markdown("---")
 st.markdown("## 🏗️ Synthesized AWS Architecture")
 
-st.success("✅ Final selected AWS services:")
-st.write(", ".join(sorted(all_services)))
+with timer.section("architecture"):
+    st.success("✅ Final selected AWS services:")
+    st.write(memoized("architecture", params, lambda: ", ".join(sorted(all_services)), timer, catalog))
+
+# --------------------------
+# Estimated Monthly Cost
+# --------------------------
+st.markdown("## 💰 Estimated Monthly Cost")
+
+@st.fragment
+def cost_estimate(services):
+    # Fragment: switching the pricing region reruns only this section
+    default_region = get_cost_model(catalog=catalog).region
+    regions = [r for r in get_price_index().regions if r != "global"] or [default_region]
+    region = st.selectbox("Pricing region", regions, index=regions.index(default_region) if default_region in regions else 0,
+                          key="pricing_region")
+    model = get_cost_model(region, catalog)
+    st.metric(f"Reference workload at on-demand list prices ({region})", f"${model.monthly_cost(services):,.2f} / month")
+    st.dataframe(
+        [{"service": r["service"], "usage": r["note"] or r["usage_type"], "quantity": f"{r['quantity']:,} {r['unit']}",
+          "unit price": f"${r['unit_price']:.8g}", "monthly": f"${r['monthly']:,.2f}"} for r in model.breakdown(services)],
+        use_container_width=True,
+        hide_index=True,
+    )
+    if model.unpriced:
+        st.caption("No price found for: " + ", ".join(f"{svc} ({usage})" for svc, _, _, usage in model.unpriced))
+
+with timer.section("cost"):
+    cost_estimate(sorted(all_services))
 
 # --------------------------
 # Architecture Diagram
 # --------------------------
 st.markdown("## 🗺️ AWS Architecture Diagram")
 
-dot_lines = [
-    "digraph AWSArch {",
-    "rankdir=LR;",
-    'node [shape=box, style="rounded,filled", fillcolor="#F2F4F8"];'
-]
-
-# Add nodes
-for s in all_services:
-    dot_lines.append(f'"{s}" [label="{s}"];')
-
-# Core flow
-edges = [
-    ("Client", "API Gateway"),
-    ("API Gateway", "Lambda"),
-    ("Lambda", "S3"),
-    ("Lambda", "Redshift"),
-    ("Lambda", "OpenSearch"),
-    ("Lambda", "Bedrock"),
-    ("Lambda", "SageMaker"),
-    ("Lambda", "Comprehend"),
-    ("Lambda", "Neptune"),
-    ("Lambda", "Kinesis"),
-    ("Lambda", "CodePipeline"),
-    ("Lambda", "CloudWatch"),
-]
-for a, b in edges:
-    if a in all_services or a == "Client":
-        if b in all_services:
-            dot_lines.append(f'"{a}" -> "{b}";')
-
-dot_lines.append("}")
-st.graphviz_chart("\n".join(dot_lines), use_container_width=True)
+with timer.section("services_diagram"):
+    show_graph(memoized("services_diagram", params, lambda: SECTION_GRAPHS["services_diagram"](result, catalog), timer, catalog))
 
 # --------------------------
 # Final Notes
@@ -164,282 +184,159 @@ st.write("This AI Architect app dynamically reasons using 10 architectural param
 # --------------------------
 st.markdown("## 🗺️ ML Lifecycle Architecture Diagram")
 
-ml_nodes = []
-
-# Data Pipeline
-ml_nodes.append("Data Ingestion")
-ml_nodes.append("Data Storage")
-if params["Data Variety (1=structured, 10=multi-modal)"] > 5:
-    ml_nodes.append("Data Preprocessing")
-    ml_nodes.append("Feature Engineering")
-    ml_nodes.append("Data Labeling")
-else:
-    ml_nodes.append("Basic Preprocessing")
-if params["Automation (1=manual, 10=full CI/CD)"] > 6:
-    ml_nodes.append("Data Versioning")
-
-# Model Development
-ml_nodes.append("Problem Statement")
-if params["Model Complexity (1=basic ML, 10=advanced GenAI)"] > 6:
-    ml_nodes.append("Model Selection (LLM/Deep Learning)")
-else:
-    ml_nodes.append("Model Selection (Traditional ML)")
-ml_nodes.append("Model Training")
-ml_nodes.append("Hyperparameter Tuning")
-ml_nodes.append("Model Evaluation")
-if params["Automation (1=manual, 10=full CI/CD)"] > 7:
-    ml_nodes.append("Model Registry")
-
-# Deployment & Ops
-ml_nodes.append("Model Packaging")
-ml_nodes.append("Model Deployment")
-ml_nodes.append("API/Serving Layer")
-ml_nodes.append("Inference Service")
-ml_nodes.append("Model Monitoring")
-ml_nodes.append("Feedback Loop")
-ml_nodes.append("Orchestration")
-
-if params["Real-Time Requirement (1=batch, 10=real-time)"] > 6:
-    ml_nodes.append("Real-Time Inference")
-else:
-    ml_nodes.append("Batch Inference")
-
-if params["Security & Compliance (1=basic, 10=finance/healthcare)"] > 7:
-    ml_nodes.append("Retraining with Compliance Checks")
-else:
-    ml_nodes.append("Periodic Model Retraining")
-
-# Build Graphviz pipeline
-dot_lines = [
-    "digraph MLArch {",
-    "rankdir=LR;",
-    'node [shape=box, style="rounded,filled", fillcolor="#E8F0FE"];'
-]
-
-for i in range(len(ml_nodes)-1):
-    dot_lines.append(f'"{ml_nodes[i]}" -> "{ml_nodes[i+1]}";')
-
-dot_lines.append("}")
-
-st.graphviz_chart("\n".join(dot_lines), use_container_width=True)
-
-st.success("✅ This ML lifecycle diagram adapts dynamically based on your 10 slider parameters, "
-           "showing how an AI Architect would structure the full end-to-end pipeline.")
-
-# Build Graphviz clustered pipeline
-dot_lines = [
-    "digraph MLArch {",
-    "rankdir=TB;",  # Top-to-Bottom for readability
-    'node [shape=box, style="rounded,filled", fillcolor="#E8F0FE", fontsize=12];',
-
-    # Data Pipeline cluster
-    "subgraph cluster_data {",
-    'label="📂 Data Pipeline"; fontsize=14; style="rounded,filled"; fillcolor="#F1F8E9";',
-]
-for step in [n for n in ml_nodes if "Data" in n or "Feature" in n or "Preprocessing" in n]:
-    dot_lines.append(f'"{step}";')
-dot_lines.append("}")
-
-# Model Development cluster
-dot_lines.append("subgraph cluster_model {")
-dot_lines.append('label="🤖 Model Development & Training"; fontsize=14; style="rounded,filled"; fillcolor="#E3F2FD";')
-for step in [n for n in ml_nodes if "Model" in n or "Problem" in n or "Hyperparameter" in n or "Evaluation" in n]:
-    dot_lines.append(f'"{step}";')
-dot_lines.append("}")
-
-# Deployment cluster
-dot_lines.append("subgraph cluster_deploy {")
-dot_lines.append('label="🚀 Deployment & MLOps"; fontsize=14; style="rounded,filled"; fillcolor="#FFF3E0";')
-for step in [n for n in ml_nodes if step not in ["Data Ingestion","Data Storage","Data Preprocessing","Feature Engineering","Data Labeling","Data Versioning","Basic Preprocessing","Problem Statement","Model Selection (LLM/Deep Learning)","Model Selection (Traditional ML)","Model Training","Hyperparameter Tuning","Model Evaluation","Model Registry"]]:
-    dot_lines.append(f'"{step}";')
-dot_lines.append("}")
-
-# Arrows between clusters
-dot_lines.append('"Data Ingestion" -> "Problem Statement";')
-dot_lines.append('"Model Evaluation" -> "Model Packaging";')
-
-dot_lines.append("}")
-
-st.graphviz_chart("\n".join(dot_lines), use_container_width=True)
+# Depends only on Variety, Real-Time, Model Complexity, Security and Automation
+with timer.section("ml_diagrams"):
+    ml_graph, ml_stages = memoized("ml_diagrams", params, lambda: SECTION_GRAPHS["ml_diagrams"](result, catalog), timer, catalog)
+    show_graph(ml_graph)
+
+    st.success("✅ This ML lifecycle diagram adapts dynamically based on your 10 slider parameters, "
+               "showing how an AI Architect would structure the full end-to-end pipeline.")
+
+    show_graph(ml_stages)
 
 
 # --------------------------
 # FINAL ENTERPRISE-GRADE VALIDATION + REPORT (append at very bottom)
 # --------------------------
 import json
-from datetime import datetime
 
 st.markdown("---")
 st.markdown("## 🏁 Final Architecture Validator & Report")
 
-# Inputs from existing computed variables:
-# - all_services (set of AWS components chosen earlier)
-# - ml_nodes (list of ML pipeline nodes chosen earlier)
-# - params (slider dict)
-
-# If names differ in your file, adapt variable names accordingly.
-try:
-    selected_services = set(all_services)
-    ml_pipeline = list(ml_nodes)
-    slider_params = dict(params)
-except Exception:
-    # safety: try old variable names or empty defaults
-    selected_services = set(globals().get("all_services", []))
-    ml_pipeline = list(globals().get("ml_nodes", []))
-    slider_params = dict(globals().get("params", {}))
-
-# ---------- Enterprise rules & mappings ----------
-WELL_ARCH_PILLARS = ["Security", "Reliability", "Performance", "Cost Optimization", "Operational Excellence"]
-
-# Minimal service-to-pillar mapping rules (expandable)
-PILLAR_RULES = {
-    "Security": {"required": ["IAM", "KMS", "GuardDuty", "Macie"], "optional": ["VPC"]},
-    "Reliability": {"required": ["S3", "Lambda", "API Gateway"], "optional": ["SQS", "Step Functions"]},
-    "Performance": {"required": ["OpenSearch", "SageMaker", "Bedrock", "ECS Fargate"], "optional": ["EKS", "CloudFront"]},
-    "Cost Optimization": {"required": ["S3 Intelligent-Tiering", "Spot Instances"], "optional": ["S3 lifecycle"]},
-    "Operational Excellence": {"required": ["CloudWatch", "CodePipeline"], "optional": ["X-Ray", "OpenTelemetry"]}
-}
-
-# ML lifecycle expected components for production-grade systems
-ML_EXPECTED = {
-    "Data": ["Data Ingestion", "Data Storage", "Data Preprocessing", "Feature Engineering", "Data Versioning"],
-    "Modeling": ["Problem Statement", "Model Selection", "Model Training", "Hyperparameter Tuning", "Model Evaluation", "Model Registry"],
-    "Deployment": ["Model Packaging", "Model Deployment", "API/Serving Layer", "Inference Service", "Model Monitoring", "Feedback Loop", "Orchestration"]
-}
-
-# Role mapping suggestions
-ROLE_MAP = {
-    "S3": "Data Engineering",
-    "Redshift": "Data Engineering",
-    "RDS": "Data Engineering",
-    "OpenSearch": "Search/IR Team",
-    "Neptune": "Knowledge Engineering",
-    "Bedrock": "ML Platform / ML Engineers",
-    "SageMaker": "ML Platform / ML Engineers",
-    "Lambda": "Platform / Backend Engineers",
-    "API Gateway": "Backend / Integration",
-    "Step Functions": "Platform / Orchestration",
-    "Kinesis": "Data Streaming",
-    "CloudWatch": "Observability",
-    "KMS": "Security",
-    "GuardDuty": "Security",
-    "Macie": "Security",
-    "CodePipeline": "DevOps",
-    "ECS Fargate": "Platform / Infra",
-    "EKS": "Platform / Infra",
-    "Comprehend": "NLP Team",
-    "HealthLake": "Healthcare Data Team"
-}
-
-# ---------- Validation functions ----------
-def check_pillars(services):
-    results = {}
-    service_names = set(s for s in services)
-    for pillar, rules in PILLAR_RULES.items():
-        found_required = [s for s in rules["required"] if s in service_names]
-        missing_required = [s for s in rules["required"] if s not in service_names]
-        # A pillar passes if at least half of required are present (tunable)
-        pass_threshold = max(1, len(rules["required"]) // 2)
-        passed = len(found_required) >= pass_threshold
-        results[pillar] = {
-            "passed": passed,
-            "found_required": found_required,
-            "missing_required": missing_required,
-            "notes": f"Found {len(found_required)} of {len(rules['required'])} required services."
-        }
-    return results
-
-def check_ml_coverage(pipeline):
-    coverage = {}
-    pipeline_set = set(pipeline)
-    for area, comps in ML_EXPECTED.items():
-        found = [c for c in comps if c in pipeline_set]
-        missing = [c for c in comps if c not in pipeline_set]
-        coverage[area] = {"found": found, "missing": missing, "complete": len(missing) == 0}
-    return coverage
-
-def compute_confidence(pillar_results, ml_coverage, params):
-    # Heuristic confidence: pillar pass count + ML coverage + param alignment
-    pillar_score = sum(1 for v in pillar_results.values() if v["passed"]) / len(pillar_results)
-    ml_score = sum(1 for v in ml_coverage.values() if v["complete"]) / len(ml_coverage)
-    # parameter sanity: if high security slider and security services present, good
-    security_need = params.get("Security & Compliance (1=basic, 10=finance/healthcare)", 5)
-    has_security = any(s in selected_services for s in ["KMS", "GuardDuty", "Macie", "IAM"])
-    param_score = 1.0 if (security_need > 7 and has_security) or (security_need <= 7) else 0.5
-    # final scaled score out of 100
-    final = (0.5 * pillar_score + 0.35 * ml_score + 0.15 * param_score) * 100
-    return round(final, 1)
-
-def remediation_suggestions(pillar_results, ml_coverage):
-    rem = []
-    for p, res in pillar_results.items():
-        if not res["passed"]:
-            rem.append(f"For pillar **{p}**, missing required services: {', '.join(res['missing_required'])}. Suggest adding at least one of them or an equivalent managed service.")
-    for area, cov in ml_coverage.items():
-        if not cov["complete"]:
-            rem.append(f"ML area **{area}** missing components: {', '.join(cov['missing'])}. Add these to reach production maturity.")
-    if not rem:
-        rem.append("No immediate remediation required; architecture satisfies baseline enterprise checks.")
-    return rem
-
-def map_roles(services):
-    role_assign = {}
-    for s in services:
-        role_assign[s] = ROLE_MAP.get(s, "Platform / Engineering")
-    return role_assign
-
 # ---------- Run checks ----------
-pillar_results = check_pillars(selected_services)
-ml_coverage = check_ml_coverage(ml_pipeline)
-confidence = compute_confidence(pillar_results, ml_coverage, slider_params)
-remediations = remediation_suggestions(pillar_results, ml_coverage)
-roles = map_roles(selected_services)
+pillar_results = result["pillar_checks"]
+ml_coverage = result["ml_coverage"]
+confidence = result["confidence"]
+remediations = result["remediation"]
+roles = result["role_mapping"]
+
+def validator_lines():
+    pillar_lines = []
+    for p, r in pillar_results.items():
+        status = "PASS" if r["passed"] else "WARN"
+        pillar_lines.append(f"- **{p}**: {status} — {r['notes']}")
+        if r["missing_required"]:
+            pillar_lines.append(f"  - Missing: {', '.join(r['missing_required'])}")
+    coverage_lines = []
+    for area, cov in ml_coverage.items():
+        coverage_lines.append(f"- **{area}**: {'COMPLETE' if cov['complete'] else 'INCOMPLETE'}")
+        if cov["missing"]:
+            coverage_lines.append(f"  - Missing components: {', '.join(cov['missing'])}")
+    remediation_lines = [f"- {r}" for r in remediations]
+    role_lines = [f"- **{svc}** → {role}" for svc, role in sorted(roles.items())]
+    return pillar_lines, coverage_lines, remediation_lines, role_lines
 
 # ---------- Display results ----------
-st.markdown("### ✅ Well-Architected Pillar Check")
-for p, r in pillar_results.items():
-    status = "PASS" if r["passed"] else "WARN"
-    color = "green" if r["passed"] else "orange"
-    st.markdown(f"- **{p}**: {status} — {r['notes']}")
-    if r["missing_required"]:
-        st.markdown(f"  - Missing: {', '.join(r['missing_required'])}")
-
-st.markdown("### ✅ ML Lifecycle Coverage")
-for area, cov in ml_coverage.items():
-    st.markdown(f"- **{area}**: {'COMPLETE' if cov['complete'] else 'INCOMPLETE'}")
-    if cov["missing"]:
-        st.markdown(f"  - Missing components: {', '.join(cov['missing'])}")
-
-st.markdown("### 🧾 Final Confidence Score")
-st.metric(label="Architecture Confidence (heuristic)", value=f"{confidence}%")
-
-st.markdown("### 🛠️ Remediation Suggestions")
-for r in remediations:
-    st.write(f"- {r}")
-
-st.markdown("### 👥 Suggested Role Ownership")
-for svc, role in sorted(roles.items()):
-    st.write(f"- **{svc}** → {role}")
+with timer.section("validator"):
+    pillar_lines, coverage_lines, remediation_lines, role_lines = memoized("validator", params, validator_lines, timer, catalog)
+
+    st.markdown("### ✅ Well-Architected Pillar Check")
+    for line in pillar_lines:
+        st.markdown(line)
+
+    st.markdown("### ✅ ML Lifecycle Coverage")
+    for line in coverage_lines:
+        st.markdown(line)
+
+    st.markdown("### 🧾 Final Confidence Score")
+    st.metric(label="Architecture Confidence (heuristic)", value=f"{confidence}%")
+
+    st.markdown("### 🛠️ Remediation Suggestions")
+    for line in remediation_lines:
+        st.write(line)
+
+    st.markdown("### 👥 Suggested Role Ownership")
+    for line in role_lines:
+        st.write(line)
 
 # ---------- Final report generation ----------
-report = {
-    "title": "AI Architect Final Report",
-    "generated_at": datetime.utcnow().isoformat() + "Z",
-    "brief_parameters": slider_params,
-    "selected_services": sorted(list(selected_services)),
-    "ml_pipeline": ml_pipeline,
-    "pillar_checks": pillar_results,
-    "ml_coverage": ml_coverage,
-    "confidence": confidence,
-    "remediation": remediations,
-    "role_mapping": roles
-}
+@st.fragment
+def download_report(report):
+    # Fragment + on_click="ignore": clicking a download never reruns the page.
+    # The report text is only serialized when a download is actually requested.
+    def report_text():
+        return json.dumps(report, indent=2)
+
+    st.download_button("Download architecture_report.json", data=report_text, file_name="architecture_report.json", mime="application/json", on_click="ignore")
+    st.download_button("Download architecture_report.txt", data=report_text, file_name="architecture_report.txt", mime="text/plain", on_click="ignore")
 
 st.markdown("---")
 st.markdown("## 📄 Download Final Architecture Report")
-report_text = json.dumps(report, indent=2)
-st.download_button("Download architecture_report.json", data=report_text, file_name="architecture_report.json", mime="application/json")
-st.download_button("Download architecture_report.txt", data=json.dumps(report, indent=2), file_name="architecture_report.txt", mime="text/plain")
+with timer.section("report"):
+    report = build_report(params, result, catalog)
+    if timer.profile:
+        # The download serializes lazily; time what a click would cost
+        with timer.step("json.dumps"):
+            json.dumps(report, indent=2)
+    download_report(report)
+
+EXPORT_POLL_S = 0.5
+
+def static_export(polling):
+    # Fragment: the HTML bundle builds on a background thread. While one is pending the
+    # fragment polls every EXPORT_POLL_S; a finished build ends polling with one full rerun.
+    # Costs are priced in the region picked under "Estimated Monthly Cost".
+    pricing_region = st.session_state.get("pricing_region")
+    job = EXPORTS.get(export_key(params, catalog, agent_backend, pricing_region))
+    if job is None or (job.done() and job.exception() is not None):
+        if job is not None:
+            st.warning(f"Static export failed: {job.exception()}")
+        if not st.button("Build static HTML export" if job is None else "Retry static HTML export"):
+            st.caption("A self-contained HTML page with every section and inlined SVG diagrams, "
+                       "for sharing without the live app.")
+            return
+        _, job = EXPORTS.submit(params, catalog, agent_backend, pricing_region)
+        if not job.done():
+            st.rerun()
+    if not job.done():
+        st.caption("⏳ Building the static export in the background…")
+        return
+    if polling:
+        st.rerun()
+    st.download_button("Download architecture_report.html", data=job.result, file_name="architecture_report.html",
+                       mime="text/html", on_click="ignore")
+
+with timer.section("static_export"):
+    pending = EXPORTS.get(export_key(params, catalog, agent_backend, st.session_state.get("pricing_region")))
+    pending = pending is not None and not pending.done()
+    st.fragment(static_export, run_every=EXPORT_POLL_S if pending else None)(pending)
+
+# ---------- Bulk scenarios ----------
+@st.fragment
+def bulk_scenarios():
+    # Fragment: uploads and format changes rerun only this expander; the export runs on click
+    with st.expander("📦 Bulk scenarios — score a CSV / JSONL file of slider settings"):
+        st.caption("CSV with a header of slider names, or JSONL with one slider object per line (optionally gzipped). "
+                   "Sliders left out use the sidebar defaults.")
+        upload = st.file_uploader("Scenario file", type=["csv", "jsonl", "ndjson", "gz"])
+        if upload is None:
+            return
+        try:
+            in_fmt = detect_format(upload.name)
+            key = f"bulk-summary:{upload.file_id}:{catalog.version}"
+            if key not in st.session_state:
+                upload.seek(0)
+                st.session_state[key] = summarize(read_chunks(upload, in_fmt), catalog)
+            summary = st.session_state[key]
+        except ValueError as e:
+            st.error(f"Cannot read {upload.name}: {e}")
+            return
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Scenarios", f"{summary['rows']:,}")
+        c2.metric("Distinct architectures", summary["architectures"])
+        if summary["rows"]:
+            c3.metric("Mean confidence", f"{summary['mean_confidence']}%",
+                      delta=f"{summary['min_confidence']}–{summary['max_confidence']}%", delta_color="off")
+        out_fmt = st.radio("Export format", OUTPUT_FORMATS if parquet_available() else OUTPUT_FORMATS[:1], horizontal=True)
+
+        def export():
+            upload.seek(0)
+            return export_file(upload, in_fmt, out_fmt, catalog)
+
+        st.download_button(f"Download architecture_reports.{out_fmt}", data=export, file_name=f"architecture_reports.{out_fmt}",
+                           mime="application/vnd.apache.parquet" if out_fmt == "parquet" else "application/gzip", on_click="ignore")
+
+bulk_scenarios()
 
 # ---------- Final advisory message ----------
 st.markdown("---")
@@ -453,8 +350,6 @@ st.info(
 # ---------------------------------------------------
 # FINAL CTO-GRADE ARCHITECTURE SYNTHESIS (at bottom)
 # ---------------------------------------------------
-import networkx as nx
-import matplotlib.pyplot as plt
 
 
 st.markdown("## 🚀 Final CTO-Grade AWS ML Architecture")
@@ -462,48 +357,225 @@ st.write("This section replaces the role of a human CTO. It generates a 100% acc
          "based on your 10 slider parameters. It selects AWS ML components, synthesizes a Fortune-500-grade design, "
          "and validates coverage across Data, ML, and MLOps lifecycle.")
 
-# Mapping 10 sliders -> AWS ML Components
-aws_ml_components = {
-    "Data Ingestion": ["Kinesis", "Glue", "DMS"],
-    "Data Storage": ["S3", "Redshift", "RDS"],
-    "Data Processing": ["Glue", "EMR", "Athena"],
-    "Feature Engineering": ["SageMaker Processing", "Glue DataBrew"],
-    "Model Training": ["SageMaker Training", "EC2 GPU"],
-    "Model Registry": ["SageMaker Model Registry"],
-    "Model Deployment": ["SageMaker Endpoints", "ECS/Fargate"],
-    "Inference": ["API Gateway", "Lambda", "SageMaker Real-Time"],
-    "Monitoring": ["SageMaker Model Monitor", "CloudWatch"],
-    "Security": ["IAM", "KMS", "Macie"]
-}
-
-# Dynamic Graph for CTO-Grade Architecture
-G = nx.DiGraph()
-
-# Add nodes & edges in order
-pipeline_flow = [
-    "Data Ingestion", "Data Storage", "Data Processing", "Feature Engineering",
-    "Model Training", "Model Registry", "Model Deployment",
-    "Inference", "Monitoring", "Security"
-]
-
-for i, step in enumerate(pipeline_flow):
-    for comp in aws_ml_components[step]:
-        G.add_node(comp, label=step)
-        if i > 0:
-            prev_step = pipeline_flow[i-1]
-            for prev_comp in aws_ml_components[prev_step]:
-                G.add_edge(prev_comp, comp)
-
-# Draw CTO-Grade Architecture
-fig, ax = plt.subplots(figsize=(14, 8))
-pos = nx.spring_layout(G, seed=42, k=0.5)
-nx.draw(G, pos, with_labels=True, node_size=4000, node_color="skyblue",
-        font_size=9, font_weight="bold", edge_color="gray", ax=ax)
-plt.title("CTO-Grade AWS ML Architecture", fontsize=16, fontweight="bold")
-st.pyplot(fig)
+# Dynamic Graph for CTO-Grade Architecture (catalog aws_ml_components, in pipeline order)
+# Layout and PNG are cached on the graph content; networkx and matplotlib are only imported on a miss
+with timer.section("cto"):
+    cto = memoized("cto", params, lambda: SECTION_GRAPHS["cto"](result, catalog), timer, catalog)
+    st.image(to_png(cto, step=timer.step, **CTO_PNG_ARGS), use_container_width=True)
 
 # Confidence Report
 st.markdown("### ✅ Final Architecture Report")
 st.success("All critical AWS ML components (Data, Processing, Training, Deployment, MLOps, Security) are covered.")
 st.info("This architecture follows AWS Well-Architected ML standards and can be directly used as a Fortune 500 reference.")
 
+
+# --------------------------
+# Regions Explorer
+# --------------------------
+@st.fragment
+def regions_explorer():
+    # Fragment: switching the grouping reruns only this expander
+    with st.expander("🧭 Regions Explorer — every distinct architecture the sliders can produce"):
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Threshold regions", region_table.n_regions)
+        c2.metric("Distinct architectures", region_table.n_architectures)
+        c3.metric("Distinct service sets", region_table.n_service_sets)
+        group = st.radio("Group regions by", ["services", "architecture"], horizontal=True)
+        st.caption(f"Current configuration is region #{region_table.region_index(params)}. "
+                   "Sliders not listed for a row can take any value without changing it.")
+        st.dataframe(
+            [
+                {**row, "share_of_space": f"{row['share_of_space']:.2%}",
+                 "affecting_sliders": "; ".join(f"{k} {v}" for k, v in row["affecting_sliders"].items())}
+                for row in region_table.explore(group)
+            ],
+            use_container_width=True,
+        )
+
+regions_explorer()
+
+# --------------------------
+# Inverse search
+# --------------------------
+@st.fragment
+def inverse_search():
+    # Fragment: the form and the search rerun only this expander
+    with st.expander("🎯 Inverse search — the cheapest slider settings that meet your targets"):
+        with st.form("inverse-search"):
+            pillars = st.multiselect("Pillars that must pass", list(catalog.pillar_rules))
+            areas = st.multiselect("ML areas that must be complete", list(catalog.ml_expected))
+            c1, c2, c3 = st.columns(3)
+            min_confidence = c1.slider("Minimum confidence", 0, 100, 70)
+            objective = c2.radio("Minimize", OBJECTIVES, format_func={"cost": "monthly cost", "complexity": "service count"}.get)
+            k = c3.number_input("Results", 1, 20, 5)
+            submitted = st.form_submit_button("Search")
+        if not submitted:
+            return
+        out = solve(pillars, areas, min_confidence, objective, int(k))
+        status = "optimal" if out["complete"] else "time budget hit, best found so far"
+        st.caption(f"{len(out['solutions'])} results ({status}) · {out['nodes']:,} nodes, "
+                   f"{out['pruned']:,} pruned · {out['elapsed_ms']:.0f} ms")
+        if out["infeasible"]:
+            st.warning(f"No settings meet these targets: {out['infeasible']}.")
+            return
+        st.dataframe(
+            [{"rank": i, "monthly_cost_usd": s["cost"], "services": s["services"], "confidence": s["confidence"],
+              "sliders": "; ".join(f"{name} {vals}" for name, vals in s["ranges"].items()),
+              "selected_services": ", ".join(s["selected_services"])}
+             for i, s in enumerate(out["solutions"], 1)],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+inverse_search()
+
+# --------------------------
+# What-if sweep
+# --------------------------
+SWEEP_METRICS = {"confidence": "Confidence (%)", "services_changed": "Services changed vs. current",
+                 "ml_changed": "ML nodes changed vs. current", "pillars_passed": "Pillars passed"}
+
+def heatmap(rows, x, y, metric, facet=None, columns=5, size=None):
+    spec = {"data": {"values": rows},
+            "mark": {"type": "rect", "tooltip": True},
+            "encoding": {"x": {"field": x, "type": "ordinal"}, "y": {"field": y, "type": "ordinal", "sort": None},
+                         "color": {"field": metric, "type": "quantitative", "title": SWEEP_METRICS[metric]}}}
+    if size:
+        spec["width"] = spec["height"] = size
+    if facet:
+        inner = {k: spec.pop(k) for k in ("mark", "encoding", "width", "height") if k in spec}
+        spec.update(facet={"field": facet, "type": "nominal", "sort": None, "title": None}, columns=columns, spec=inner)
+    st.vega_lite_chart(spec, use_container_width=not facet)
+
+@st.fragment
+def what_if_sweep():
+    # Fragment: the metric picker and the pairwise toggle rerun only this expander
+    with st.expander("🧭 What-if sweep — where each slider flips the design"):
+        metric = st.radio("Color by", METRICS, format_func=SWEEP_METRICS.get, horizontal=True)
+        out = sweep_sliders(params, catalog)
+        st.caption(f"{len(out['values']) * len(PARAM_NAMES)} one-slider scenarios around the current settings "
+                   f"in {out['elapsed_ms']:.1f} ms")
+        heatmap([{"slider": name, "value": v, metric: float(out[metric][k, i])}
+                 for k, name in enumerate(PARAM_NAMES) for i, v in enumerate(out["values"])], "value", "slider", metric)
+        if out["flips"]:
+            st.dataframe(
+                [{"slider": f["slider"], "step": f"{f['from']} → {f['to']}",
+                  "confidence": f"{f['confidence'][0]} → {f['confidence'][1]}",
+                  "services": ", ".join([f"+{s}" for s in f["added_services"]] + [f"−{s}" for s in f["removed_services"]]),
+                  "ML nodes": ", ".join([f"+{s}" for s in f["added_ml_nodes"]] + [f"−{s}" for s in f["removed_ml_nodes"]]),
+                  "pillars": ", ".join(f"{p} {state}" for p, state in f["pillars"].items())}
+                 for f in out["flips"]],
+                use_container_width=True,
+                hide_index=True,
+            )
+        if st.toggle("Pairwise grids (every slider pair over all its values)"):
+            pairs = sweep_pairs(params, catalog)
+            st.caption(f"{len(pairs['pairs'])} pairs × {len(pairs['values']) ** 2} settings in {pairs['elapsed_ms']:.1f} ms "
+                       "(rows: first slider of the pair, columns: second)")
+            grid = pairs[metric]
+            heatmap([{"pair": f"{a} × {b}", "second": vb, "first": va, metric: float(grid[p, i, j])}
+                     for p, (a, b) in enumerate(pairs["pairs"])
+                     for i, va in enumerate(pairs["values"]) for j, vb in enumerate(pairs["values"])],
+                    "second", "first", metric, facet="pair", size=90)
+
+what_if_sweep()
+
+# --------------------------
+# Saved scenarios
+# --------------------------
+@st.fragment
+def saved_scenarios():
+    # Fragment: saving, filtering and diffing rerun only this expander
+    with st.expander("🗂️ Saved scenarios — filter and diff configurations"):
+        try:
+            store = get_scenario_store(catalog)
+        except sqlite3.Error as e:
+            st.warning(f"Scenario store unavailable: {e}")
+            return
+        with st.form("save-scenario", clear_on_submit=True):
+            c1, c2 = st.columns([3, 1])
+            name = c1.text_input("Save the current sliders as", placeholder="e.g. GenAI, strict compliance")
+            if c2.form_submit_button("Save") and name.strip():
+                st.toast(f"Saved scenario #{store.save(name.strip(), params)}")
+        query = st.text_input("Filter", placeholder="e.g. Bedrock, not Lambda, confidence > 80")
+        try:
+            rows = store.find(**parse_filter(query, catalog)) if query.strip() else store.list(500)
+        except ValueError as e:
+            st.warning(str(e))
+            return
+        st.caption(f"{len(rows)} of {store.count()} saved scenarios")
+        if not rows:
+            return
+        st.dataframe([{**r, "created": time.strftime("%Y-%m-%d %H:%M", time.localtime(r["created"]))} for r in rows],
+                     use_container_width=True, hide_index=True)
+        labels = {r["id"]: f"#{r['id']} {r['name']}" for r in rows}
+        c1, c2 = st.columns(2)
+        a = c1.selectbox("Compare", list(labels), format_func=labels.get)
+        b = c2.selectbox("with", list(labels), index=min(1, len(labels) - 1), format_func=labels.get)
+        d = store.diff(a, b)
+        st.markdown(f"**Confidence:** {d['confidence'][0]}% → {d['confidence'][1]}%")
+        st.dataframe(
+            [{"what": "slider", "item": k, "change": f"{x} → {y}"} for k, (x, y) in d["sliders"].items()]
+            + [{"what": what, "item": item, "change": change}
+               for what, key in (("service", "services"), ("ML node", "ml_nodes"))
+               for change in ("added", "removed") for item in d[key][change]]
+            + [{"what": "pillar", "item": p, "change": f"{x} → {y}"} for p, (x, y) in d["pillars"].items()],
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(f"Nearest saved scenarios to #{a} (by services and ML nodes changed)")
+        st.dataframe(store.compare(a, limit=20), use_container_width=True, hide_index=True)
+
+saved_scenarios()
+
+# --------------------------
+# Rerun timings
+# --------------------------
+timing_rows = timer.finish()
+if timer.profile:
+    try:
+        record_rerun(timer)
+    except OSError as e:
+        st.sidebar.warning(f"Could not publish profiling metrics: {e}")
+with st.sidebar.expander("⏱️ Rerun timings"):
+    st.metric("This rerun", f"{timer.total_ms():.1f} ms",
+              delta=f"-{sum(r['saved_ms'] for r in timing_rows):.1f} ms from memoized sections", delta_color="off")
+    st.dataframe(
+        [{**r, "depends_on": ", ".join(k.split(" (")[0] for k in section_deps(catalog).get(r["section"], [])) or "-"}
+         for r in timing_rows],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+# --------------------------
+# Profile waterfall (opt-in)
+# --------------------------
+if timer.profile:
+    with st.expander("🔬 Rerun profile — section and step waterfall"):
+        spans = [{"span": ("  " * sp["depth"]) + sp["name"], "section": sp["section"], "start_ms": round(sp["start_ms"], 3),
+                  "end_ms": round(sp["start_ms"] + sp["ms"], 3), "ms": round(sp["ms"], 3)} for sp in timer.spans]
+        st.vega_lite_chart(
+            {"data": {"values": spans},
+             "mark": {"type": "bar", "tooltip": True},
+             "encoding": {"y": {"field": "span", "type": "nominal", "sort": None, "title": None},
+                          "x": {"field": "start_ms", "type": "quantitative", "title": "ms since rerun start"},
+                          "x2": {"field": "end_ms"},
+                          "color": {"field": "section", "type": "nominal", "legend": None}}},
+            use_container_width=True,
+        )
+        hits = {}
+        for (section, outcome), n in memo_counts().items():
+            hits.setdefault(section, {"section": section, "hit": 0, "miss": 0})[outcome] = n
+        st.caption("Memo lookups since the process started")
+        st.dataframe(list(hits.values()), use_container_width=True, hide_index=True)
+        cache = DIAGRAM_CACHE.stats()
+        st.caption(f"Diagram cache: {cache['hits']} hits, {cache['misses']} misses, {cache['evictions']} evictions, "
+                   f"{cache['bytes'] / 1e6:.1f} MB held")
+        disk = get_disk_cache()
+        if disk is not None:
+            stats = disk.stats()
+            st.caption(f"Disk cache ({stats['path']}): {stats['hits']} hits, {stats['misses']} misses, "
+                       f"{stats['entries']} entries, {stats['bytes'] / 1e6:.1f} of {stats['max_bytes'] / 1e6:.0f} MB, "
+                       f"{stats['evictions']} evictions")
+        st.download_button("Download metrics (OpenMetrics)", data=REGISTRY.render, file_name="ai_architect_metrics.txt",
+                           mime="text/plain", on_click="ignore")
@@ -0,0 +1,148 @@
+"""
+Load generator for the HTTP scoring service (server.py).
+- Starts `server.py --port 0` in a subprocess (or targets --url), then runs --concurrency
+  keep-alive clients that POST random slider dicts until --requests responses are in.
+- Reports p50 / p90 / p99 / max latency, requests and rows per second, and the server's
+  mean micro-batch size.
+
+    python benchmarks/http_load.py [--requests 5000] [--concurrency 64] [--rows 1]
+                                   [--window-ms 2] [--url http://127.0.0.1:8502] [--json load.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from engine import PARAM_NAMES, SLIDER_MAX, SLIDER_MIN  # noqa: E402
+
+
+def random_bodies(n, rows, seed):
+    """n request bodies, each one slider dict (rows == 1) or an array of rows dicts."""
+    rng = random.Random(seed)
+
+    def one():
+        return {name: rng.randint(SLIDER_MIN, SLIDER_MAX) for name in PARAM_NAMES}
+
+    return [json.dumps(one() if rows == 1 else [one() for _ in range(rows)]).encode() for _ in range(n)]
+
+async def request(reader, writer, host, method, path, body=b""):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+async def run_load(host, port, bodies, concurrency, warmup):
+    queue = list(reversed(bodies))
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while queue:
+                body = queue.pop()
+                start = time.perf_counter()
+                status, _ = await request(reader, writer, host, "POST", "/score", body)
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    # Warm-up connection: first lookup, JSON encoder, allocator
+    reader, writer = await asyncio.open_connection(host, port)
+    for body in bodies[:warmup]:
+        await request(reader, writer, host, "POST", "/score", body)
+    writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, health = await request(reader, writer, host, "GET", "/healthz")
+    writer.close()
+    return latencies, errors, elapsed, json.loads(health)
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1] if len(values) > 1 else values[0]
+
+def start_server(window_ms):
+    proc = subprocess.Popen([sys.executable, str(ROOT / "server.py"), "--port", "0", "--window-ms", str(window_ms)],
+                            cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line.startswith("Serving on "):
+        proc.kill()
+        raise SystemExit(f"server did not start: {line!r}")
+    return proc, line.split()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=1, help="slider dicts per request (>1 sends a JSON array)")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--window-ms", type=float, default=2.0, help="micro-batch window for the spawned server")
+    parser.add_argument("--url", help="target a running server instead of spawning one")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.window_ms)
+    parts = urlsplit(url)
+    try:
+        bodies = random_bodies(args.requests, args.rows, args.seed)
+        latencies, errors, elapsed, health = asyncio.run(
+            run_load(parts.hostname, parts.port, bodies, args.concurrency, min(args.warmup, args.requests)))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    result = {
+        "requests": len(latencies),
+        "rows_per_request": args.rows,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        "rows_per_s": round(len(latencies) * args.rows / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p90_ms": round(percentile(latencies, 90), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(max(latencies), 3),
+        "server": health,
+    }
+    print(f"{result['requests']} requests x {args.rows} rows, concurrency {args.concurrency}: "
+          f"{result['requests_per_s']:.0f} req/s ({result['rows_per_s']:.0f} rows/s), "
+          f"p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms, "
+          f"errors {errors}, mean server batch {health['mean_batch_rows']} rows")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Memory soak benchmark for the Streamlit page.
+- Drives many reruns through Streamlit's AppTest with random slider values.
+- Clears the diagram cache before each rerun (unless --keep-cache) so every rerun really
+  builds and rasterizes the CTO figure.
+- Fails if RSS keeps growing after warm-up or if any matplotlib figure stays alive.
+
+    python benchmarks/soak_memory.py --reruns 2000 [--json soak.json]
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def rss_mb():
+    """Current resident set size of this process in MB."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource  # peak RSS only; still catches unbounded growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def live_figures():
+    """(pyplot-managed figures, Figure objects still reachable anywhere)."""
+    import matplotlib.pyplot as plt
+    from matplotlib.figure import Figure
+    gc.collect()
+    return len(plt.get_fignums()), sum(isinstance(o, Figure) for o in gc.get_objects())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=2000)
+    parser.add_argument("--session-every", type=int, default=50, help="start a new AppTest session every N reruns")
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--max-growth-mb", type=float, default=30.0, help="allowed RSS growth after warm-up")
+    parser.add_argument("--keep-cache", action="store_true", help="do not clear the diagram cache between reruns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+
+    from diagram_cache import DIAGRAM_CACHE
+
+    rng = random.Random(args.seed)
+    app_path = str(ROOT / "app.py")
+    at = None
+    samples = []
+    start = time.perf_counter()
+    for i in range(args.reruns):
+        if at is None or i % args.session_every == 0:
+            at = AppTest.from_file(app_path, default_timeout=60)
+            at.run()
+        else:
+            for slider in at.sidebar.slider:
+                slider.set_value(rng.randint(1, 10))
+            if not args.keep_cache:
+                DIAGRAM_CACHE.clear()
+            at.run()
+        if at.exception:
+            raise SystemExit(f"rerun {i} raised: {at.exception}")
+        if i == args.warmup or (i > args.warmup and i % max(1, args.reruns // 20) == 0) or i == args.reruns - 1:
+            pyplot_figs, figure_objs = live_figures()
+            samples.append((i, rss_mb(), pyplot_figs, figure_objs))
+            print(f"rerun {i:>6}  rss={samples[-1][1]:8.1f} MB  pyplot_figures={pyplot_figs}  live_Figure_objects={figure_objs}")
+    elapsed = time.perf_counter() - start
+
+    # Compare medians of the two halves: single samples swing with allocator/GC timing
+    rss = [r for _, r, _, _ in samples]
+    half = max(1, len(rss) // 2)
+    growth = statistics.median(rss[half:]) - statistics.median(rss[:half])
+    print(f"{args.reruns} reruns in {elapsed:.1f}s ({elapsed / args.reruns * 1000:.1f} ms/rerun), "
+          f"median RSS growth after warm-up: {growth:+.1f} MB")
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "reruns": args.reruns, "elapsed_s": round(elapsed, 3), "ms_per_rerun": round(elapsed / args.reruns * 1000, 3),
+            "rss_growth_mb": round(growth, 2), "final_rss_mb": round(rss[-1], 1),
+            "leaked_figures": max(pyplot_figs + figure_objs for _, _, pyplot_figs, figure_objs in samples),
+        }, indent=2))
+    failures = []
+    if growth > args.max_growth_mb:
+        failures.append(f"median RSS grew {growth:.1f} MB after warm-up (limit {args.max_growth_mb} MB)")
+    if any(pyplot_figs or figure_objs for _, _, pyplot_figs, figure_objs in samples):
+        failures.append("matplotlib figures were left alive between reruns")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print("PASS: flat RSS and no leaked figures")
+
+
+if __name__ == "__main__":
+    main()
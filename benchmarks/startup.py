@@ -0,0 +1,132 @@
+"""
+Cold-start benchmark for the Streamlit page.
+- Import time per module, from `python -X importtime` in a fresh interpreter.
+- Time to first rendered element and to a full run of app.py under AppTest, also in a fresh
+  interpreter, plus which heavy modules were already loaded at first render.
+
+    python benchmarks/startup.py [--repeat 5] [--json startup.json] [--check]
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from prewarm import HEAVY_MODULES  # noqa: E402
+
+
+def app_imports(path=ROOT / "app.py"):
+    """Non-stdlib top-level packages app.py imports at module level, in import order."""
+    names = []
+    for node in ast.parse(Path(path).read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level:
+            names.append(node.module)
+    packages = (name.partition(".")[0] for name in names)
+    return list(dict.fromkeys(p for p in packages if p not in sys.stdlib_module_names))
+
+# What app.py imports at module level, then what it may import lazily
+APP_MODULES = app_imports()
+LAZY_MODULES = ["figures", *HEAVY_MODULES]
+
+FIRST_RENDER_PROBE = r"""
+import json, logging, sys, time
+t0 = time.perf_counter()
+logging.disable(logging.WARNING)
+from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+from streamlit.testing.v1 import AppTest
+heavy = json.loads(sys.argv[2])
+marks = {}
+original = ScriptRunContext.enqueue
+def enqueue(self, msg):
+    if "first" not in marks and msg.WhichOneof("type") == "delta":
+        marks["first"] = time.perf_counter()
+        marks["heavy_at_first"] = [m for m in heavy if m in sys.modules]
+    return original(self, msg)
+ScriptRunContext.enqueue = enqueue
+t_ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+t_done = time.perf_counter()
+print(json.dumps({
+    "harness_import_ms": (t_ready - t0) * 1000,
+    "first_render_ms": (marks.get("first", t_done) - t_ready) * 1000,
+    "full_run_ms": (t_done - t_ready) * 1000,
+    "heavy_at_first_render": marks.get("heavy_at_first", []),
+    "heavy_at_end": [m for m in heavy if m in sys.modules],
+    "exception": bool(at.exception),
+}))
+"""
+
+
+def import_times(modules):
+    """{module: (self_ms, cumulative_ms)} for top-level imports of modules, in one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    out = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        if name.startswith(" ") and not name.startswith("  "):  # top level only
+            out[name.strip()] = (int(self_us) / 1000, int(cum_us) / 1000)
+    return out
+
+def first_render():
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_RENDER_PROBE, str(ROOT / "app.py"), json.dumps(list(HEAVY_MODULES))],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        raise SystemExit(f"first-render probe failed:\n{proc.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--check", action="store_true", help="fail if a heavy module loads before first render")
+    args = parser.parse_args(argv)
+
+    results = {"app_imports": {}, "lazy_imports": {}, "runs": []}
+    print("Module import time (fresh interpreter, cumulative incl. dependencies not yet loaded)")
+    for label, modules in (("app_imports", APP_MODULES), ("lazy_imports", APP_MODULES + LAZY_MODULES)):
+        times = import_times(modules)
+        for name in modules if label == "app_imports" else LAZY_MODULES:
+            if name in times:
+                results[label][name] = {"self_ms": times[name][0], "cumulative_ms": times[name][1]}
+                shown = f"(lazy) {name}" if label == "lazy_imports" else name
+                print(f"  {shown:<40} {times[name][1]:8.1f} ms")
+    total = sum(v["cumulative_ms"] for v in results["app_imports"].values())
+    print(f"  {'total on the critical path':<40} {total:8.1f} ms")
+
+    for _ in range(args.repeat):
+        results["runs"].append(first_render())
+    for key in ("harness_import_ms", "first_render_ms", "full_run_ms"):
+        results[key] = statistics.median(r[key] for r in results["runs"])
+    heavy_first = sorted({m for r in results["runs"] for m in r["heavy_at_first_render"]})
+    results["heavy_at_first_render"] = heavy_first
+    print(f"Time to first render: {results['first_render_ms']:.1f} ms  "
+          f"full run: {results['full_run_ms']:.1f} ms  (median of {args.repeat} cold starts)")
+    print(f"Heavy modules loaded at first render: {', '.join(heavy_first) or 'none'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if any(r["exception"] for r in results["runs"]):
+        raise SystemExit("FAIL: app raised during a cold start")
+    if args.check and heavy_first:
+        raise SystemExit(f"FAIL: {', '.join(heavy_first)} imported before first render")
+
+
+if __name__ == "__main__":
+    main()
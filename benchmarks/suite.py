@@ -0,0 +1,313 @@
+"""
+Benchmark suite with a stored baseline.
+- micro: the scalar engine stages (map_services, check_pillars, check_ml_coverage,
+  compute_confidence, ...), the region lookup, batch scoring and DOT generation, timed with
+  timeit over a fixed set of random slider settings (best of several repeats).
+- macro: full-page reruns under Streamlit's AppTest across a seeded random slider sequence.
+- memory: the matplotlib (CTO graph) section rendered with the diagram cache cleared each time:
+  tracemalloc peak, RSS growth and Figure objects left alive.
+- startup / http / soak: the standalone scripts in this directory, run in a subprocess and
+  folded into the same results.
+
+Every metric says which direction is better and how much worse than the baseline it may get
+(tolerance as a ratio plus an absolute slack). Timings only compare on the host that recorded
+the baseline; refresh it with --save-baseline after an intended change or on a new machine.
+
+    python benchmarks/suite.py [--groups micro macro memory] [--json results.json]
+    python benchmarks/suite.py --save-baseline
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from soak_memory import live_figures, rss_mb  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+GROUPS = ("micro", "macro", "memory", "startup", "http", "soak")
+DEFAULT_GROUPS = ("micro", "macro", "memory")
+N_INPUTS = 256
+REPEAT = 7
+
+
+def metric(value, unit, better="lower", tolerance=0.25, slack=0.0):
+    """One result: a regression is worse than baseline * (1 +/- tolerance) -/+ slack."""
+    return {"value": round(value, 4), "unit": unit, "better": better, "tolerance": tolerance, "slack": slack}
+
+def random_params(n, seed):
+    from catalog import PARAM_KEYS
+    rng = random.Random(seed)
+    return [{k: rng.randint(1, 10) for k in PARAM_KEYS} for _ in range(n)]
+
+def per_call_us(fn, n_calls, repeat=REPEAT):
+    """(best, median) microseconds per call of fn(), which makes n_calls calls per invocation."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number / n_calls * 1e6 for t in timer.repeat(repeat, number)]
+    return min(runs), statistics.median(runs)
+
+
+# --------------------------
+# Groups
+# --------------------------
+def bench_micro(args):
+    from catalog import get_catalog
+    from diagrams import ml_stages_graph, services_graph
+    from engine import (build_ml_pipeline, check_ml_coverage, check_pillars, compute_confidence, evaluate,
+                        evaluate_batch, map_services, params_to_array)
+    from graph import to_dot
+    from regions import get_region_table
+
+    cat = get_catalog()
+    table = get_region_table(cat)
+    inputs = random_params(N_INPUTS, args.seed)
+    services = [map_services(p, cat) for p in inputs]
+    pipelines = [build_ml_pipeline(p, cat) for p in inputs]
+    pillars = [check_pillars(s, cat) for s in services]
+    coverage = [check_ml_coverage(m, cat) for m in pipelines]
+    rows = list(zip(inputs, services, pipelines, pillars, coverage))
+    batch = params_to_array(random_params(10_000, args.seed + 1))
+
+    cases = {
+        "map_services": lambda: [map_services(p, cat) for p in inputs],
+        "build_ml_pipeline": lambda: [build_ml_pipeline(p, cat) for p in inputs],
+        "check_pillars": lambda: [check_pillars(s, cat) for s in services],
+        "check_ml_coverage": lambda: [check_ml_coverage(m, cat) for m in pipelines],
+        "compute_confidence": lambda: [compute_confidence(pr, cv, p, s, cat) for p, s, _, pr, cv in rows],
+        "evaluate": lambda: [evaluate(p, cat) for p in inputs],
+        "region_lookup": lambda: [table.lookup(p) for p in inputs],
+        "services_dot": lambda: [to_dot(services_graph(s, cat)) for s in services],
+        "ml_stages_dot": lambda: [to_dot(ml_stages_graph(m, cat)) for m in pipelines],
+    }
+    out = {}
+    for name, fn in cases.items():
+        best, median = per_call_us(fn, N_INPUTS)
+        out[f"micro.{name}.us"] = metric(best, "us/call", tolerance=0.3, slack=0.5)
+        print(f"  {name:<22} {best:9.2f} us/call  (median {median:.2f})")
+    best, _ = per_call_us(lambda: evaluate_batch(batch, cat), len(batch), repeat=5)
+    out["micro.evaluate_batch.us"] = metric(best, "us/row", tolerance=0.3, slack=0.05)
+    print(f"  {'evaluate_batch':<22} {best:9.3f} us/row")
+    return out
+
+def bench_macro(args):
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120).run()
+    cold = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise SystemExit(f"FAIL: app raised on the first run: {at.exception}")
+    times = []
+    for i in range(args.warmup + args.reruns):
+        for slider in at.sidebar.slider:
+            slider.set_value(rng.randint(1, 10))
+        start = time.perf_counter()
+        at.run()
+        if i >= args.warmup:
+            times.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise SystemExit(f"FAIL: rerun {i} raised: {at.exception}")
+    times.sort()
+    p50, p95 = statistics.median(times), times[min(len(times) - 1, int(0.95 * len(times)))]
+    print(f"  first run {cold:.0f} ms, {len(times)} random reruns: p50 {p50:.1f} ms, p95 {p95:.1f} ms")
+    return {
+        "macro.first_run.ms": metric(cold, "ms", tolerance=0.5, slack=200),
+        "macro.rerun_p50.ms": metric(p50, "ms", tolerance=0.3, slack=10),
+        "macro.rerun_p95.ms": metric(p95, "ms", tolerance=0.5, slack=20),
+    }
+
+def bench_memory(args):
+    from catalog import get_catalog
+    from diagram_cache import DIAGRAM_CACHE
+    from diagrams import cto_graph
+    from graph import to_png
+
+    graph = cto_graph(get_catalog())
+
+    def render():
+        DIAGRAM_CACHE.clear()
+        return to_png(graph, "CTO-Grade AWS ML Architecture", "spring_layout", seed=42, k=0.5)
+
+    render()  # imports and font cache outside the measurement
+    gc.collect()
+    rss_start = rss_mb()
+    times = []
+    for _ in range(args.renders):
+        start = time.perf_counter()
+        render()
+        times.append((time.perf_counter() - start) * 1000)
+    growth = rss_mb() - rss_start
+    # A second pass under tracemalloc (which slows rendering down) for the Python-heap peak
+    tracemalloc.start()
+    peaks = []
+    for _ in range(max(1, args.renders // 2)):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        render()
+        peaks.append((tracemalloc.get_traced_memory()[1] - before) / 2**20)
+    tracemalloc.stop()
+    pyplot_figs, figure_objs = live_figures()
+    print(f"  {args.renders} uncached CTO renders: {statistics.median(times):.0f} ms each, "
+          f"peak {max(peaks):.1f} MB traced, RSS {growth:+.1f} MB, live figures {pyplot_figs + figure_objs}")
+    return {
+        "memory.cto_png.ms": metric(statistics.median(times), "ms", tolerance=0.3, slack=20),
+        "memory.cto_png.peak_mb": metric(max(peaks), "MB", tolerance=0.2, slack=1),
+        "memory.cto_png.rss_growth_mb": metric(growth, "MB", tolerance=0.0, slack=15),
+        "memory.cto_png.live_figures": metric(pyplot_figs + figure_objs, "figures", tolerance=0.0, slack=0),
+    }
+
+def _run_script(script, script_args):
+    """Run a sibling benchmark script with --json and return its parsed results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "result.json"
+        proc = subprocess.run([sys.executable, str(Path(__file__).resolve().parent / script), *script_args, "--json", str(out)],
+                              cwd=ROOT, capture_output=True, text=True)
+        if not out.exists():
+            raise SystemExit(f"FAIL: {script} produced no results:\n{(proc.stdout + proc.stderr)[-2000:]}")
+        print("  " + "\n  ".join(proc.stdout.strip().splitlines()[-2:]))
+        return json.loads(out.read_text()), proc.returncode
+
+def bench_startup(args):
+    res, _ = _run_script("startup.py", ["--repeat", "3"])
+    return {
+        "startup.first_render.ms": metric(res["first_render_ms"], "ms", tolerance=0.3, slack=50),
+        "startup.full_run.ms": metric(res["full_run_ms"], "ms", tolerance=0.3, slack=200),
+        "startup.heavy_at_first_render": metric(len(res["heavy_at_first_render"]), "modules", tolerance=0.0),
+    }
+
+def bench_http(args):
+    res, _ = _run_script("http_load.py", ["--requests", "3000", "--concurrency", "32", "--seed", str(args.seed)])
+    return {
+        "http.requests_per_s": metric(res["requests_per_s"], "req/s", better="higher", tolerance=0.3),
+        "http.p99.ms": metric(res["p99_ms"], "ms", tolerance=0.5, slack=5),
+        "http.errors": metric(res["errors"], "requests", tolerance=0.0),
+    }
+
+def bench_soak(args):
+    res, _ = _run_script("soak_memory.py", ["--reruns", "300", "--warmup", "50", "--seed", str(args.seed)])
+    return {
+        "soak.ms_per_rerun": metric(res["ms_per_rerun"], "ms", tolerance=0.3, slack=10),
+        "soak.rss_growth_mb": metric(res["rss_growth_mb"], "MB", tolerance=0.0, slack=30),
+        "soak.leaked_figures": metric(res["leaked_figures"], "figures", tolerance=0.0),
+    }
+
+BENCHES = {"micro": bench_micro, "macro": bench_macro, "memory": bench_memory,
+           "startup": bench_startup, "http": bench_http, "soak": bench_soak}
+
+
+# --------------------------
+# Baseline
+# --------------------------
+def host_info():
+    import numpy as np
+
+    from catalog import get_catalog
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    try:
+        import streamlit
+        streamlit_version = streamlit.__version__
+    except ImportError:
+        streamlit_version = None
+    return {
+        "created": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "streamlit": streamlit_version,
+        "catalog_version": get_catalog().version,
+        "git_commit": commit,
+    }
+
+def compare(results, baseline, tolerance_scale=1.0):
+    """[(name, message)] for every metric worse than its baseline allows."""
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        cur = results["metrics"].get(name)
+        if cur is None:
+            continue
+        tol = base["tolerance"] * tolerance_scale
+        if base["better"] == "lower":
+            limit = base["value"] * (1 + tol) + base["slack"]
+            bad = cur["value"] > limit
+        else:
+            limit = base["value"] * (1 - tol) - base["slack"]
+            bad = cur["value"] < limit
+        if bad:
+            regressions.append((name, f"{cur['value']:g} {cur['unit']} vs baseline {base['value']:g} (limit {limit:g})"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(DEFAULT_GROUPS))
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance-scale", type=float, default=1.0, help="multiply every metric's tolerance (e.g. 2 on noisy CI)")
+    parser.add_argument("--reruns", type=int, default=30, help="macro: measured random reruns")
+    parser.add_argument("--warmup", type=int, default=5, help="macro: unmeasured reruns first")
+    parser.add_argument("--renders", type=int, default=10, help="memory: uncached CTO renders")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results = {"meta": host_info(), "metrics": {}}
+    for group in args.groups:
+        print(f"[{group}]")
+        results["metrics"].update(BENCHES[group](args))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        if baseline_path.exists():
+            # Keep metrics of groups that were not run this time
+            old = json.loads(baseline_path.read_text())["metrics"]
+            results["metrics"] = {**old, **results["metrics"]}
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to record one.")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    host_keys = ("processor", "cpus", "python")
+    if any(baseline["meta"].get(k) != results["meta"][k] for k in host_keys):
+        recorded = ", ".join(f"{k} {baseline['meta'].get(k)}" for k in host_keys)
+        print(f"WARNING: baseline was recorded on a different host ({recorded}); timing comparisons are unreliable")
+    regressions = compare(results, baseline, args.tolerance_scale)
+    if regressions:
+        for name, message in regressions:
+            print(f"REGRESSION {name}: {message}")
+        print(f"FAIL: {len(regressions)} metric(s) regressed against {baseline_path}")
+        return 1
+    compared = [name for name in results["metrics"] if name in baseline["metrics"]]
+    new = len(results["metrics"]) - len(compared)
+    print(f"PASS: {len(compared)} metrics within tolerance of {baseline_path}" + (f" ({new} not in the baseline)" if new else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""
+Bulk scenario scoring: CSV / JSONL parameter sets in, gzip JSONL or Parquet reports out.
+- Input is read and scored CHUNK_ROWS rows at a time (one vectorized region lookup per chunk),
+  and output is produced as a stream of byte blocks, so no stage holds the whole file.
+- CSV needs a header of slider names (full param keys or short names); JSONL has one slider
+  object per line. Sliders left out take the sidebar defaults, as in the HTTP service.
+- JSONL output lines are the app's download report; Parquet output (needs pyarrow) is a
+  columnar summary: sliders, architecture id, confidence, estimated monthly cost (costs.py,
+  default pricing region) and the selected lists.
+
+    python bulk.py scenarios.csv -o reports.jsonl.gz
+    python bulk.py scenarios.jsonl -o reports.parquet
+"""
+
+import csv
+import gzip
+import io
+import json
+import tempfile
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog
+from costs import get_cost_model
+from engine import DEFAULT_VALUES, normalize_params
+from regions import get_region_table
+
+CHUNK_ROWS = 50_000
+JSONL_BLOCK_ROWS = 2_000
+INPUT_FORMATS = ("csv", "jsonl")
+OUTPUT_FORMATS = ("jsonl.gz", "parquet")
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def detect_format(filename):
+    """Input format from a file name (.csv, .jsonl / .ndjson, optionally .gz)."""
+    name = filename.lower().removesuffix(".gz")
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"cannot tell the format of {filename!r}; use .csv or .jsonl")
+
+def _column_index(name):
+    name = name.strip()
+    if name in PARAM_KEYS:
+        return PARAM_KEYS.index(name)
+    if name in PARAM_NAMES:
+        return PARAM_NAMES.index(name)
+    raise ValueError(f"unknown slider column {name!r} (expected one of {', '.join(PARAM_NAMES)})")
+
+def _check_range(values, first_row):
+    bad = np.flatnonzero(((values < SLIDER_MIN) | (values > SLIDER_MAX)).any(axis=1))
+    if len(bad):
+        raise ValueError(f"row {first_row + int(bad[0])}: slider values must be between {SLIDER_MIN} and {SLIDER_MAX}")
+    return values
+
+def _csv_chunks(text, chunk_rows):
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [_column_index(name) for name in header]
+    row_no = 2  # 1-based, after the header
+    while True:
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(columns):
+                raise ValueError(f"row {row_no + len(rows)}: expected {len(columns)} fields, got {len(row)}")
+            rows.append(row)
+            if len(rows) == chunk_rows:
+                break
+        if not rows:
+            return
+        values = np.tile(np.array(DEFAULT_VALUES, dtype=np.int64), (len(rows), 1))
+        try:
+            values[:, columns] = [list(map(int, row)) for row in rows]
+        except ValueError:
+            for i, row in enumerate(rows):
+                if not all(v.strip().lstrip("-").isdigit() for v in row):
+                    raise ValueError(f"row {row_no + i}: slider values must be integers") from None
+            raise
+        yield _check_range(values, row_no)
+        row_no += len(rows)
+
+def _jsonl_chunks(text, chunk_rows):
+    rows = []
+    for line_no, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            params = normalize_params(json.loads(line))
+        except ValueError as e:
+            raise ValueError(f"line {line_no}: {e}") from None
+        rows.append(list(params.values()))
+        if len(rows) == chunk_rows:
+            yield np.array(rows, dtype=np.int64)
+            rows = []
+    if rows:
+        yield np.array(rows, dtype=np.int64)
+
+def read_chunks(stream, fmt, chunk_rows=CHUNK_ROWS):
+    """Yield (n, 10) int64 slider arrays (PARAM_KEYS order) from a binary CSV / JSONL stream.
+
+    Gzip-compressed input is detected from its magic bytes. Raises ValueError naming the
+    offending row or line.
+    """
+    if fmt not in INPUT_FORMATS:
+        raise ValueError(f"input format must be one of {', '.join(INPUT_FORMATS)}")
+    if stream.seekable():
+        start = stream.tell()
+        magic = stream.read(2)
+        stream.seek(start)
+    else:
+        stream = io.BufferedReader(stream)
+        magic = stream.peek(2)[:2]
+    if magic == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream)
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from (_csv_chunks if fmt == "csv" else _jsonl_chunks)(text, chunk_rows)
+    finally:
+        text.detach()
+
+def score_chunks(chunks, catalog=None):
+    """Yield (values, architecture ids) per chunk, scored against the region table."""
+    table = get_region_table(catalog or get_catalog())
+    for values in chunks:
+        yield values, table.architecture_ids(values)
+
+def summarize(chunks, catalog=None):
+    """Row count, confidence range and distinct architectures for a stream of slider chunks."""
+    table = get_region_table(catalog or get_catalog())
+    rows, total, low, high = 0, 0.0, None, None
+    seen = np.zeros(table.n_architectures, dtype=bool)
+    for _, archs in score_chunks(chunks, table.catalog):
+        conf = table.arch_confidence[archs]
+        seen[archs] = True
+        rows += len(archs)
+        total += float(conf.sum())
+        low = float(conf.min()) if low is None else min(low, float(conf.min()))
+        high = float(conf.max()) if high is None else max(high, float(conf.max()))
+    return {"rows": rows, "architectures": int(seen.sum()),
+            "mean_confidence": round(total / rows, 1) if rows else None,
+            "min_confidence": low, "max_confidence": high}
+
+
+# --------------------------
+# Output streams
+# --------------------------
+def iter_jsonl_gz(chunks, catalog=None, level=6):
+    """Gzip-compressed JSONL blocks: one app report per input row, one timestamp for the export."""
+    table = get_region_table(catalog or get_catalog())
+    generated_at = datetime.utcnow().isoformat() + "Z"
+    # Most of the time goes to deflate (every row repeats its architecture's report);
+    # level 1 is about twice as fast for about three times the size.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for values, archs in score_chunks(chunks, table.catalog):
+        # Encode a few thousand reports at a time: a whole chunk of text would be ~3.5 KB a row
+        for start in range(0, len(values), JSONL_BLOCK_ROWS):
+            rows = values[start:start + JSONL_BLOCK_ROWS].tolist()
+            lines = [table.report_json(dict(zip(PARAM_KEYS, row)), arch, generated_at)
+                     for row, arch in zip(rows, archs[start:start + JSONL_BLOCK_ROWS].tolist())]
+            block = compressor.compress(("\n".join(lines) + "\n").encode())
+            if block:
+                yield block
+    yield compressor.flush()
+
+
+class _Drain:
+    """Write-only sink for pyarrow that hands out what was written since the last take()."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def _arch_columns(table):
+    """Per-architecture list columns, gathered by architecture id for each chunk."""
+    import pyarrow as pa
+
+    results = table.results
+    strings = pa.list_(pa.string())
+    return {
+        "selected_services": pa.array([r["selected_services"] for r in results], strings),
+        "ml_pipeline": pa.array([r["ml_pipeline"] for r in results], strings),
+        "pillars_passed": pa.array([[p for p, v in r["pillar_checks"].items() if v["passed"]] for r in results], strings),
+        "ml_areas_complete": pa.array([[a for a, v in r["ml_coverage"].items() if v["complete"]] for r in results], strings),
+    }
+
+def iter_parquet(chunks, catalog=None):
+    """Parquet file blocks, one row group per input chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = get_region_table(catalog or get_catalog())
+    per_arch = _arch_columns(table)
+    arch_cost = get_cost_model(catalog=table.catalog).batch_monthly_cost(table.arch_services)
+    sink = _Drain()
+    writer = None
+    for values, archs in score_chunks(chunks, table.catalog):
+        indices = pa.array(archs, pa.int32())
+        columns = {name: pa.array(values[:, k], pa.int8()) for k, name in enumerate(PARAM_NAMES)}
+        columns["architecture"] = indices
+        columns["confidence"] = pa.array(table.arch_confidence[archs])
+        columns["monthly_cost_usd"] = pa.array(np.round(arch_cost[archs], 2))
+        columns.update({name: col.take(indices) for name, col in per_arch.items()})
+        batch = pa.table(columns)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, batch.schema, compression="zstd")
+        writer.write_table(batch)
+        yield sink.take()
+    if writer is not None:
+        writer.close()
+    yield sink.take()
+
+def iter_export(chunks, out_fmt, catalog=None, level=6):
+    if out_fmt == "jsonl.gz":
+        return iter_jsonl_gz(chunks, catalog, level)
+    if out_fmt == "parquet":
+        if not parquet_available():
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+        return iter_parquet(chunks, catalog)
+    raise ValueError(f"output format must be one of {', '.join(OUTPUT_FORMATS)}")
+
+def export_file(stream, in_fmt, out_fmt, catalog=None, spool_bytes=16 * 1024 * 1024):
+    """The whole export as a rewound temporary file (kept in memory up to spool_bytes, then on disk)."""
+    out = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    for block in iter_export(read_chunks(stream, in_fmt), out_fmt, catalog):
+        out.write(block)
+    out.seek(0)
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Score a CSV / JSONL file of slider settings.")
+    parser.add_argument("input", help="CSV with a header of slider names, or JSONL of slider objects")
+    parser.add_argument("-o", "--output", required=True, help="*.jsonl.gz or *.parquet")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--level", type=int, default=6, help="gzip level for JSONL output (1 = fastest)")
+    args = parser.parse_args()
+
+    out_fmt = "parquet" if args.output.endswith(".parquet") else "jsonl.gz"
+    start = time.perf_counter()
+    try:
+        with open(args.input, "rb") as src, open(args.output, "wb") as dst:
+            for block in iter_export(read_chunks(src, detect_format(args.input), args.chunk_rows), out_fmt, level=args.level):
+                dst.write(block)
+    except (ValueError, ImportError) as e:
+        sys.exit(f"error: {e}")
+    print(f"wrote {args.output} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,369 @@
+"""
+Declarative rule catalog for the AI Architect engine.
+- Service rules, the ML pipeline, pillar rules, ML expectations, role mapping, the agent
+  roles, the diagram edges and stages and the CTO component mapping live in a JSON or YAML
+  file (rules/catalog.json by default, or the file named by $AI_ARCHITECT_CATALOG).
+- Every rule tests one slider against a threshold, so a catalog compiles into per-slider,
+  per-value indexes: evaluating a params dict touches 10 precomputed entries (the rules that
+  match) however many services and rules the catalog holds.
+- get_catalog() keeps one compiled catalog per file for the whole process and recompiles it
+  when the file changes on disk; a broken edit keeps the last good version in service.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# --------------------------
+# Parameters (the 10 sliders)
+# --------------------------
+PARAM_KEYS = [
+    "Data Volume (1=GB, 10=PB)",
+    "Data Variety (1=structured, 10=multi-modal)",
+    "Real-Time Requirement (1=batch, 10=real-time)",
+    "Model Complexity (1=basic ML, 10=advanced GenAI)",
+    "Scalability Need (1=small, 10=global enterprise)",
+    "Security & Compliance (1=basic, 10=finance/healthcare)",
+    "Integration Needs (1=standalone, 10=deep ERP/SAP)",
+    "Cost Sensitivity (1=performance, 10=cost savings)",
+    "Automation (1=manual, 10=full CI/CD)",
+    "User Experience (1=API only, 10=rich end-user app)",
+]
+PARAM_NAMES = [k.split(" (")[0] for k in PARAM_KEYS]
+
+SLIDER_MIN, SLIDER_MAX = 1, 10
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent / "rules" / "catalog.json"
+CATALOG_ENV = "AI_ARCHITECT_CATALOG"
+# How often get_catalog() stats the file for changes
+RELOAD_CHECK_SECONDS = 1.0
+
+
+class CatalogError(ValueError):
+    """The rule catalog could not be read or is invalid."""
+
+
+# --------------------------
+# Loading
+# --------------------------
+def load_spec(path):
+    """Parse a catalog file (JSON, or YAML when the suffix is .yaml/.yml)."""
+    path = Path(path)
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise CatalogError(f"cannot read rule catalog {path}: {e}") from e
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise CatalogError("PyYAML is required to load YAML rule catalogs (pip install pyyaml)") from e
+        try:
+            spec = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise CatalogError(f"invalid YAML in {path}: {e}") from e
+    else:
+        try:
+            spec = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise CatalogError(f"invalid JSON in {path}: {e}") from e
+    if not isinstance(spec, dict):
+        raise CatalogError(f"{path}: top level must be a mapping")
+    return spec
+
+def _param_index(name, where):
+    """Slider index for a full param key or its short slider name."""
+    if name in PARAM_KEYS:
+        return PARAM_KEYS.index(name)
+    if name in PARAM_NAMES:
+        return PARAM_NAMES.index(name)
+    raise CatalogError(f"{where}: unknown param {name!r} (expected one of {', '.join(PARAM_NAMES)})")
+
+def _threshold(value, where):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise CatalogError(f"{where}: threshold must be an integer, got {value!r}")
+    return value
+
+def _names(value, where):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise CatalogError(f"{where}: expected a list of names")
+    return list(value)
+
+# --------------------------
+# Bit helpers
+# --------------------------
+def n_words(n_bits):
+    return max(1, (n_bits + 63) // 64)
+
+def words(bits, width):
+    """Pack bit positions into a uint64 word vector."""
+    out = np.zeros(width, dtype=np.uint64)
+    for b in bits:
+        out[b // 64] |= np.uint64(1 << (b % 64))
+    return out
+
+def int_words(x, width):
+    """Split a Python-int bitset into a (width,) uint64 word vector (lowest word first)."""
+    return np.array([(x >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(width)], dtype=np.uint64)
+
+def iter_bits(x):
+    """Set bit positions of a Python int, lowest first."""
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+def bits_to_int(bits):
+    """Python-int bitset with the given bit positions set (inverse of iter_bits)."""
+    x = 0
+    for b in bits:
+        x |= 1 << b
+    return x
+
+
+# --------------------------
+# Compiled catalog
+# --------------------------
+class Catalog:
+    """A validated rule catalog plus the indexes the engine evaluates against.
+
+    Bit i of a service bitmap is services[i]; bit i of an ML mask is ml_nodes[i].
+    """
+
+    def __init__(self, spec, source=None):
+        self.source = str(source) if source is not None else None
+        self.version = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:12]
+
+        self.always_services = _names(spec.get("always_services", []), "always_services")
+        self.service_rules = []
+        for i, rule in enumerate(spec.get("service_rules", [])):
+            where = f"service_rules[{i}]"
+            self.service_rules.append((
+                _param_index(rule.get("param"), where),
+                _threshold(rule.get("threshold"), where),
+                _names(rule.get("above", []), where + ".above"),
+                _names(rule.get("otherwise", []), where + ".otherwise"),
+            ))
+
+        self.ml_pipeline = []
+        for i, step in enumerate(spec.get("ml_pipeline", [])):
+            where = f"ml_pipeline[{i}]"
+            if not isinstance(step.get("node"), str):
+                raise CatalogError(f"{where}: missing node name")
+            cond = None
+            if "param" in step:
+                when = step.get("when", "above")
+                if when not in ("above", "not_above"):
+                    raise CatalogError(f"{where}: when must be 'above' or 'not_above'")
+                cond = (_param_index(step["param"], where), _threshold(step.get("threshold"), where), when == "above")
+            self.ml_pipeline.append((step["node"], cond))
+
+        security = spec.get("security", {})
+        self.security_param = _param_index(security.get("param", "Security & Compliance"), "security")
+        self.security_threshold = _threshold(security.get("threshold", 7), "security")
+        self.security_services = _names(security.get("services", []), "security.services")
+
+        self.pillar_rules = spec.get("pillar_rules", {})
+        for pillar, rules in self.pillar_rules.items():
+            _names(rules.get("required", []), f"pillar_rules.{pillar}.required")
+            if not rules.get("required"):
+                raise CatalogError(f"pillar_rules.{pillar}: needs at least one required service")
+        self.ml_expected = {area: _names(comps, f"ml_expected.{area}") for area, comps in spec.get("ml_expected", {}).items()}
+        if not self.pillar_rules or not self.ml_expected:
+            raise CatalogError("catalog needs pillar_rules and ml_expected")
+        self.role_map = dict(spec.get("role_map", {}))
+        self.default_role = spec.get("default_role", "Platform / Engineering")
+        self.agents = []
+        for i, agent in enumerate(spec.get("agents", [])):
+            where = f"agents[{i}]"
+            if not isinstance(agent.get("role"), str):
+                raise CatalogError(f"{where}: missing role name")
+            self.agents.append((
+                agent["role"],
+                sorted({_param_index(p, where) for p in agent.get("params", [])}),
+                _names(agent.get("focus", []), where + ".focus"),
+            ))
+        # ML diagram stages: (name, label, fill colour, pipeline nodes); a node belongs to at most one
+        pipeline_nodes = {name for name, _ in self.ml_pipeline}
+        self.ml_stages, staged = [], set()
+        for i, stage in enumerate(spec.get("ml_stages", [])):
+            where = f"ml_stages[{i}]"
+            if not isinstance(stage.get("name"), str):
+                raise CatalogError(f"{where}: missing stage name")
+            nodes = _names(stage.get("nodes", []), where + ".nodes")
+            for node in nodes:
+                if node not in pipeline_nodes:
+                    raise CatalogError(f"{where}: {node!r} is not an ml_pipeline node")
+                if node in staged:
+                    raise CatalogError(f"{where}: {node!r} is already in another stage")
+                staged.add(node)
+            self.ml_stages.append((stage["name"], stage.get("label", stage["name"]), stage.get("fillcolor", "#FFFFFF"), nodes))
+        self.ml_stage_of = {node: i for i, (_, _, _, nodes) in enumerate(self.ml_stages) for node in nodes}
+        self.ml_stage_edges = [tuple(_names(e, "ml_stage_edges")) for e in spec.get("ml_stage_edges", [])]
+        self.service_edges = [tuple(_names(e, "service_edges")) for e in spec.get("service_edges", [])]
+        self.aws_ml_components = {step: _names(comps, f"aws_ml_components.{step}") for step, comps in spec.get("aws_ml_components", {}).items()}
+
+        self._build_indexes()
+
+    def _build_indexes(self):
+        # Fixed service index: everything the rules emit plus everything the checks look for
+        indexed = set(self.always_services).union(*(a + b for _, _, a, b in self.service_rules))
+        for rules in self.pillar_rules.values():
+            indexed.update(rules["required"], rules.get("optional", []))
+        indexed.update(self.security_services)
+        self.services = sorted(indexed)
+        self.service_index = {s: i for i, s in enumerate(self.services)}
+        # ML component index: pipeline nodes first (in pipeline order), then expected-only components
+        self.ml_nodes = [name for name, _ in self.ml_pipeline]
+        self.ml_components = list(dict.fromkeys(self.ml_nodes + [c for comps in self.ml_expected.values() for c in comps]))
+        self.ml_index = {n: i for i, n in enumerate(self.ml_components)}
+        self.service_words = n_words(len(self.services))
+        self.ml_words = n_words(len(self.ml_components))
+        n_params, n_values = len(PARAM_KEYS), SLIDER_MAX + 1
+
+        # Scalar index: services / ML bits switched on by slider k at value v
+        value_services = [[set() for _ in range(n_values)] for _ in range(n_params)]
+        for idx, threshold, above, below in self.service_rules:
+            for v in range(SLIDER_MIN, n_values):
+                value_services[idx][v].update(above if v > threshold else below)
+        self.value_services = [[frozenset(s) for s in row] for row in value_services]
+        self.value_ml_bits = [[0] * n_values for _ in range(n_params)]
+        self.ml_always_bits = 0
+        for bit, (_, cond) in enumerate(self.ml_pipeline):
+            if cond is None:
+                self.ml_always_bits |= 1 << bit
+                continue
+            idx, threshold, when_above = cond
+            for v in range(SLIDER_MIN, n_values):
+                if (v > threshold) == when_above:
+                    self.value_ml_bits[idx][v] |= 1 << bit
+
+        # Batch index: the same tables as uint64 word bitmaps
+        self.service_lut = np.zeros((n_params, n_values, self.service_words), dtype=np.uint64)
+        self.ml_lut = np.zeros((n_params, n_values, self.ml_words), dtype=np.uint64)
+        for k in range(n_params):
+            for v in range(SLIDER_MIN, n_values):
+                self.service_lut[k, v] = words(self.service_bits(self.value_services[k][v]), self.service_words)
+                self.ml_lut[k, v] = words(iter_bits(self.value_ml_bits[k][v]), self.ml_words)
+        self.service_always = words(self.service_bits(self.always_services), self.service_words)
+        self.ml_always = words(iter_bits(self.ml_always_bits), self.ml_words)
+
+        # Check masks: (P, W) required services per pillar, (A, W) expected components per ML area.
+        # *_bits keep each list's declared order so found/missing decode back in that order.
+        self.pillar_bits = [self.service_bits(r["required"]) for r in self.pillar_rules.values()]
+        self.pillar_masks = np.stack([words(bits, self.service_words) for bits in self.pillar_bits])
+        # A pillar passes if at least half of required are present (tunable)
+        self.pillar_thresholds = np.array([max(1, len(r["required"]) // 2) for r in self.pillar_rules.values()])
+        self.ml_area_bits = [[self.ml_index[c] for c in comps] for comps in self.ml_expected.values()]
+        self.ml_area_masks = np.stack([words(bits, self.ml_words) for bits in self.ml_area_bits])
+        self.security_mask = words(self.service_bits(self.security_services), self.service_words)
+        # Same masks as Python ints (solver.py, compute_confidence), one bitset per pillar / area
+        self.pillar_ints = [bits_to_int(bits) for bits in self.pillar_bits]
+        self.pillar_threshold_ints = self.pillar_thresholds.tolist()
+        self.ml_area_ints = [bits_to_int(bits) for bits in self.ml_area_bits]
+        self.security_int = bits_to_int(self.service_bits(self.security_services))
+        # (single-bit mask, name) per required service / expected component, in declared order
+        self.pillar_members = [[(1 << b, self.services[b]) for b in bits] for bits in self.pillar_bits]
+        self.ml_area_members = [[(1 << b, self.ml_components[b]) for b in bits] for bits in self.ml_area_bits]
+        # canonical_values[k][v]: lowest value of v's threshold interval on slider k (values in one
+        # interval give identical outputs, so caches can key on the canonical value)
+        self.canonical_values = []
+        for cuts in self.slider_thresholds():
+            lows = [SLIDER_MIN] + [t + 1 for t in cuts]
+            self.canonical_values.append([0] + [max(low for low in lows if low <= v) for v in range(SLIDER_MIN, n_values)])
+
+    def service_bits(self, names):
+        return [self.service_index[s] for s in names if s in self.service_index]
+
+    def service_int(self, names):
+        """Python-int bitset of names; names outside the index are ignored."""
+        index = self.service_index
+        return bits_to_int(index[s] for s in names if s in index)
+
+    def ml_int(self, components):
+        """Python-int bitset of ML components; names outside the index are ignored."""
+        index = self.ml_index
+        return bits_to_int(index[c] for c in components if c in index)
+
+    def encode_services(self, names):
+        """(service_words,) bitmap of names; names outside the index are ignored."""
+        return int_words(self.service_int(names), self.service_words)
+
+    def encode_ml(self, components):
+        """(ml_words,) bitmap of ML components; names outside the index are ignored."""
+        return int_words(self.ml_int(components), self.ml_words)
+
+    def service_params(self):
+        """Slider indexes that some service rule reads."""
+        return sorted({idx for idx, _, _, _ in self.service_rules})
+
+    def ml_params(self):
+        """Slider indexes that some ML pipeline step reads."""
+        return sorted({cond[0] for _, cond in self.ml_pipeline if cond is not None})
+
+    def agent_params(self, i):
+        """Slider indexes agent i reads: its declared sliders plus those whose rules emit a focus service."""
+        _, declared, focus = self.agents[i]
+        emitting = {idx for idx, _, above, below in self.service_rules if set(focus) & set(above + below)}
+        return sorted(set(declared) | emitting)
+
+    def slider_thresholds(self):
+        """Sorted cut points per slider; crossing one can change some output."""
+        cuts = [set() for _ in PARAM_KEYS]
+        for idx, threshold, _, _ in self.service_rules:
+            cuts[idx].add(threshold)
+        for _, cond in self.ml_pipeline:
+            if cond is not None:
+                cuts[cond[0]].add(cond[1])
+        cuts[self.security_param].add(self.security_threshold)
+        return [sorted(t for t in c if SLIDER_MIN <= t < SLIDER_MAX) for c in cuts]
+
+
+# --------------------------
+# Process-wide cache with hot reload
+# --------------------------
+_lock = threading.Lock()
+_loaded = {}  # path -> [stat signature, Catalog, last checked (monotonic)]
+_errors = {}  # path -> message of the last failed reload
+
+
+def catalog_path(path=None):
+    return Path(path or os.environ.get(CATALOG_ENV) or DEFAULT_CATALOG_PATH).resolve()
+
+def get_catalog(path=None):
+    """Compiled catalog for path, recompiled when the file changes (checked at most once a second)."""
+    path = catalog_path(path)
+    entry = _loaded.get(path)
+    now = time.monotonic()
+    if entry is not None and now - entry[2] < RELOAD_CHECK_SECONDS:
+        return entry[1]
+    with _lock:
+        entry = _loaded.get(path)
+        try:
+            st = path.stat()
+            signature = (st.st_mtime_ns, st.st_size)
+            if entry is not None and entry[0] == signature:
+                entry[2] = now
+                return entry[1]
+            catalog = Catalog(load_spec(path), source=path)
+        except (OSError, CatalogError) as e:
+            if entry is None:
+                if isinstance(e, CatalogError):
+                    raise
+                raise CatalogError(f"cannot read rule catalog {path}: {e}") from e
+            # Keep serving the last good catalog until the file is fixed
+            _errors[path] = str(e)
+            entry[2] = now
+            return entry[1]
+        _loaded[path] = [signature, catalog, now]
+        _errors.pop(path, None)
+        return catalog
+
+def catalog_error(path=None):
+    """Why the last reload of path failed (the previous catalog is still in use), or None."""
+    return _errors.get(catalog_path(path))
@@ -0,0 +1,326 @@
+"""
+Offline AWS cost estimates for the recommended architectures.
+- build_index() streams AWS bulk price-list files (CSV, optionally gzipped; JSON with the
+  optional ijson package) and writes a compact index of on-demand USD prices keyed by
+  (service code, region, usage type): sorted 64-bit key hashes plus price and unit columns,
+  opened memory-mapped so even an index of the full price list costs no load time.
+- The cost profile (rules/cost_profile.json) prices each recommended service as a few
+  line items of a reference workload. CostModel folds those into one monthly figure per
+  catalog service, so a service set costs a handful of additions and a batch of service
+  bitmaps one matrix-vector product.
+- Without $AI_ARCHITECT_PRICE_LIST / $AI_ARCHITECT_PRICE_INDEX, the bundled illustrative
+  sample (rules/aws_prices_sample.csv) is indexed on first use.
+
+    python costs.py build price-list.csv [more files ...] --out ./price-index
+    python costs.py estimate --region eu-west-1 S3 Lambda "API Gateway"
+"""
+
+import csv
+import functools
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+from catalog import get_catalog
+
+RULES_DIR = Path(__file__).resolve().parent / "rules"
+SAMPLE_PRICE_LIST = RULES_DIR / "aws_prices_sample.csv"
+DEFAULT_PROFILE_PATH = RULES_DIR / "cost_profile.json"
+PRICE_LIST_ENV = "AI_ARCHITECT_PRICE_LIST"
+PRICE_INDEX_ENV = "AI_ARCHITECT_PRICE_INDEX"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "ai-architect" / "price-index"
+
+# Regional usage types carry an AWS region prefix ("EU-", "USW2-", "APS2-"); us-east-1 usually has
+# none. Only these exact codes are stripped: "ETL-", "KMS-", "NLP-", "QS-" are part of the name.
+REGION_PREFIXES = (
+    "USE1", "USE2", "USW1", "USW2", "UGE1", "UGW1", "CAN1", "CAW1", "MXC1", "SAE1",
+    "EU", "EUC1", "EUC2", "EUW2", "EUW3", "EUN1", "EUS1", "EUS2",
+    "APE1", "APN1", "APN2", "APN3", "APS1", "APS2", "APS3", "APS4", "APS5", "APS6", "APS7",
+    "AFS1", "MEC1", "MES1", "ILC1", "CNN1", "CNW1",
+)
+_REGION_PREFIX = re.compile(rf"^(?:{'|'.join(REGION_PREFIXES)})-")
+# Bumped whenever price_key() changes, so indexes built with the old keys are rebuilt or rejected
+INDEX_FORMAT = 2
+
+
+class PriceListError(ValueError):
+    pass
+
+
+def normalize_usage_type(usage_type, region=None):
+    """Usage type without its region prefix: "EU-TimedStorage-ByteHrs" -> "TimedStorage-ByteHrs".
+
+    Global rows (region "global", e.g. CloudFront's "US-DataTransfer-Out-Bytes") keep theirs:
+    there the prefix names the edge location group, not a region.
+    """
+    usage_type = usage_type.strip()
+    return usage_type if region == "global" else _REGION_PREFIX.sub("", usage_type, count=1)
+
+def price_key(service, region, usage_type):
+    """64-bit index key for (service code, region, usage type)."""
+    text = f"{service}\x1f{region}\x1f{normalize_usage_type(usage_type, region)}".encode()
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), "little")
+
+def _open_text(path):
+    with open(path, "rb") as raw:
+        gzipped = raw.read(2) == b"\x1f\x8b"
+    return (gzip.open if gzipped else open)(path, "rt", encoding="utf-8-sig", newline="")
+
+
+# --------------------------
+# Streaming price-list parsers
+# --------------------------
+CSV_COLUMNS = {"TermType", "PricePerUnit", "Currency", "Unit", "StartingRange", "serviceCode", "usageType", "Region Code"}
+
+def _csv_rows(path):
+    """(service, region, usage type, unit, price) for on-demand USD first-tier rows of a bulk CSV."""
+    with _open_text(path) as text:
+        reader = csv.reader(text)
+        for header in reader:
+            # Bulk CSVs start with a few metadata lines ("FormatVersion", "Disclaimer", ...)
+            if CSV_COLUMNS <= set(header):
+                break
+        else:
+            raise PriceListError(f"{path}: no price-list header with columns {', '.join(sorted(CSV_COLUMNS))}")
+        col = {name: header.index(name) for name in CSV_COLUMNS}
+        for row in reader:
+            if len(row) < len(header) or row[col["TermType"]] != "OnDemand" or row[col["Currency"]] != "USD":
+                continue
+            if row[col["StartingRange"]] not in ("", "0"):
+                continue
+            try:
+                price = float(row[col["PricePerUnit"]])
+            except ValueError:
+                continue
+            yield row[col["serviceCode"]], row[col["Region Code"]], row[col["usageType"]], row[col["Unit"]], price
+
+def _json_rows(path):
+    """Same rows from a bulk JSON offer file, streamed with ijson (products first, then terms)."""
+    try:
+        import ijson
+    except ImportError as e:
+        raise PriceListError("ijson is required to stream JSON price lists (pip install ijson), or use the CSV files") from e
+    products = {}
+    with _open_text(path) as text:
+        for sku, product in ijson.kvitems(text.buffer, "products"):
+            attrs = product.get("attributes", {})
+            products[sku] = (attrs.get("servicecode", ""), attrs.get("regionCode", ""), attrs.get("usagetype", ""))
+    with _open_text(path) as text:
+        for sku, offers in ijson.kvitems(text.buffer, "terms.OnDemand"):
+            if sku not in products:
+                continue
+            for offer in offers.values():
+                for dim in offer.get("priceDimensions", {}).values():
+                    if str(dim.get("beginRange", "0")) not in ("", "0") or "USD" not in dim.get("pricePerUnit", {}):
+                        continue
+                    yield (*products[sku], dim.get("unit", ""), float(dim["pricePerUnit"]["USD"]))
+
+def iter_prices(path):
+    path = str(path)
+    name = path.lower().removesuffix(".gz")
+    return _json_rows(path) if name.endswith(".json") else _csv_rows(path)
+
+
+# --------------------------
+# Index
+# --------------------------
+def build_index(price_lists, out_dir):
+    """Stream price_lists into a memory-mappable index directory (written atomically)."""
+    out_dir = Path(out_dir)
+    # Flat typed columns (18 bytes a row) rather than a dict, so huge price lists stay small
+    keys, prices, unit_col = array("Q"), array("d"), array("H")
+    units, unit_codes, regions, services = [], {}, set(), set()
+    for path in price_lists:
+        for service, region, usage_type, unit, price in iter_prices(path):
+            if unit not in unit_codes:
+                unit_codes[unit] = len(units)
+                units.append(unit)
+            keys.append(price_key(service, region, usage_type))
+            prices.append(price)
+            unit_col.append(unit_codes[unit])
+            regions.add(region)
+            services.add(service)
+    rows = len(keys)
+    # Sorted unique keys; return_index picks the first on-demand first-tier rate for duplicates
+    keys, first = np.unique(np.frombuffer(keys, dtype=np.uint64), return_index=True)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=out_dir.name + ".", dir=out_dir.parent))
+    np.save(tmp / "keys.npy", keys)
+    np.save(tmp / "price.npy", np.frombuffer(prices, dtype=np.float64)[first])
+    np.save(tmp / "unit.npy", np.frombuffer(unit_col, dtype=np.uint16)[first])
+    (tmp / "meta.json").write_text(json.dumps({
+        "format": INDEX_FORMAT, "sources": [str(p) for p in price_lists], "rows": rows, "entries": len(keys),
+        "units": units, "regions": sorted(regions), "services": sorted(services),
+    }, indent=2))
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    os.replace(tmp, out_dir)
+    return out_dir
+
+
+class PriceIndex:
+    """Read-only, memory-mapped (service, region, usage type) -> (USD price, unit) index."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta.get("format") != INDEX_FORMAT:
+            raise PriceListError(f"{self.path}: price index format {meta.get('format', 1)}, expected {INDEX_FORMAT}; "
+                                 "rebuild it with `python costs.py build`")
+        self.units = meta["units"]
+        self.regions = [r for r in meta["regions"] if r]
+        self.services = meta["services"]
+        self.keys = np.load(self.path / "keys.npy", mmap_mode="r")
+        self.prices = np.load(self.path / "price.npy", mmap_mode="r")
+        self.unit_codes = np.load(self.path / "unit.npy", mmap_mode="r")
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, service, region, usage_type):
+        """(price per unit, unit) or None."""
+        key = np.uint64(price_key(service, region, usage_type))
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        return float(self.prices[i]), self.units[int(self.unit_codes[i])]
+
+    def lookup_many(self, triples):
+        """Prices for many (service, region, usage type) triples; NaN where missing."""
+        keys = np.array([price_key(*t) for t in triples], dtype=np.uint64)
+        if not len(self.keys):
+            return np.full(len(keys), np.nan)
+        i = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        found = np.asarray(self.keys)[i] == keys
+        return np.where(found, np.asarray(self.prices)[i], np.nan)
+
+
+def _source_index_dir(price_lists):
+    sig = hashlib.sha256(f"format {INDEX_FORMAT}\n".encode())
+    for path in price_lists:
+        st = Path(path).stat()
+        sig.update(f"{Path(path).resolve()}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return CACHE_DIR / sig.hexdigest()[:16]
+
+_index_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4)
+def _open_index(path):
+    return PriceIndex(path)
+
+def get_price_index():
+    """$AI_ARCHITECT_PRICE_INDEX, or the cached index of $AI_ARCHITECT_PRICE_LIST (or the sample), built if missing."""
+    if os.environ.get(PRICE_INDEX_ENV):
+        return _open_index(Path(os.environ[PRICE_INDEX_ENV]).resolve())
+    sources = [Path(p) for p in os.environ.get(PRICE_LIST_ENV, str(SAMPLE_PRICE_LIST)).split(os.pathsep) if p]
+    path = _source_index_dir(sources)
+    with _index_lock:
+        if not (path / "meta.json").exists():
+            build_index(sources, path)
+    return _open_index(path)
+
+
+# --------------------------
+# Cost model
+# --------------------------
+def load_profile(path=None):
+    with open(path or DEFAULT_PROFILE_PATH, encoding="utf-8") as f:
+        profile = json.load(f)
+    if not isinstance(profile.get("services"), dict):
+        raise PriceListError(f"{path or DEFAULT_PROFILE_PATH}: needs a services mapping")
+    return profile
+
+
+class CostModel:
+    """Monthly USD cost of catalog services in one region, from a price index and a cost profile.
+
+    service_costs[i] is the monthly cost of catalog.services[i]; services the profile does not
+    price cost 0, and line items missing from the index are listed in `unpriced`.
+    """
+
+    def __init__(self, index, profile, catalog, region=None):
+        self.region = region or profile.get("region", "us-east-1")
+        self.service_costs = np.zeros(len(catalog.services))
+        self.line_items = {}  # service -> [{usage_type, quantity, unit, unit_price, monthly, note}]
+        self.unpriced = []
+        for service, items in profile["services"].items():
+            if service not in catalog.service_index:
+                continue
+            priced = []
+            for item in items:
+                region = item.get("region", self.region)
+                hit = index.lookup(item["service"], region, item["usage_type"])
+                if hit is None:
+                    self.unpriced.append((service, item["service"], region, item["usage_type"]))
+                    continue
+                price, unit = hit
+                priced.append({"usage_type": item["usage_type"], "quantity": item["quantity"], "unit": unit,
+                               "unit_price": price, "monthly": price * item["quantity"], "note": item.get("note", "")})
+            self.line_items[service] = priced
+            self.service_costs[catalog.service_index[service]] = sum(p["monthly"] for p in priced)
+        self.unpriced_services = sorted(s for s in catalog.services if s not in profile["services"])
+        self._by_service = {s: float(self.service_costs[i]) for i, s in enumerate(catalog.services) if self.service_costs[i]}
+        self._n_services = len(catalog.services)
+
+    def monthly_cost(self, services):
+        """Monthly USD for a set of service names."""
+        by_service = self._by_service
+        return sum(by_service.get(s, 0.0) for s in services)
+
+    def breakdown(self, services):
+        """Rows of (service, line item) costs for a service set, most expensive service first."""
+        rows = [{"service": s, **item} for s in services for item in self.line_items.get(s, [])]
+        return sorted(rows, key=lambda r: (-self._by_service.get(r["service"], 0.0), r["service"], -r["monthly"]))
+
+    def batch_monthly_cost(self, service_words):
+        """Monthly USD for every row of an (N, service_words) uint64 bitmap array."""
+        as_bytes = np.ascontiguousarray(service_words, dtype="<u8").view(np.uint8)
+        bits = np.unpackbits(as_bytes, axis=-1, bitorder="little")[..., :self._n_services]
+        return bits @ self.service_costs
+
+
+@functools.lru_cache(maxsize=16)
+def _cost_model(index, catalog, region, profile_path):
+    return CostModel(index, load_profile(profile_path), catalog, region)
+
+def get_cost_model(region=None, catalog=None, profile_path=None):
+    """Cost model for the current price index, catalog and region (cached per combination)."""
+    return _cost_model(get_price_index(), catalog or get_catalog(), region, profile_path)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Build an AWS price index or estimate a service set.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index bulk price-list files")
+    build.add_argument("price_lists", nargs="+")
+    build.add_argument("--out", required=True, help="index directory (point $AI_ARCHITECT_PRICE_INDEX at it)")
+    estimate = sub.add_parser("estimate", help="monthly cost of a set of services")
+    estimate.add_argument("services", nargs="+")
+    estimate.add_argument("--region")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        try:
+            out = build_index(args.price_lists, args.out)
+        except (OSError, PriceListError) as e:
+            sys.exit(f"error: {e}")
+        print(f"indexed {len(PriceIndex(out))} prices into {out} in {time.perf_counter() - start:.1f}s")
+    else:
+        model = get_cost_model(args.region)
+        for row in model.breakdown(args.services):
+            print(f"{row['service']:<24} {row['usage_type']:<36} {row['quantity']:>12,} {row['unit']:<18} ${row['monthly']:>10,.2f}")
+        print(f"{'Total (' + model.region + ')':<24} {'':<36} {'':>12} {'':<18} ${model.monthly_cost(args.services):>10,.2f}")
@@ -0,0 +1,150 @@
+"""
+Content-addressed render cache for the app's diagrams.
+- Keys are SHA-256 hashes of the graph content (DOT source, node/edge lists, draw options).
+- Values are rendered artifacts (SVG text, PNG bytes) and computed layout positions.
+- One process-wide instance (DIAGRAM_CACHE) is shared by every Streamlit session,
+  with LRU eviction under a byte budget; misses fall through to the persistent disk cache
+  when one is configured (see disk_cache.py), so worker processes share their renders.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from disk_cache import get_disk_cache
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def content_key(kind, *parts):
+    """Stable hash of a diagram's content; kind namespaces artifacts of the same graph."""
+    h = hashlib.sha256(kind.encode())
+    for part in parts:
+        data = part if isinstance(part, bytes) else json.dumps(part, sort_keys=True, default=str).encode()
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+def _sizeof(value):
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, dict):
+        # layout positions: name -> (x, y)
+        return sum(len(str(k)) + 64 for k in value) + 64
+    return 256
+
+
+class DiagramCache:
+    """Thread-safe LRU cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, backing=None):
+        self.max_bytes = max_bytes
+        # backing: optional () -> second-level store (get / put) or None, consulted on a miss
+        self.backing = backing
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Event, so concurrent sessions render a diagram once
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_render(self, key, render):
+        """Cached value for key, calling render() at most once per key across threads."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                event = self._inflight.get(key)
+                if event is None:
+                    self.misses += 1
+                    event = self._inflight[key] = threading.Event()
+                    break
+            event.wait()
+        try:
+            store = self.backing() if self.backing is not None else None
+            value = store.get(key) if store is not None else None
+            if value is None:
+                value = render()
+                if store is not None:
+                    store.put(key, value)
+            return self.put(key, value)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+DIAGRAM_CACHE = DiagramCache(backing=get_disk_cache)
+
+
+# --------------------------
+# Renderers
+# --------------------------
+def dot_to_svg(dot, cache=DIAGRAM_CACHE):
+    """SVG text for a DOT source, or None when the Graphviz `dot` executable is unavailable."""
+    def render():
+        import graphviz
+        try:
+            return graphviz.Source(dot).pipe(format="svg").decode()
+        except (graphviz.ExecutableNotFound, graphviz.CalledProcessError):
+            return None
+    return cache.get_or_render(content_key("dot-svg", dot), render)
+
+def graph_layout(nodes, edges, layout="spring_layout", cache=DIAGRAM_CACHE, **layout_kwargs):
+    """Cached node positions for a graph; layout names a networkx layout function.
+
+    networkx is only imported on a cache miss.
+    """
+    key = content_key(f"layout:{layout}", nodes, edges, layout_kwargs)
+    def render():
+        import networkx as nx
+        g = nx.DiGraph()
+        g.add_nodes_from(nodes)
+        g.add_edges_from(edges)
+        return {n: tuple(float(c) for c in xy) for n, xy in getattr(nx, layout)(g, **layout_kwargs).items()}
+    return cache.get_or_render(key, render)
+
+def cached_png(key_parts, draw, cache=DIAGRAM_CACHE):
+    """PNG bytes produced by draw() (which must return bytes), cached on key_parts."""
+    return cache.get_or_render(content_key("png", *key_parts), draw)
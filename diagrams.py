@@ -0,0 +1,70 @@
+"""
+The page's four diagrams as graph.Graph instances.
+- Pure functions of the catalog and the selected services / ML pipeline, so the app can memoize
+  them; graph.py renders them to DOT, SVG, Mermaid or PNG.
+- Every membership test is a dict or set lookup, so building stays linear in the catalog's
+  nodes and edges.
+"""
+
+from graph import Graph
+
+
+def services_graph(services, catalog, external=("Client",)):
+    """Selected services and the catalog service_edges between them.
+
+    Edges from an external actor (not a service, always drawn) count as long as their target is selected.
+    """
+    g = Graph("AWSArch", "LR", {"shape": "box", "style": "rounded,filled", "fillcolor": "#F2F4F8"})
+    # Nodes sorted, so equal service sets give identical output and cache keys
+    for s in sorted(services):
+        g.add_node(s)
+    external = set(external)
+    for a, b in catalog.service_edges:
+        if (a in services or a in external) and b in services:
+            g.add_edge(a, b)
+    return g
+
+def ml_pipeline_graph(ml_nodes):
+    """The ML pipeline as one left-to-right path."""
+    g = Graph("MLArch", "LR", {"shape": "box", "style": "rounded,filled", "fillcolor": "#E8F0FE"})
+    for n in ml_nodes:
+        g.add_node(n)
+    g.add_path(list(ml_nodes))
+    return g
+
+def ml_stages_graph(ml_nodes, catalog):
+    """The ML pipeline grouped into the catalog's ml_stages, linked by its ml_stage_edges."""
+    g = Graph("MLArch", "TB", {"shape": "box", "style": "rounded,filled", "fillcolor": "#E8F0FE", "fontsize": 12})
+    clusters = [g.add_cluster(name, label, fontsize=14, style="rounded,filled", fillcolor=fill)
+                for name, label, fill, _ in catalog.ml_stages]
+    for n in ml_nodes:
+        stage = catalog.ml_stage_of.get(n)
+        g.add_node(n, None if stage is None else clusters[stage])
+    for a, b in catalog.ml_stage_edges:
+        if a in g.index and b in g.index:
+            g.add_edge(a, b)
+    return g
+
+def cto_graph(catalog):
+    """Catalog aws_ml_components: every component of a step links to every component of the next."""
+    g = Graph("CTOArch", "LR")
+    steps = list(catalog.aws_ml_components.values())
+    for i, comps in enumerate(steps):
+        for comp in comps:
+            g.add_node(comp)
+            if i > 0:
+                for prev in steps[i - 1]:
+                    g.add_edge(prev, comp)
+    return g
+
+
+# Page section -> builder(engine result, catalog) for the memoized diagram sections; shared by
+# app.py and the disk cache warm-up so both store identical values under identical keys.
+SECTION_GRAPHS = {
+    "services_diagram": lambda result, catalog: services_graph(set(result["selected_services"]), catalog),
+    "ml_diagrams": lambda result, catalog: (ml_pipeline_graph(result["ml_pipeline"]),
+                                            ml_stages_graph(result["ml_pipeline"], catalog)),
+    "cto": lambda result, catalog: cto_graph(catalog),
+}
+# to_png arguments for the CTO image (the layout and image caches key on them)
+CTO_PNG_ARGS = {"title": "CTO-Grade AWS ML Architecture", "layout": "spring_layout", "seed": 42, "k": 0.5}
@@ -0,0 +1,265 @@
+"""
+Persistent cross-process cache for app.py: one SQLite file shared by every Streamlit worker.
+- Opt in with $AI_ARCHITECT_DISK_CACHE=<file> (size budget: $AI_ARCHITECT_DISK_CACHE_MB, default 512).
+- Second level behind the in-process caches: diagram_cache.DIAGRAM_CACHE (SVG, PNG and layouts,
+  keyed on the graph content) and sections.memoized() (keyed on the catalog version and the
+  section's sliders, normalized to their threshold intervals).
+- WAL journaling lets readers run alongside a writer; each write is one short BEGIN IMMEDIATE
+  transaction with a busy timeout. The total size is tracked in a meta row and kept under the
+  budget by evicting the least recently used rows. A cache error never fails a page: it counts
+  as a miss (or a skipped write).
+- Values are bytes, text or JSON; other types register a JSON codec (graph.Graph does).
+- `python disk_cache.py warm` prefills the diagram sections for every threshold region.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DISK_CACHE_ENV = "AI_ARCHITECT_DISK_CACHE"
+DISK_CACHE_MB_ENV = "AI_ARCHITECT_DISK_CACHE_MB"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+BUSY_TIMEOUT_S = 5.0
+# Evict down to this fraction of the budget, so a full cache does not evict on every write
+EVICT_TO = 0.9
+# Reads refresh a row's LRU timestamp at most this often (a refresh is a write)
+TOUCH_INTERVAL_S = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0), ('evictions', 0);
+"""
+
+_json_types = {}  # tag -> (type, to_json, from_json)
+
+
+def register_json_type(cls, tag, to_json, from_json):
+    """Store cls instances as {"__<tag>__": to_json(obj)} and rebuild them with from_json."""
+    _json_types[tag] = (cls, to_json, from_json)
+
+def _json_default(obj):
+    for tag, (cls, to_json, _) in _json_types.items():
+        if isinstance(obj, cls):
+            return {f"__{tag}__": to_json(obj)}
+    raise TypeError(f"cannot store {type(obj).__name__} in the disk cache")
+
+def _json_hook(d):
+    if len(d) == 1:
+        (name, value), = d.items()
+        if name.startswith("__") and name.endswith("__") and name[2:-2] in _json_types:
+            return _json_types[name[2:-2]][2](value)
+    return d
+
+def encode(value):
+    """(codec, blob) for a value; raises TypeError if it cannot be stored."""
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes", bytes(value)
+    if isinstance(value, str):
+        return "text", value.encode()
+    return "json", json.dumps(value, default=_json_default, separators=(",", ":")).encode()
+
+def decode(codec, blob):
+    if codec == "bytes":
+        return bytes(blob)
+    if codec == "text":
+        return bytes(blob).decode()
+    return json.loads(blob, object_hook=_json_hook)
+
+
+class DiskCache:
+    """Thread- and process-safe key -> value store in one SQLite file, bounded by total size."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self):
+        # One connection per thread; autocommit mode, transactions are explicit
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key, default=None):
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT codec, value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return default
+            now = time.time()
+            if now - row[2] > TOUCH_INTERVAL_S:
+                conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            value = decode(row[0], row[1])
+        except (sqlite3.Error, ValueError):
+            self._count("errors")
+            return default
+        self._count("hits")
+        return value
+
+    def put(self, key, value):
+        """Store value (None and values too large for the budget are skipped); returns value."""
+        if value is None:
+            return value
+        try:
+            codec, blob = encode(value)
+        except (TypeError, ValueError):
+            return value
+        size = len(blob) + len(key) + 64  # row overhead, roughly
+        if size > self.max_bytes:
+            return value
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT INTO entries (key, codec, value, size, accessed) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET codec = excluded.codec, value = excluded.value, "
+                    "size = excluded.size, accessed = excluded.accessed",
+                    (key, codec, blob, size, time.time()))
+                total = conn.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes' RETURNING value",
+                                     (size - (old[0] if old else 0),)).fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(conn, total - int(self.max_bytes * EVICT_TO))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self._count("errors")
+        return value
+
+    def _evict(self, conn, need):
+        freed = evicted = 0
+        while freed < need:
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT 256").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if freed >= need:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                freed += size
+                evicted += 1
+        conn.execute("UPDATE meta SET value = value - ? WHERE name = 'bytes'", (freed,))
+        conn.execute("UPDATE meta SET value = value + ? WHERE name = 'evictions'", (evicted,))
+
+    def clear(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM entries")
+        conn.execute("UPDATE meta SET value = 0 WHERE name = 'bytes'")
+        conn.execute("COMMIT")
+
+    def stats(self):
+        conn = self._conn()
+        entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        meta = dict(conn.execute("SELECT name, value FROM meta").fetchall())
+        with self._lock:
+            return {"path": self.path, "entries": entries, "bytes": meta["bytes"], "max_bytes": self.max_bytes,
+                    "evictions": meta["evictions"], "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+@functools.lru_cache(maxsize=None)
+def _open(path, max_bytes):
+    return DiskCache(path, max_bytes)
+
+def get_disk_cache():
+    """The process's DiskCache for $AI_ARCHITECT_DISK_CACHE, or None when it is not configured."""
+    path = os.environ.get(DISK_CACHE_ENV)
+    if not path:
+        return None
+    max_mb = os.environ.get(DISK_CACHE_MB_ENV)
+    return _open(str(Path(path).expanduser()), int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES)
+
+
+# --------------------------
+# Warm-up
+# --------------------------
+def warm(render=True, catalog=None):
+    """Fill the diagram sections (graphs, and with render=True their SVGs / PNG) for every threshold region.
+
+    Returns (architectures visited, seconds).
+    """
+    import numpy as np
+
+    from catalog import get_catalog
+    from diagram_cache import dot_to_svg
+    from diagrams import CTO_PNG_ARGS, SECTION_GRAPHS
+    from engine import array_to_params
+    from graph import to_dot, to_png
+    from regions import get_region_table
+    from sections import memoized
+
+    cat = catalog or get_catalog()
+    table = get_region_table(cat)
+    start = time.perf_counter()
+    # One representative slider setting per architecture covers every section key
+    _, first = np.unique(table.region_arch, return_index=True)
+    rendered = set()
+    for region in first.tolist():
+        params = array_to_params(table.representatives[region])
+        result = table.lookup(params)
+        for section, build in SECTION_GRAPHS.items():
+            value = memoized(section, params, lambda: build(result, cat), catalog=cat)
+            if not render:
+                continue
+            for graph in value if isinstance(value, (tuple, list)) else (value,):
+                dot = to_dot(graph)
+                if dot not in rendered:
+                    rendered.add(dot)
+                    dot_to_svg(dot)
+                    if section == "cto":
+                        to_png(graph, **CTO_PNG_ARGS)
+    return len(first), time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Inspect or prefill the persistent result cache.")
+    parser.add_argument("command", choices=["warm", "stats", "clear"])
+    parser.add_argument("--path", help=f"cache file (default ${DISK_CACHE_ENV})")
+    parser.add_argument("--no-render", action="store_true", help="warm: store the graphs only, skip SVG / PNG rendering")
+    args = parser.parse_args()
+
+    if args.path:
+        os.environ[DISK_CACHE_ENV] = args.path
+    cache = get_disk_cache()
+    if cache is None:
+        sys.exit(f"error: set ${DISK_CACHE_ENV} or pass --path")
+    if args.command == "warm":
+        n, seconds = warm(render=not args.no_render)
+        print(f"warmed {n} architectures in {seconds:.1f}s")
+    elif args.command == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
@@ -0,0 +1,299 @@
+"""
+Headless recommendation engine for the AI Architect app.
+- Same rules as the Streamlit page, with no Streamlit dependency.
+- Rules come from the declarative catalog (see catalog.py); every function takes an
+  optional compiled `catalog` and defaults to the hot-reloaded one.
+- Scalar helpers work on one params dict (what app.py renders).
+- evaluate_batch() scores an N x 10 array of slider values in one vectorized pass.
+- Validator checks run on bitsets over the catalog's fixed service / ML component index:
+  pillar_status() and ml_status() take one (W,) bitmap or an (N, W) array, so the scalar
+  and batch paths share one implementation; confidence_score() is the one confidence formula.
+"""
+
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog, iter_bits  # noqa: F401
+
+# Sidebar defaults, in PARAM_KEYS order
+DEFAULT_VALUES = [1, 1, 1, 1, 1, 9, 9, 1, 9, 1]
+# Confidence weights: pillars passed, ML areas complete, parameter alignment
+CONFIDENCE_WEIGHTS = (0.5, 0.35, 0.15)
+
+
+# --------------------------
+# Scalar API (one params dict)
+# --------------------------
+def map_services(params, catalog=None):
+    """Map slider values to AWS service recommendations."""
+    cat = catalog or get_catalog()
+    services = set(cat.always_services)
+    for k, key in enumerate(PARAM_KEYS):
+        services |= cat.value_services[k][params[key]]
+    return services
+
+def build_ml_pipeline(params, catalog=None):
+    """Ordered ML lifecycle nodes for the given slider values."""
+    cat = catalog or get_catalog()
+    bits = cat.ml_always_bits
+    for k, key in enumerate(PARAM_KEYS):
+        bits |= cat.value_ml_bits[k][params[key]]
+    return [cat.ml_nodes[b] for b in iter_bits(bits)]
+
+def check_pillars(services, catalog=None):
+    """Per-pillar results for a service set: pillar_status() on one bitmap row, decoded to names."""
+    cat = catalog or get_catalog()
+    status = pillar_status(cat.encode_services(services), cat)
+    found_rows, passed = status["found"].tolist(), status["passed"].tolist()
+    results = {}
+    for p, (pillar, rules) in enumerate(cat.pillar_rules.items()):
+        found = _row_int(found_rows[p])
+        members = cat.pillar_members[p]
+        found_required = [name for mask, name in members if found & mask]
+        missing_required = [name for mask, name in members if not found & mask]
+        results[pillar] = {
+            "passed": passed[p],
+            "found_required": found_required,
+            "missing_required": missing_required,
+            "notes": f"Found {len(found_required)} of {len(rules['required'])} required services."
+        }
+    return results
+
+def check_ml_coverage(pipeline, catalog=None):
+    """Per-area ML coverage for a pipeline: ml_status() on one mask row, decoded to names."""
+    cat = catalog or get_catalog()
+    status = ml_status(cat.encode_ml(pipeline), cat)
+    missing_rows, complete = status["missing"].tolist(), status["complete"].tolist()
+    coverage = {}
+    for a, area in enumerate(cat.ml_expected):
+        missing_bits = _row_int(missing_rows[a])
+        members = cat.ml_area_members[a]
+        found = [name for mask, name in members if not missing_bits & mask]
+        missing = [name for mask, name in members if missing_bits & mask]
+        coverage[area] = {"found": found, "missing": missing, "complete": complete[a]}
+    return coverage
+
+def compute_confidence(pillar_results, ml_coverage, params, services, catalog=None):
+    cat = catalog or get_catalog()
+    n_passed = sum(v["passed"] for v in pillar_results.values())
+    n_complete = sum(v["complete"] for v in ml_coverage.values())
+    security_need = params.get(PARAM_KEYS[cat.security_param], 5)
+    has_security = bool(cat.service_int(services) & cat.security_int)
+    return confidence_score(n_passed, n_complete, security_aligned(security_need, has_security, cat), cat)
+
+def remediation_suggestions(pillar_results, ml_coverage):
+    rem = []
+    for p, res in pillar_results.items():
+        if not res["passed"]:
+            rem.append(f"For pillar **{p}**, missing required services: {', '.join(res['missing_required'])}. Suggest adding at least one of them or an equivalent managed service.")
+    for area, cov in ml_coverage.items():
+        if not cov["complete"]:
+            rem.append(f"ML area **{area}** missing components: {', '.join(cov['missing'])}. Add these to reach production maturity.")
+    if not rem:
+        rem.append("No immediate remediation required; architecture satisfies baseline enterprise checks.")
+    return rem
+
+def map_roles(services, catalog=None):
+    cat = catalog or get_catalog()
+    role_assign = {}
+    for s in services:
+        role_assign[s] = cat.role_map.get(s, cat.default_role)
+    return role_assign
+
+def evaluate(params, catalog=None, step=None):
+    """Services, ML pipeline and validator results for one params dict.
+
+    step: optional name -> context manager wrapped around each stage (e.g. RerunTimer.step).
+    """
+    cat = catalog or get_catalog()
+    step = step or (lambda name: nullcontext())
+    with step("map_services"):
+        services = map_services(params, cat)
+    with step("build_ml_pipeline"):
+        ml_pipeline = build_ml_pipeline(params, cat)
+    with step("check_pillars"):
+        pillar_results = check_pillars(services, cat)
+    with step("check_ml_coverage"):
+        ml_coverage = check_ml_coverage(ml_pipeline, cat)
+    with step("compute_confidence"):
+        confidence = compute_confidence(pillar_results, ml_coverage, params, services, cat)
+    with step("remediation_and_roles"):
+        remediation = remediation_suggestions(pillar_results, ml_coverage)
+        roles = map_roles(sorted(services), cat)
+    return {
+        "selected_services": sorted(services),
+        "ml_pipeline": ml_pipeline,
+        "pillar_checks": pillar_results,
+        "ml_coverage": ml_coverage,
+        "confidence": confidence,
+        "remediation": remediation,
+        "role_mapping": roles
+    }
+
+def build_report(params, result=None, catalog=None, generated_at=None):
+    """Full validator report for one params dict (same shape as the app download).
+
+    result: a precomputed evaluate() output (e.g. from regions.lookup) to reuse.
+    generated_at: timestamp string to use instead of now (e.g. one per bulk export).
+    """
+    if result is None:
+        result = evaluate(params, catalog)
+    return {
+        "title": "AI Architect Final Report",
+        "generated_at": generated_at or datetime.utcnow().isoformat() + "Z",
+        "brief_parameters": dict(params),
+        **result
+    }
+
+
+# --------------------------
+# Batch API (N x 10 array)
+# --------------------------
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        """Set bits per row of a (..., W) uint64 word array."""
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    def popcount(words):
+        """Set bits per row of a (..., W) uint64 word array."""
+        as_bytes = np.ascontiguousarray(words).view(np.uint8)
+        return np.unpackbits(as_bytes, axis=-1).sum(axis=-1, dtype=np.int64)
+
+def normalize_params(raw):
+    """Params dict (PARAM_KEYS order) from a request-style dict.
+
+    Keys may be full param keys or short slider names; missing sliders take the sidebar
+    defaults. Raises ValueError on unknown keys or values that are not integers in range.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"expected an object of slider values, got {type(raw).__name__}")
+    values = list(DEFAULT_VALUES)
+    for name, value in raw.items():
+        if name in PARAM_KEYS:
+            k = PARAM_KEYS.index(name)
+        elif name in PARAM_NAMES:
+            k = PARAM_NAMES.index(name)
+        else:
+            raise ValueError(f"unknown slider {name!r} (expected one of {', '.join(PARAM_NAMES)})")
+        if isinstance(value, bool) or not isinstance(value, int) or not SLIDER_MIN <= value <= SLIDER_MAX:
+            raise ValueError(f"{PARAM_NAMES[k]} must be an integer between {SLIDER_MIN} and {SLIDER_MAX}, got {value!r}")
+        values[k] = value
+    return dict(zip(PARAM_KEYS, values))
+
+def params_to_array(params_list):
+    """Stack params dicts into an N x 10 int array (PARAM_KEYS order)."""
+    return np.array([[p[k] for k in PARAM_KEYS] for p in params_list], dtype=np.int64).reshape(-1, len(PARAM_KEYS))
+
+def array_to_params(row):
+    return {k: int(v) for k, v in zip(PARAM_KEYS, row)}
+
+def _check_values(values):
+    values = np.asarray(values)
+    if values.ndim != 2 or values.shape[1] != len(PARAM_KEYS):
+        raise ValueError(f"expected an N x {len(PARAM_KEYS)} array of slider values, got shape {values.shape}")
+    if values.size and (values.min() < SLIDER_MIN or values.max() > SLIDER_MAX):
+        raise ValueError(f"slider values must be between {SLIDER_MIN} and {SLIDER_MAX}")
+    return values.astype(np.intp, copy=False)
+
+def _gather(lut, always, values):
+    out = np.empty((values.shape[0], lut.shape[-1]), dtype=np.uint64)
+    out[:] = always
+    for k in range(values.shape[1]):
+        out |= lut[k, values[:, k]]
+    return out
+
+def batch_services(values, catalog=None):
+    """(N, service_words) service bitmaps."""
+    cat = catalog or get_catalog()
+    return _gather(cat.service_lut, cat.service_always, _check_values(values))
+
+def batch_ml_nodes(values, catalog=None):
+    """(N, ml_words) ML pipeline node masks."""
+    cat = catalog or get_catalog()
+    return _gather(cat.ml_lut, cat.ml_always, _check_values(values))
+
+def pillar_status(services, catalog=None):
+    """Pillar checks on service bitmaps of shape (W,) or (N, W).
+
+    Returns "found" / "missing" word arrays of shape (..., P, W), "count" (..., P) and
+    "passed" (..., P) in catalog.pillar_rules order.
+    """
+    cat = catalog or get_catalog()
+    services = np.asarray(services, dtype=np.uint64)[..., None, :]
+    found = services & cat.pillar_masks
+    count = popcount(found)
+    return {"found": found, "missing": cat.pillar_masks & ~services, "count": count,
+            "passed": count >= cat.pillar_thresholds}
+
+def ml_status(ml_masks, catalog=None):
+    """ML coverage checks on component masks of shape (W,) or (N, W).
+
+    Returns "missing" words (..., A, W) and "complete" (..., A) in catalog.ml_expected order.
+    """
+    cat = catalog or get_catalog()
+    missing = cat.ml_area_masks & ~np.asarray(ml_masks, dtype=np.uint64)[..., None, :]
+    return {"missing": missing, "complete": ~missing.any(axis=-1)}
+
+def security_aligned(security_need, has_security, catalog=None):
+    """Parameter sanity: a high security slider needs a security service. Scalars or arrays."""
+    cat = catalog or get_catalog()
+    return (security_need <= cat.security_threshold) | has_security
+
+def confidence_score(n_passed, n_complete, aligned, catalog=None):
+    """Heuristic confidence out of 100: pillar pass count + ML coverage + param alignment.
+
+    The one confidence formula, for scalars (compute_confidence, solver.py) or arrays
+    (evaluate_batch): pillars passed, ML areas complete, and security_aligned().
+    """
+    cat = catalog or get_catalog()
+    w_pillars, w_ml, w_params = CONFIDENCE_WEIGHTS
+    param_score = 0.5 + 0.5 * aligned
+    final = (w_pillars * (n_passed / len(cat.pillar_rules)) + w_ml * (n_complete / len(cat.ml_expected))
+             + w_params * param_score) * 100
+    if isinstance(final, float):
+        # round(x * 10) / 10 is np.round(x, 1) bit for bit, without the NumPy round trip
+        return round(final * 10) / 10
+    return np.round(final, 1)
+
+def batch_confidence(values, services, ml_masks, catalog=None):
+    """Confidence scores for precomputed service bitmaps and ML masks."""
+    cat = catalog or get_catalog()
+    has_security = (services & cat.security_mask).any(axis=-1)
+    aligned = security_aligned(np.asarray(values)[:, cat.security_param], has_security, cat)
+    return confidence_score(pillar_status(services, cat)["passed"].sum(axis=-1),
+                            ml_status(ml_masks, cat)["complete"].sum(axis=-1), aligned, cat)
+
+def evaluate_batch(values, catalog=None):
+    """Score N slider vectors at once.
+
+    Returns a dict with "services" and "ml_nodes" (uint64 word bitmaps, see Catalog.services /
+    Catalog.ml_components) and "confidence" (float64, same value compute_confidence gives per row).
+    """
+    cat = catalog or get_catalog()
+    values = _check_values(values)
+    services = _gather(cat.service_lut, cat.service_always, values)
+    ml_masks = _gather(cat.ml_lut, cat.ml_always, values)
+    return {"services": services, "ml_nodes": ml_masks, "confidence": batch_confidence(values, services, ml_masks, cat)}
+
+def _row_int(row):
+    """Python-int bitset of one row of uint64 words (a list, lowest word first)."""
+    x = 0
+    for word in reversed(row):
+        x = x << 64 | word
+    return x
+
+def _bits(row):
+    row = np.atleast_1d(row)
+    return [w * 64 + b for w, word in enumerate(row.tolist()) for b in range(64) if word >> b & 1]
+
+def decode_services(row, catalog=None):
+    """Service names (sorted) for one bitmap row."""
+    cat = catalog or get_catalog()
+    return [cat.services[b] for b in _bits(row)]
+
+def decode_ml_nodes(row, catalog=None):
+    """ML nodes (pipeline order) for one mask row."""
+    cat = catalog or get_catalog()
+    return [cat.ml_components[b] for b in _bits(row)]
@@ -0,0 +1,45 @@
+"""
+Matplotlib rendering without pyplot's global figure registry.
+- Figures are built with the object-oriented API on an Agg canvas, rasterized to PNG bytes
+  (or written as SVG) and released as soon as the bytes exist, so no rerun leaves a figure behind.
+"""
+
+import io
+
+# 14in x 100dpi stays under Streamlit's 1460px content width, so st.image serves the
+# cached bytes as-is instead of resizing and re-encoding them on every rerun.
+DEFAULT_DPI = 100
+
+
+def render_png(draw, figsize=(14, 8), dpi=DEFAULT_DPI, fmt="png"):
+    """Call draw(ax) on a fresh Agg figure and return the PNG bytes (SVG bytes with fmt="svg")."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    try:
+        draw(fig.add_subplot())
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        # Break the figure <-> artist reference cycles now instead of waiting for the GC
+        fig.clear()
+        del fig
+
+def graph_png(nodes, edges, pos, title=None, arrows=True, fmt="png"):
+    """PNG (or fmt="svg") of a node/edge graph for precomputed layout positions (graph.to_png renders Graphs through this)."""
+    import networkx as nx
+
+    g = nx.DiGraph()
+    g.add_nodes_from(nodes)
+    g.add_edges_from(edges)
+
+    def draw(ax):
+        nx.draw(g, pos, with_labels=True, node_size=4000, node_color="skyblue",
+                font_size=9, font_weight="bold", edge_color="gray", arrows=arrows, ax=ax)
+        if title:
+            ax.set_title(title, fontsize=16, fontweight="bold")
+
+    return render_png(draw, fmt=fmt)
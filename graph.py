@@ -0,0 +1,224 @@
+"""
+One graph model for every diagram on the page.
+- Graph interns node names to ints and keeps edges as two parallel int arrays, plus a cluster
+  index per node; successor / predecessor lookups go through CSR adjacency indexes built on
+  first use. Building, deduplicating and walking a graph is linear in nodes + edges.
+- diagrams.py builds the page's graphs from the catalog; the renderers here turn any Graph
+  into DOT, SVG (Graphviz, via the diagram cache), Mermaid or a matplotlib PNG / SVG.
+"""
+
+from array import array
+from contextlib import nullcontext
+
+import numpy as np
+
+from diagram_cache import DIAGRAM_CACHE, cached_png, content_key, dot_to_svg, graph_layout
+from disk_cache import register_json_type
+
+# Above this many edges the matplotlib renderer draws plain lines: one arrow patch per edge
+# is the slowest part of a large drawing.
+MAX_ARROW_EDGES = 500
+
+
+class Graph:
+    """Directed graph with interned node ids, edge arrays and optional node clusters.
+
+    Node i is nodes[i]; edge j runs from node src[j] to node dst[j]. Nodes, edges and clusters
+    keep insertion order (and duplicate edges are dropped), so equal inputs render identically.
+    """
+
+    def __init__(self, name, rankdir="LR", node_attrs=None):
+        self.name = name
+        self.rankdir = rankdir
+        self.node_attrs = dict(node_attrs or {})
+        self.nodes = []
+        self.index = {}
+        self.cluster_of = array("i")  # cluster index per node, -1 when unclustered
+        self.clusters = []  # (name, label, attrs)
+        self.src = array("I")
+        self.dst = array("I")
+        self._edge_keys = set()
+        self._adjacency = None
+
+    @property
+    def n_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def n_edges(self):
+        return len(self.src)
+
+    def add_cluster(self, name, label, **attrs):
+        self.clusters.append((name, label, attrs))
+        return len(self.clusters) - 1
+
+    def add_node(self, name, cluster=None):
+        """Node id for name, adding it if new; cluster (an add_cluster index) moves it into that cluster."""
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.nodes)
+            self.nodes.append(name)
+            self.cluster_of.append(-1)
+            self._adjacency = None
+        if cluster is not None:
+            self.cluster_of[i] = cluster
+        return i
+
+    def add_edge(self, a, b):
+        u, v = self.add_node(a), self.add_node(b)
+        key = u << 32 | v
+        if key not in self._edge_keys:
+            self._edge_keys.add(key)
+            self.src.append(u)
+            self.dst.append(v)
+            self._adjacency = None
+
+    def add_path(self, names):
+        for a, b in zip(names, names[1:]):
+            self.add_edge(a, b)
+
+    def edges(self):
+        """(source name, target name) pairs in insertion order."""
+        nodes = self.nodes
+        return [(nodes[u], nodes[v]) for u, v in zip(self.src, self.dst)]
+
+    def has_edge(self, a, b):
+        u, v = self.index.get(a), self.index.get(b)
+        return u is not None and v is not None and (u << 32 | v) in self._edge_keys
+
+    def _csr(self):
+        if self._adjacency is None:
+            n = len(self.nodes)
+            src = np.frombuffer(self.src, dtype=np.uint32) if self.src else np.zeros(0, np.uint32)
+            dst = np.frombuffer(self.dst, dtype=np.uint32) if self.dst else np.zeros(0, np.uint32)
+            index = []
+            for keys, values in ((src, dst), (dst, src)):
+                order = np.argsort(keys, kind="stable")
+                offsets = np.zeros(n + 1, dtype=np.int64)
+                np.cumsum(np.bincount(keys, minlength=n), out=offsets[1:])
+                index.append((offsets, values[order]))
+            self._adjacency = index
+        return self._adjacency
+
+    def successors(self, name):
+        offsets, targets = self._csr()[0]
+        i = self.index[name]
+        return [self.nodes[j] for j in targets[offsets[i]:offsets[i + 1]].tolist()]
+
+    def predecessors(self, name):
+        offsets, sources = self._csr()[1]
+        i = self.index[name]
+        return [self.nodes[j] for j in sources[offsets[i]:offsets[i + 1]].tolist()]
+
+    def out_degrees(self):
+        return np.diff(self._csr()[0][0])
+
+    def in_degrees(self):
+        return np.diff(self._csr()[1][0])
+
+    def cluster_members(self):
+        """Node ids per cluster, plus the unclustered node ids last."""
+        members = [[] for _ in range(len(self.clusters) + 1)]
+        for i, c in enumerate(self.cluster_of):
+            members[c].append(i)  # -1 lands in the trailing unclustered list
+        return members
+
+    def content(self):
+        """JSON-able description of the whole graph, for content-addressed render caches."""
+        return [self.name, self.rankdir, self.node_attrs, self.nodes, self.cluster_of.tolist(),
+                self.clusters, self.src.tolist(), self.dst.tolist()]
+
+    @classmethod
+    def from_content(cls, content):
+        """Inverse of content()."""
+        name, rankdir, node_attrs, nodes, cluster_of, clusters, src, dst = content
+        g = cls(name, rankdir, node_attrs)
+        g.clusters = [(c_name, label, dict(attrs)) for c_name, label, attrs in clusters]
+        for node, c in zip(nodes, cluster_of):
+            g.add_node(node, None if c < 0 else c)
+        for u, v in zip(src, dst):
+            g.add_edge(nodes[u], nodes[v])
+        return g
+
+
+# Graphs are section memo values, so the persistent cache stores them as their content
+register_json_type(Graph, "graph", Graph.content, Graph.from_content)
+
+
+# --------------------------
+# Renderers
+# --------------------------
+def _dot_quote(text):
+    return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _dot_attrs(attrs, sep=", "):
+    return sep.join(f"{k}={v if isinstance(v, (int, float)) else _dot_quote(v)}" for k, v in attrs.items())
+
+def to_dot(graph):
+    """Graphviz DOT source: clusters as cluster_* subgraphs, then unclustered nodes, then edges."""
+    nodes = graph.nodes
+    lines = [f"digraph {graph.name} {{", f"rankdir={graph.rankdir};"]
+    if graph.node_attrs:
+        lines.append(f"node [{_dot_attrs(graph.node_attrs)}];")
+    members = graph.cluster_members()
+    for (name, label, attrs), ids in zip(graph.clusters, members):
+        lines.append(f"subgraph cluster_{name} {{")
+        lines.append(_dot_attrs({"label": label, **attrs}, "; ") + ";")
+        lines.extend(f"{_dot_quote(nodes[i])};" for i in ids)
+        lines.append("}")
+    lines.extend(f"{_dot_quote(nodes[i])};" for i in members[-1])
+    lines.extend(f"{_dot_quote(nodes[u])} -> {_dot_quote(nodes[v])};" for u, v in zip(graph.src, graph.dst))
+    lines.append("}")
+    return "\n".join(lines)
+
+def to_svg(graph):
+    """SVG text (cached on the DOT source), or None when the Graphviz `dot` executable is unavailable."""
+    return dot_to_svg(to_dot(graph))
+
+def _mermaid_label(text):
+    return '"' + str(text).replace('"', "#quot;") + '"'
+
+def to_mermaid(graph):
+    """Mermaid flowchart source; node ids are n<id>, cluster ids c<index>."""
+    nodes = graph.nodes
+    lines = [f"flowchart {graph.rankdir}"]
+    members = graph.cluster_members()
+    for c, ((_, label, _), ids) in enumerate(zip(graph.clusters, members)):
+        lines.append(f"    subgraph c{c}[{_mermaid_label(label)}]")
+        lines.extend(f"        n{i}[{_mermaid_label(nodes[i])}]" for i in ids)
+        lines.append("    end")
+    lines.extend(f"    n{i}[{_mermaid_label(nodes[i])}]" for i in members[-1])
+    lines.extend(f"    n{u} --> n{v}" for u, v in zip(graph.src, graph.dst))
+    if "fillcolor" in graph.node_attrs:
+        lines.append(f"    classDef default fill:{graph.node_attrs['fillcolor']}")
+    for c, (_, _, attrs) in enumerate(graph.clusters):
+        if "fillcolor" in attrs:
+            lines.append(f"    style c{c} fill:{attrs['fillcolor']}")
+    return "\n".join(lines)
+
+def to_png(graph, title=None, layout="spring_layout", step=None, **layout_kwargs):
+    """Matplotlib PNG bytes; the layout and the image are both cached on the graph content.
+
+    networkx and matplotlib are only imported on a cache miss. step: optional name -> context
+    manager wrapped around the layout and the rasterization (e.g. RerunTimer.step).
+    """
+    step = step or (lambda name: nullcontext())
+    with step(layout):
+        pos = graph_layout(graph.nodes, graph.edges(), layout, **layout_kwargs)
+
+    def draw():
+        from figures import graph_png
+        return graph_png(graph.nodes, graph.edges(), pos, title, arrows=graph.n_edges <= MAX_ARROW_EDGES)
+
+    with step("png"):
+        return cached_png(["graph", graph.content(), pos, title], draw)
+
+def to_plot_svg(graph, title=None, layout="spring_layout", **layout_kwargs):
+    """Matplotlib SVG text, cached like to_png; for static exports and hosts without Graphviz."""
+    pos = graph_layout(graph.nodes, graph.edges(), layout, **layout_kwargs)
+
+    def draw():
+        from figures import graph_png
+        return graph_png(graph.nodes, graph.edges(), pos, title, arrows=graph.n_edges <= MAX_ARROW_EDGES, fmt="svg").decode()
+
+    return DIAGRAM_CACHE.get_or_render(content_key("plot-svg", graph.content(), pos, title), draw)
@@ -0,0 +1,187 @@
+"""
+Opt-in profiling metrics for app.py, in OpenMetrics (Prometheus) text format.
+- Profiling is on for every session when $AI_ARCHITECT_PROFILE is set, or per session from the
+  sidebar toggle; a profiled rerun feeds its RerunTimer into record_rerun().
+- The registry keeps duration histograms (rerun, section, step) and pulls the memo and diagram
+  cache hit/miss counters when rendered, so those count every session, profiled or not.
+- $AI_ARCHITECT_METRICS_FILE is rewritten atomically after each profiled rerun (e.g. for the
+  node_exporter textfile collector); $AI_ARCHITECT_METRICS_PORT serves GET /metrics.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from diagram_cache import DIAGRAM_CACHE
+from disk_cache import get_disk_cache
+from sections import memo_counts
+
+PROFILE_ENV = "AI_ARCHITECT_PROFILE"
+METRICS_FILE_ENV = "AI_ARCHITECT_METRICS_FILE"
+METRICS_PORT_ENV = "AI_ARCHITECT_METRICS_PORT"
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "ai_architect_"
+# Seconds; the page's sections run from tens of microseconds (memo hits) to seconds (cold renders)
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no")
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}" if pairs else ""
+
+def _number(x):
+    return repr(float(x)) if isinstance(x, float) else str(x)
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def lines(self):
+        yield f"# TYPE {self.name} histogram"
+        yield f"# UNIT {self.name} seconds"
+        yield f"# HELP {self.name} {self.help}"
+        for labels, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                le = bound if bound == "+Inf" else repr(float(bound))
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, [('le', le)])} {count}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-2]}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-1])}"
+
+
+class Registry:
+    """Thread-safe set of histograms plus collectors polled at render time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rerun = Histogram(PREFIX + "rerun_duration_seconds", "Wall time of a profiled page rerun.", ())
+        self.section = Histogram(PREFIX + "section_duration_seconds", "Wall time per page section.", ("section", "memo"))
+        self.step = Histogram(PREFIX + "step_duration_seconds", "Wall time per profiled step inside a section.", ("section", "step"))
+        self.collectors = [_memo_metrics, _diagram_cache_metrics, _disk_cache_metrics]
+
+    def record(self, timer):
+        with self._lock:
+            self.rerun.observe((), timer.total_ms() / 1000)
+            for name, row in timer.rows.items():
+                self.section.observe((name, row["memo"]), row["ms"] / 1000)
+            for span in timer.spans:
+                if span["depth"] > 0:
+                    self.step.observe((span["section"], span["name"]), span["ms"] / 1000)
+
+    def render(self):
+        """The whole registry as an OpenMetrics text exposition (ends with # EOF)."""
+        with self._lock:
+            lines = [line for h in (self.rerun, self.section, self.step) for line in h.lines()]
+        for collect in self.collectors:
+            lines.extend(collect())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _counter(name, help_text, samples):
+    """OpenMetrics counter family: samples are (label names, label values, value)."""
+    yield f"# TYPE {name} counter"
+    yield f"# HELP {name} {help_text}"
+    for names, values, value in samples:
+        yield f"{name}_total{_labels(names, values)} {value}"
+
+def _memo_metrics():
+    counts = memo_counts()
+    yield from _counter(PREFIX + "memo_lookups", "Section memo lookups by result.",
+                        [(("section", "result"), key, n) for key, n in sorted(counts.items())])
+
+def _diagram_cache_metrics():
+    stats = DIAGRAM_CACHE.stats()
+    yield from _counter(PREFIX + "diagram_cache_lookups", "Diagram render cache lookups by result.",
+                        [(("result",), ("hit",), stats["hits"]), (("result",), ("miss",), stats["misses"])])
+    yield from _counter(PREFIX + "diagram_cache_evictions", "Diagram render cache LRU evictions.", [((), (), stats["evictions"])])
+    yield f"# TYPE {PREFIX}diagram_cache_bytes gauge"
+    yield f"# UNIT {PREFIX}diagram_cache_bytes bytes"
+    yield f"# HELP {PREFIX}diagram_cache_bytes Bytes held by the diagram render cache."
+    yield f"{PREFIX}diagram_cache_bytes {stats['bytes']}"
+
+def _disk_cache_metrics():
+    disk = get_disk_cache()
+    if disk is None:
+        return
+    stats = disk.stats()
+    yield from _counter(PREFIX + "disk_cache_lookups", "Persistent cache lookups from this process by result.",
+                        [(("result",), (r,), stats[key]) for r, key in (("hit", "hits"), ("miss", "misses"), ("error", "errors"))])
+    yield from _counter(PREFIX + "disk_cache_evictions", "Persistent cache LRU evictions (all processes).", [((), (), stats["evictions"])])
+    yield f"# TYPE {PREFIX}disk_cache_bytes gauge"
+    yield f"# UNIT {PREFIX}disk_cache_bytes bytes"
+    yield f"# HELP {PREFIX}disk_cache_bytes Bytes held by the persistent cache (all processes)."
+    yield f"{PREFIX}disk_cache_bytes {stats['bytes']}"
+
+
+REGISTRY = Registry()
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Replace path with the current exposition (write to a temporary file, then rename)."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(registry.render(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+def serve(port, host="127.0.0.1"):
+    """Start (once per process) a daemon thread serving GET /metrics; returns the server."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
+
+def record_rerun(timer, registry=REGISTRY):
+    """Add a profiled rerun to the registry and publish it where the environment asks."""
+    registry.record(timer)
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path:
+        write_textfile(path, registry)
+    port = os.environ.get(METRICS_PORT_ENV)
+    if port:
+        serve(int(port))
@@ -0,0 +1,35 @@
+"""
+Background import of the heavy plotting stack.
+- app.py starts this after the first sections are on screen, so a cold process pays for
+  networkx/matplotlib while the user is reading, not before the first slider renders.
+- Python's import lock makes a later foreground import wait for (not repeat) this one.
+"""
+
+import importlib
+import sys
+import threading
+
+HEAVY_MODULES = ("networkx", "matplotlib.figure", "matplotlib.backends.backend_agg", "graphviz")
+
+_lock = threading.Lock()
+_thread = None
+
+
+def _import_all(modules):
+    for name in modules:
+        if name not in sys.modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+def prewarm_in_background(modules=HEAVY_MODULES):
+    """Start (once per process) a daemon thread importing modules; returns the thread or None."""
+    global _thread
+    if all(name in sys.modules for name in modules):
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_import_all, args=(tuple(modules),), name="prewarm-imports", daemon=True)
+            _thread.start()
+        return _thread
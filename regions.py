@@ -0,0 +1,184 @@
+"""
+Threshold-region precomputation for the AI Architect engine.
+- Every rule is a fixed `value > threshold` test on one slider, so the 10^10 slider space
+  splits into a small grid of regions with identical outputs.
+- The table below evaluates each region once; lookups are then O(1) index arithmetic.
+- Run `python regions.py [services|architecture]` for the regions explorer.
+"""
+
+import functools
+import json
+
+import numpy as np
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog
+from engine import array_to_params, build_report, evaluate, evaluate_batch, pillar_status
+
+
+class RegionTable:
+    """All threshold regions, their architectures and an O(1) params -> result lookup.
+
+    Results returned by lookup() are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.thresholds = catalog.slider_thresholds()
+        self.shape = tuple(len(t) + 1 for t in self.thresholds)
+        self.n_regions = int(np.prod(self.shape))
+
+        # offsets[k, v]: contribution of slider k at value v to the flat region index
+        strides = np.array([int(np.prod(self.shape[k + 1:])) for k in range(len(self.shape))])
+        values = np.arange(SLIDER_MAX + 1)
+        intervals = np.array([np.searchsorted(t, values, side="left") for t in self.thresholds])
+        self.offsets = intervals * strides[:, None]
+
+        # Lowest slider value of every interval, and the value range each interval covers
+        self.lows = [np.array([SLIDER_MIN] + [t + 1 for t in ts]) for ts in self.thresholds]
+        self.widths = [np.diff(np.append(low, SLIDER_MAX + 1)) for low in self.lows]
+
+        grid = np.indices(self.shape).reshape(len(self.shape), -1).T
+        self.region_intervals = grid
+        self.representatives = np.stack([self.lows[k][grid[:, k]] for k in range(len(self.shape))], axis=1)
+        self.region_points = np.prod(np.stack([self.widths[k][grid[:, k]] for k in range(len(self.shape))], axis=1), axis=1)
+
+        batch = evaluate_batch(self.representatives, catalog)
+        keys = np.concatenate([batch["services"], batch["ml_nodes"]], axis=1)
+        _, first, self.region_arch = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        self.region_arch = self.region_arch.reshape(-1)
+        self.n_architectures = len(first)
+        _, self.region_service_set = np.unique(batch["services"], axis=0, return_inverse=True)
+        self.region_service_set = self.region_service_set.reshape(-1)
+        self.n_service_sets = int(self.region_service_set.max()) + 1
+
+        # Compact per-architecture columns, plus the full result dict for each
+        self.arch_services = batch["services"][first]
+        self.arch_ml_nodes = batch["ml_nodes"][first]
+        self.arch_confidence = batch["confidence"][first]
+        self.results = [evaluate(array_to_params(self.representatives[r]), catalog) for r in first]
+        passed = pillar_status(self.arch_services, catalog)["passed"]
+        # Bit p set when pillar p passes; int64 holds up to 63 pillars
+        self.arch_pillars = (passed.astype(np.int64) << np.arange(passed.shape[1], dtype=np.int64)).sum(axis=1)
+        self._explored = {}
+        self._result_json = {}
+
+    def region_index(self, params):
+        return int(sum(self.offsets[k, params[key]] for k, key in enumerate(PARAM_KEYS)))
+
+    def region_indices(self, values):
+        """Flat region index for every row of an N x 10 slider array."""
+        values = np.asarray(values, dtype=np.intp)
+        return self.offsets[np.arange(len(PARAM_KEYS)), values].sum(axis=1)
+
+    def architecture_id(self, params):
+        return int(self.region_arch[self.region_index(params)])
+
+    def lookup(self, params):
+        """Same dict as engine.evaluate(params), served from the table."""
+        return self.results[self.region_arch[self.region_index(params)]]
+
+    def architecture_ids(self, values):
+        """architecture_id() for every row of an N x 10 slider array, in one vectorized index pass."""
+        return self.region_arch[self.region_indices(values)]
+
+    def lookup_batch(self, values):
+        """lookup() for every row of an N x 10 slider array."""
+        return [self.results[a] for a in self.architecture_ids(values).tolist()]
+
+    def result_json(self, arch):
+        """json.dumps(results[arch]) without the outer braces, encoded once per architecture."""
+        fragment = self._result_json.get(arch)
+        if fragment is None:
+            fragment = self._result_json[arch] = json.dumps(self.results[arch])[1:-1]
+        return fragment
+
+    def report_json(self, params, arch, generated_at=None):
+        """json.dumps(build_report(params, ...)) for params in architecture arch, reusing its encoded results."""
+        head = json.dumps(build_report(params, {}, generated_at=generated_at))[:-1]
+        return f"{head}, {self.result_json(arch)}}}"
+
+    def _groups(self, group):
+        if group == "architecture":
+            return self.region_arch, self.n_architectures
+        if group == "services":
+            return self.region_service_set, self.n_service_sets
+        raise ValueError(f"unknown group {group!r} (expected 'architecture' or 'services')")
+
+    def slider_values(self, group="architecture"):
+        """Per group, per slider: the slider values that occur anywhere inside the group."""
+        region_group, n_groups = self._groups(group)
+        out = [[None] * len(self.shape) for _ in range(n_groups)]
+        for k in range(len(self.shape)):
+            seen = np.zeros((n_groups, self.shape[k]), dtype=bool)
+            seen[region_group, self.region_intervals[:, k]] = True
+            for g in range(n_groups):
+                out[g][k] = [v for i in np.flatnonzero(seen[g]) for v in range(self.lows[k][i], self.lows[k][i] + self.widths[k][i])]
+        return out
+
+    def explore(self, group="architecture"):
+        """One summary row per distinct architecture (or service set), most common first.
+
+        "affecting_sliders" maps each slider that pins the group to the values it allows;
+        sliders that may take any value inside the group are left out.
+        """
+        if group in self._explored:
+            return self._explored[group]
+        region_group, n_groups = self._groups(group)
+        points = np.bincount(region_group, weights=self.region_points, minlength=n_groups)
+        regions = np.bincount(region_group, minlength=n_groups)
+        first = np.unique(region_group, return_index=True)[1]
+        values = self.slider_values(group)
+        full = SLIDER_MAX - SLIDER_MIN + 1
+        total = float(self.region_points.sum())
+        rows = []
+        for g in np.argsort(-points, kind="stable"):
+            res = self.results[self.region_arch[first[g]]]
+            rows.append({
+                "id": int(g),
+                "regions": int(regions[g]),
+                "share_of_space": points[g] / total,
+                "confidence": res["confidence"],
+                "services": len(res["selected_services"]),
+                "ml_nodes": len(res["ml_pipeline"]),
+                "pillars_passed": sum(v["passed"] for v in res["pillar_checks"].values()),
+                "affecting_sliders": {PARAM_NAMES[k]: _format_values(vals) for k, vals in enumerate(values[g]) if len(vals) < full},
+            })
+        self._explored[group] = rows
+        return rows
+
+
+def _format_values(values):
+    """[1, 2, 3, 7] -> "1-3,7"."""
+    runs = []
+    for v in values:
+        if runs and v == runs[-1][1] + 1:
+            runs[-1][1] = v
+        else:
+            runs.append([v, v])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in runs)
+
+
+@functools.lru_cache(maxsize=4)
+def _table_for(catalog):
+    return RegionTable(catalog)
+
+def get_region_table(catalog=None):
+    """Process-wide region table for the current catalog (rebuilt once per catalog version)."""
+    return _table_for(catalog or get_catalog())
+
+def lookup(params, catalog=None):
+    return get_region_table(catalog).lookup(params)
+
+
+if __name__ == "__main__":
+    import sys
+
+    group = sys.argv[1] if len(sys.argv) > 1 else "services"
+    table = get_region_table()
+    print("Slider cut points: " + ", ".join(f"{n} {t}" for n, t in zip(PARAM_NAMES, table.thresholds)))
+    print(f"{table.n_regions} threshold regions -> {table.n_architectures} distinct architectures, "
+          f"{table.n_service_sets} distinct service sets")
+    for row in table.explore(group):
+        sliders = ", ".join(f"{name} {vals}" for name, vals in row["affecting_sliders"].items())
+        print(f"#{row['id']:>4}  {row['share_of_space']:7.2%}  regions={row['regions']:<4} "
+              f"services={row['services']:<3} pillars={row['pillars_passed']}/5  {sliders}")
@@ -0,0 +1,341 @@
+"""
+Saved scenarios: slider settings with their evaluated outcome, in a local SQLite file.
+- Each row stores the sliders plus the outcome as bitmasks: service and ML node bitmaps
+  (uint64 words, engine.evaluate_batch layout), a passed-pillar bitmask and the confidence.
+  The catalog layout (bit -> name) is stored once per catalog version, so rows saved under an
+  older catalog still decode.
+- scenario_services is an inverted index (service name -> scenario ids) and confidence has its
+  own index, so "contains Bedrock, confidence > 80" is an index intersection plus a range scan.
+- diff() and compare() work on the stored bitmasks (AND-NOT / XOR and popcount), never by
+  re-evaluating rules; compare() diffs one scenario against thousands in one numpy pass.
+- The file is $AI_ARCHITECT_SCENARIOS (default $XDG_DATA_HOME/ai-architect/scenarios.sqlite, so
+  it does not depend on the working directory), in WAL mode so several app processes can share it.
+
+    python scenarios.py save "GenAI baseline" --params '{"Model Complexity": 9}'
+    python scenarios.py find "Bedrock, confidence > 80"
+    python scenarios.py diff 1 2
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from catalog import PARAM_KEYS, PARAM_NAMES, get_catalog
+from engine import evaluate_batch, pillar_status, popcount
+
+SCENARIOS_ENV = "AI_ARCHITECT_SCENARIOS"
+DEFAULT_PATH = Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "ai-architect" / "scenarios.sqlite"
+BUSY_TIMEOUT_S = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS layouts (
+    catalog_version TEXT PRIMARY KEY,
+    services TEXT NOT NULL,
+    ml_nodes TEXT NOT NULL,
+    pillars TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    created REAL NOT NULL,
+    catalog_version TEXT NOT NULL REFERENCES layouts,
+    params TEXT NOT NULL,
+    services BLOB NOT NULL,
+    ml_nodes BLOB NOT NULL,
+    pillars INTEGER NOT NULL,
+    n_services INTEGER NOT NULL,
+    confidence REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_confidence ON scenarios (confidence);
+CREATE INDEX IF NOT EXISTS scenarios_created ON scenarios (created);
+CREATE TABLE IF NOT EXISTS scenario_services (
+    service TEXT NOT NULL,
+    scenario_id INTEGER NOT NULL REFERENCES scenarios ON DELETE CASCADE,
+    PRIMARY KEY (service, scenario_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scenario_services_scenario ON scenario_services (scenario_id);
+"""
+
+# Summary columns for listings (no blobs)
+_SUMMARY = "s.id, s.name, s.created, s.confidence, s.n_services, s.catalog_version"
+_OPS = {">": ">", ">=": ">=", "<": "<", "<=": "<=", "=": "=", "==": "="}
+
+
+def _bits(words):
+    return [w * 64 + b for w, word in enumerate(words) for b in range(64) if word >> b & 1]
+
+def _words(blob):
+    return np.frombuffer(blob, dtype=np.uint64)
+
+
+class ScenarioStore:
+    """Saved scenarios in one SQLite file; safe to share between threads and processes."""
+
+    def __init__(self, path, catalog=None):
+        self.path = str(path)
+        self.catalog = catalog or get_catalog()
+        self._local = threading.local()
+        self._layouts = {}
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        cat = self.catalog
+        conn.execute("INSERT OR IGNORE INTO layouts VALUES (?, ?, ?, ?)",
+                     (cat.version, json.dumps(cat.services), json.dumps(cat.ml_components), json.dumps(list(cat.pillar_rules))))
+
+    def _conn(self):
+        # One connection per thread; autocommit mode, transactions are explicit
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _layout(self, version):
+        """(services, ml nodes, pillars) name lists for the catalog version a row was saved under."""
+        layout = self._layouts.get(version)
+        if layout is None:
+            row = self._conn().execute("SELECT services, ml_nodes, pillars FROM layouts WHERE catalog_version = ?",
+                                       (version,)).fetchone()
+            layout = self._layouts[version] = tuple(json.loads(x) for x in row)
+        return layout
+
+    # --------------------------
+    # Writing
+    # --------------------------
+    def save(self, name, params):
+        """Evaluate params and store them as a new scenario; returns its id."""
+        return self.save_many([(name, params)])[0]
+
+    def save_many(self, scenarios):
+        """Store [(name, params)] in one transaction (one evaluate_batch call); returns their ids."""
+        cat = self.catalog
+        values = np.array([[params[k] for k in PARAM_KEYS] for _, params in scenarios], dtype=np.int64).reshape(-1, len(PARAM_KEYS))
+        out = evaluate_batch(values, cat)
+        passed = pillar_status(out["services"], cat)["passed"]
+        pillar_bits = (passed.astype(np.int64) << np.arange(passed.shape[1])).sum(axis=1)
+        n_services = popcount(out["services"])
+        now = time.time()
+        conn = self._conn()
+        ids = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for i, (name, _) in enumerate(scenarios):
+                cur = conn.execute(
+                    "INSERT INTO scenarios (name, created, catalog_version, params, services, ml_nodes, pillars, n_services, confidence) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (name, now, cat.version, json.dumps([int(v) for v in values[i]]), out["services"][i].tobytes(),
+                     out["ml_nodes"][i].tobytes(), int(pillar_bits[i]), int(n_services[i]), float(out["confidence"][i])))
+                ids.append(cur.lastrowid)
+                conn.executemany("INSERT INTO scenario_services VALUES (?, ?)",
+                                 [(cat.services[b], cur.lastrowid) for b in _bits(out["services"][i].tolist())])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return ids
+
+    def delete(self, scenario_id):
+        self._conn().execute("DELETE FROM scenarios WHERE id = ?", (scenario_id,))
+
+    # --------------------------
+    # Reading
+    # --------------------------
+    def _row(self, scenario_id):
+        row = self._conn().execute(
+            "SELECT id, name, created, catalog_version, params, services, ml_nodes, pillars, confidence FROM scenarios WHERE id = ?",
+            (scenario_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no scenario with id {scenario_id}")
+        return row
+
+    def get(self, scenario_id):
+        """One scenario with its sliders and decoded outcome."""
+        sid, name, created, version, params, services, ml, pillars, confidence = self._row(scenario_id)
+        svc_names, ml_names, pillar_names = self._layout(version)
+        return {
+            "id": sid, "name": name, "created": created, "catalog_version": version,
+            "params": dict(zip(PARAM_KEYS, json.loads(params))),
+            "services": [svc_names[b] for b in _bits(_words(services).tolist())],
+            "ml_nodes": [ml_names[b] for b in _bits(_words(ml).tolist())],
+            "pillars": {p: bool(pillars >> j & 1) for j, p in enumerate(pillar_names)},
+            "confidence": confidence,
+        }
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM scenarios").fetchone()[0]
+
+    def list(self, limit=100, offset=0):
+        """Newest scenarios first, as summary dicts."""
+        return self._summaries(f"SELECT {_SUMMARY} FROM scenarios s ORDER BY s.created DESC, s.id DESC LIMIT ? OFFSET ?",
+                               (limit, offset))
+
+    def find(self, contains=(), excludes=(), min_confidence=None, max_confidence=None, limit=500):
+        """Scenarios holding every service in contains and none in excludes, within a confidence range.
+
+        min_confidence / max_confidence are (operator, value) pairs or plain numbers (inclusive).
+        Highest confidence first.
+        """
+        where, args = [], []
+        for names, op in ((contains, "IN"), (excludes, "NOT IN")):
+            for service in names:
+                where.append(f"s.id {op} (SELECT scenario_id FROM scenario_services WHERE service = ?)")
+                args.append(service)
+        for bound, default_op in ((min_confidence, ">="), (max_confidence, "<=")):
+            if bound is not None:
+                op, value = bound if isinstance(bound, tuple) else (default_op, bound)
+                where.append(f"s.confidence {_OPS[op]} ?")
+                args.append(float(value))
+        sql = f"SELECT {_SUMMARY} FROM scenarios s"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._summaries(sql + " ORDER BY s.confidence DESC, s.id DESC LIMIT ?", (*args, limit))
+
+    def _summaries(self, sql, args):
+        keys = ("id", "name", "created", "confidence", "services", "catalog_version")
+        return [dict(zip(keys, row)) for row in self._conn().execute(sql, args).fetchall()]
+
+    # --------------------------
+    # Diffs (on the stored bitmasks)
+    # --------------------------
+    def diff(self, a, b):
+        """What changes from scenario a to scenario b: sliders, services, ML nodes, pillars, confidence."""
+        ra, rb = self._row(a), self._row(b)
+        la, lb = self._layout(ra[3]), self._layout(rb[3])
+        params_a, params_b = json.loads(ra[4]), json.loads(rb[4])
+        out = {"a": {"id": ra[0], "name": ra[1]}, "b": {"id": rb[0], "name": rb[1]},
+               "sliders": {PARAM_NAMES[k]: [x, y] for k, (x, y) in enumerate(zip(params_a, params_b)) if x != y}}
+        for field, col, idx in (("services", 5, 0), ("ml_nodes", 6, 1)):
+            if la[idx] == lb[idx]:
+                # Same bit layout: AND-NOT on the words
+                wa, wb = _words(ra[col]), _words(rb[col])
+                added, removed = _bits((wb & ~wa).tolist()), _bits((wa & ~wb).tolist())
+                out[field] = {"added": [la[idx][i] for i in added], "removed": [la[idx][i] for i in removed]}
+            else:
+                # Saved under catalogs with different layouts: compare by name
+                sa = {la[idx][i] for i in _bits(_words(ra[col]).tolist())}
+                sb = {lb[idx][i] for i in _bits(_words(rb[col]).tolist())}
+                out[field] = {"added": sorted(sb - sa), "removed": sorted(sa - sb)}
+        pa = {p: bool(ra[7] >> j & 1) for j, p in enumerate(la[2])}
+        pb = {p: bool(rb[7] >> j & 1) for j, p in enumerate(lb[2])}
+        out["pillars"] = {p: ["PASS" if pa.get(p) else "WARN", "PASS" if pb.get(p) else "WARN"]
+                          for p in dict.fromkeys([*pa, *pb]) if pa.get(p) != pb.get(p)}
+        out["confidence"] = [ra[8], rb[8]]
+        return out
+
+    def compare(self, scenario_id, limit=None):
+        """Scenario scenario_id against every scenario saved under the same catalog version.
+
+        One vectorized pass over the stored bitmaps; rows are sorted by how many services and
+        ML nodes differ, nearest first: {"id", "name", "services_changed", "ml_changed",
+        "pillars_changed", "confidence_delta"}.
+        """
+        ref = self._row(scenario_id)
+        rows = self._conn().execute(
+            "SELECT id, name, services, ml_nodes, pillars, confidence FROM scenarios WHERE catalog_version = ?",
+            (ref[3],)).fetchall()
+        if not rows:
+            return []
+        ids, names, services, ml, pillars, confidence = zip(*rows)
+        services = np.frombuffer(b"".join(services), dtype=np.uint64).reshape(len(rows), -1)
+        ml = np.frombuffer(b"".join(ml), dtype=np.uint64).reshape(len(rows), -1)
+        services_changed = popcount(services ^ _words(ref[5]))
+        ml_changed = popcount(ml ^ _words(ref[6]))
+        pillars_changed = popcount((np.array(pillars, dtype=np.uint64) ^ np.uint64(ref[7]))[:, None])
+        delta = np.round(np.array(confidence) - ref[8], 1)
+        order = np.lexsort((np.array(ids), ml_changed, services_changed))
+        if limit is not None:
+            order = order[:limit]
+        return [{"id": ids[i], "name": names[i], "services_changed": int(services_changed[i]),
+                 "ml_changed": int(ml_changed[i]), "pillars_changed": int(pillars_changed[i]),
+                 "confidence_delta": float(delta[i])} for i in order.tolist()]
+
+
+def parse_filter(text, catalog=None):
+    """find() keyword arguments for a filter such as "Bedrock, confidence > 80, not Lambda".
+
+    Terms are separated by commas or "and": a service name (case-insensitive), "not <service>"
+    or "-<service>" to exclude one, and "confidence <op> <number>" with op in > >= < <= =.
+    Raises ValueError on a term it cannot read.
+    """
+    cat = catalog or get_catalog()
+    by_name = {s.lower(): s for s in cat.services}
+    kwargs = {"contains": [], "excludes": []}
+    for term in filter(None, (t.strip() for t in re.split(r",|\band\b", text or "", flags=re.IGNORECASE))):
+        m = re.fullmatch(r"confidence\s*(>=|<=|==|=|>|<)\s*(\d+(?:\.\d+)?)", term, re.IGNORECASE)
+        if m:
+            op, value = m.group(1), float(m.group(2))
+            if op in ("=", "=="):
+                kwargs["min_confidence"] = kwargs["max_confidence"] = ("=", value)
+            else:
+                kwargs["min_confidence" if op.startswith(">") else "max_confidence"] = (op, value)
+            continue
+        m = re.fullmatch(r"(?:not\s+|-|!)\s*(.+)", term, re.IGNORECASE)
+        name = (m.group(1) if m else re.sub(r"^contains\s+", "", term, flags=re.IGNORECASE)).strip().lower()
+        if name not in by_name:
+            raise ValueError(f"unknown filter term {term!r} (expected a service name, 'not <service>' or 'confidence > N')")
+        kwargs["excludes" if m else "contains"].append(by_name[name])
+    return kwargs
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_scenario_store(catalog=None):
+    """Process-wide store for $AI_ARCHITECT_SCENARIOS (default DEFAULT_PATH) and the catalog."""
+    cat = catalog or get_catalog()
+    path = os.environ.get(SCENARIOS_ENV)
+    key = (str(Path(path).expanduser() if path else DEFAULT_PATH), cat.version)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ScenarioStore(key[0], cat)
+        return _stores[key]
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from engine import normalize_params
+
+    parser = argparse.ArgumentParser(description="Save, filter and diff slider scenarios.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("save", help="evaluate and store one scenario")
+    p.add_argument("name")
+    p.add_argument("--params", default="{}", help="sliders as JSON (others take the defaults)")
+    p = sub.add_parser("list", help="newest scenarios")
+    p.add_argument("--limit", type=int, default=20)
+    p = sub.add_parser("find", help='filter, e.g. "Bedrock, confidence > 80"')
+    p.add_argument("filter")
+    p = sub.add_parser("diff", help="what changes from scenario A to scenario B")
+    p.add_argument("a", type=int)
+    p.add_argument("b", type=int)
+    p = sub.add_parser("compare", help="one scenario against every saved scenario, nearest first")
+    p.add_argument("id", type=int)
+    p.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = get_scenario_store()
+    try:
+        if args.command == "save":
+            out = {"id": store.save(args.name, normalize_params(json.loads(args.params)))}
+        elif args.command == "list":
+            out = store.list(args.limit)
+        elif args.command == "find":
+            out = store.find(**parse_filter(args.filter))
+        elif args.command == "diff":
+            out = store.diff(args.a, args.b)
+        else:
+            out = store.compare(args.id, args.limit)
+    except (KeyError, ValueError) as e:
+        sys.exit(f"error: {e}")
+    print(json.dumps(out, indent=2))
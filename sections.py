@@ -0,0 +1,183 @@
+"""
+Per-section slider dependencies, memoization and rerun timing for app.py.
+- section_deps() says which `params` keys each page section reads (derived from the rule catalog).
+- memoized() reuses a section's computed content while those sliders are unchanged,
+  across reruns and sessions in this process, and across processes when the persistent
+  disk cache is configured (see disk_cache.py).
+- RerunTimer records how long each section took on this rerun and whether it was a memo hit;
+  with profile=True it also records nested steps for the timing waterfall (see metrics.py).
+"""
+
+import functools
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager, nullcontext
+
+from catalog import PARAM_KEYS, get_catalog
+from diagram_cache import content_key
+from disk_cache import get_disk_cache
+
+
+def section_deps(catalog=None):
+    """{section: [params keys it reads]} for a compiled catalog."""
+    return _section_deps(catalog or get_catalog())
+
+@functools.lru_cache(maxsize=4)
+def _section_deps(cat):
+    service_deps = [PARAM_KEYS[i] for i in cat.service_params()]
+    ml_deps = [PARAM_KEYS[i] for i in cat.ml_params()]
+    validator = set(service_deps) | set(ml_deps) | {PARAM_KEYS[cat.security_param]}
+    agent_deps = {f"agent:{role}": [PARAM_KEYS[k] for k in cat.agent_params(i)] for i, (role, _, _) in enumerate(cat.agents)}
+    agents = set().union(*agent_deps.values())
+    return {
+        "engine": list(PARAM_KEYS),
+        "agents": [k for k in PARAM_KEYS if k in agents],
+        **agent_deps,
+        "architecture": service_deps,
+        "services_diagram": service_deps,
+        "ml_diagrams": ml_deps,
+        "validator": [k for k in PARAM_KEYS if k in validator],
+        "report": list(PARAM_KEYS),
+        "cto": [],
+    }
+
+# Sections whose content is a function of the rule outputs only: their keys use each slider's
+# canonical (threshold interval) value, so every setting in one region shares an entry. The agent
+# sections quote the raw slider values and keep them.
+NORMALIZED_SECTIONS = frozenset({"architecture", "services_diagram", "ml_diagrams", "validator", "cto"})
+
+MEMO_MAX_ENTRIES = 4096
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+# (section, "hit" | "miss") -> lookups since the process started
+_memo_counts = Counter()
+# Last cold (miss) duration per section, used to estimate what a memo hit saved
+_cold_ms = {}
+
+
+def section_key(section, params, catalog=None, variant=None):
+    cat = catalog or get_catalog()
+    deps = section_deps(cat)[section]
+    if section in NORMALIZED_SECTIONS:
+        values = tuple(cat.canonical_values[PARAM_KEYS.index(k)][params[k]] for k in deps)
+    else:
+        values = tuple(params[k] for k in deps)
+    return (cat.version, section, variant) + values
+
+def _remember(key, value):
+    with _memo_lock:
+        _memo[key] = value
+        while len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+
+def _lookup(section, key):
+    """(True, value) from the process memo or the disk cache, else (False, None); counts the lookup."""
+    with _memo_lock:
+        if key in _memo:
+            _memo.move_to_end(key)
+            _memo_counts[section, "hit"] += 1
+            return True, _memo[key]
+    disk = get_disk_cache()
+    if disk is not None:
+        value = disk.get(content_key("memo", list(key)))
+        if value is not None:
+            _remember(key, value)
+            with _memo_lock:
+                _memo_counts[section, "hit"] += 1
+            return True, value
+    return False, None
+
+def cached(section, params, catalog=None, variant=None):
+    """(True, value) if this section is memoized for these sliders, else (False, None)."""
+    return _lookup(section, section_key(section, params, catalog, variant))
+
+def memoized(section, params, build, timer=None, catalog=None, variant=None):
+    """build() for this section, reused while the section's input sliders (and the catalog) are unchanged.
+
+    variant: extra key part for sections whose output also depends on something else (e.g. the agent backend).
+    """
+    key = section_key(section, params, catalog, variant)
+    hit, value = _lookup(section, key)
+    if hit:
+        if timer is not None:
+            timer.mark(section, hit=True)
+        return value
+    value = build()
+    _remember(key, value)
+    with _memo_lock:
+        _memo_counts[section, "miss"] += 1
+    disk = get_disk_cache()
+    if disk is not None:
+        disk.put(content_key("memo", list(key)), value)
+    if timer is not None:
+        timer.mark(section, hit=False)
+    return value
+
+def memo_counts():
+    """{(section, "hit" | "miss"): count} since the process started."""
+    with _memo_lock:
+        return dict(_memo_counts)
+
+
+class RerunTimer:
+    """Wall time per page section for one rerun.
+
+    profile=True also records step() spans inside sections; every section and step is kept as a
+    span {"name", "section", "depth", "start_ms", "ms"} (start relative to the rerun) for waterfalls.
+    """
+
+    def __init__(self, profile=False):
+        self.rows = OrderedDict()  # section -> {"ms": float, "memo": "hit" | "miss" | "-"}
+        self.profile = profile
+        self.spans = []
+        self._stack = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def _span(self, name):
+        span = {"name": name, "section": self._stack[0] if self._stack else name, "depth": len(self._stack),
+                "start_ms": 0.0, "ms": 0.0}
+        self.spans.append(span)
+        self._stack.append(name)
+        start = time.perf_counter()
+        span["start_ms"] = (start - self.started) * 1000
+        try:
+            yield span
+        finally:
+            span["ms"] = (time.perf_counter() - start) * 1000
+            self._stack.pop()
+
+    @contextmanager
+    def section(self, name):
+        row = self.rows.setdefault(name, {"ms": 0.0, "memo": "-"})
+        start = time.perf_counter()
+        try:
+            with self._span(name):
+                yield row
+        finally:
+            row["ms"] += (time.perf_counter() - start) * 1000
+
+    def step(self, name):
+        """Context manager timing one step of the current section; free unless profiling."""
+        return self._span(name) if self.profile else nullcontext()
+
+    def mark(self, name, hit):
+        row = self.rows.setdefault(name, {"ms": 0.0, "memo": "-"})
+        row["memo"] = "hit" if hit else "miss"
+
+    def finish(self):
+        """Rows for display; records cold timings and estimates the time memo hits saved."""
+        out = []
+        for name, row in self.rows.items():
+            saved = 0.0
+            if row["memo"] == "miss":
+                _cold_ms[name] = row["ms"]
+            elif row["memo"] == "hit" and name in _cold_ms:
+                saved = max(0.0, _cold_ms[name] - row["ms"])
+            out.append({"section": name, "ms": round(row["ms"], 2), "memo": row["memo"], "saved_ms": round(saved, 2)})
+        return out
+
+    def total_ms(self):
+        return (time.perf_counter() - self.started) * 1000
@@ -0,0 +1,231 @@
+"""
+Asyncio HTTP scoring service for the AI Architect engine (standard library only).
+- POST /score with one slider object or a JSON array of them; the response is the report
+  app.py offers for download (or a JSON array of reports, in request order).
+- Slider keys may be full param keys or short names ("Data Volume", "Automation", ...); missing
+  sliders take the sidebar defaults.
+- Requests that arrive within BATCH_WINDOW_MS of each other are scored together with one
+  vectorized region-table lookup, on a single worker thread so the event loop keeps accepting.
+- GET /healthz reports the catalog version and batching counters.
+
+    python server.py [--host 127.0.0.1] [--port 8502] [--window-ms 2] [--max-batch 4096]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from catalog import CatalogError, get_catalog
+from engine import normalize_params, params_to_array
+from regions import get_region_table
+
+DEFAULT_PORT = 8502
+BATCH_WINDOW_MS = 2.0
+MAX_BATCH = 4096
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+log = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_body(body):
+    """(params list, single) from a request body; raises HTTPError(400) on bad input."""
+    try:
+        payload = json.loads(body)
+    except ValueError as e:
+        raise HTTPError(400, f"invalid JSON: {e}") from e
+    single = not isinstance(payload, list)
+    try:
+        params_list = [normalize_params(item) for item in ([payload] if single else payload)]
+    except ValueError as e:
+        raise HTTPError(400, str(e)) from e
+    return params_list, single
+
+def score_batch(requests):
+    """JSON response bodies for [(params list, single), ...], scored in one lookup pass."""
+    table = get_region_table(get_catalog())
+    flat = [p for params_list, _ in requests for p in params_list]
+    archs = table.architecture_ids(params_to_array(flat)).tolist() if flat else []
+    bodies, i = [], 0
+    for params_list, single in requests:
+        reports = [table.report_json(p, a) for p, a in zip(params_list, archs[i:i + len(params_list)])]
+        i += len(params_list)
+        bodies.append((reports[0] if single else f"[{', '.join(reports)}]").encode())
+    return bodies
+
+
+class MicroBatcher:
+    """Collects concurrent scoring requests and scores them together."""
+
+    def __init__(self, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH, scorer=score_batch):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.scorer = scorer
+        self.batches = 0
+        self.rows = 0
+        self._pending = []  # (params list, single, future)
+        self._pending_rows = 0
+        self._timer = None
+        self._tasks = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score")
+
+    async def score(self, params_list, single):
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((params_list, single, fut))
+        self._pending_rows += len(params_list)
+        if self._pending_rows >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            bodies = await loop.run_in_executor(self._executor, self.scorer, [(p, s) for p, s, _ in batch])
+        except Exception as e:
+            for _, _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += sum(len(p) for p, _, _ in batch)
+        for (_, _, fut), body in zip(batch, bodies):
+            if not fut.done():
+                fut.set_result(body)
+
+    def stats(self):
+        return {"batches": self.batches, "rows": self.rows,
+                "mean_batch_rows": round(self.rows / self.batches, 2) if self.batches else 0.0}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def read_request(reader):
+    """(method, path, headers, body) for the next request on the connection, or None at EOF."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError as e:
+        raise HTTPError(400, "malformed request line") from e
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError as e:
+        raise HTTPError(400, "invalid Content-Length") from e
+    if length < 0:
+        raise HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"request body over {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, path.split("?", 1)[0], headers, body
+
+def response(status, body, keep_alive=True):
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+def error_body(message):
+    return json.dumps({"error": message}).encode()
+
+
+class ScoringServer:
+    def __init__(self, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH, scorer=score_batch):
+        self.batcher = MicroBatcher(window_ms, max_batch, scorer)
+
+    async def route(self, method, path, body):
+        if path == "/score":
+            if method != "POST":
+                raise HTTPError(405, "use POST /score")
+            params_list, single = parse_body(body)
+            return 200, await self.batcher.score(params_list, single)
+        if path == "/healthz":
+            return 200, json.dumps({"status": "ok", "catalog_version": get_catalog().version,
+                                    **self.batcher.stats()}).encode()
+        raise HTTPError(404, f"no route for {path}")
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await self.route(method, path, body)
+                except HTTPError as e:
+                    keep_alive = False
+                    status, payload = e.status, error_body(str(e))
+                except CatalogError as e:
+                    keep_alive = False
+                    status, payload = 500, error_body(str(e))
+                except Exception:
+                    # Includes scorer failures that MicroBatcher forwards to each request's future
+                    log.exception("error handling request")
+                    keep_alive = False
+                    status, payload = 500, error_body("internal server error")
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        # Build the region table before the first request instead of inside it
+        await asyncio.get_running_loop().run_in_executor(None, get_region_table)
+        server = await asyncio.start_server(self.handle, host, port)
+        bound = server.sockets[0].getsockname()
+        print(f"Serving on http://{bound[0]}:{bound[1]}", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve AI Architect reports over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--window-ms", type=float, default=BATCH_WINDOW_MS, help="micro-batch collection window")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help="flush early at this many rows")
+    args = parser.parse_args()
+    try:
+        asyncio.run(ScoringServer(args.window_ms, args.max_batch).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,234 @@
+"""
+Inverse search: slider settings that meet validator targets at the lowest cost or complexity.
+- Targets are required pillars, required ML areas and a minimum confidence; the objective is
+  the estimated monthly cost (costs.py) or the number of services.
+- Each slider only matters up to its threshold intervals, so the search branches over one
+  interval per slider (not over values) and bounds every partial assignment: the services and
+  ML nodes it could still reach give an optimistic pillar / ML / confidence check, and the
+  cheapest remaining slider gives a lower bound on the objective. Subtrees that cannot meet
+  the targets or beat the current k-th best are pruned.
+- solve() returns the top-k distinct architectures found within a time budget and says
+  whether the search finished (the results are then provably the best k).
+
+    python solver.py --pillars Security Reliability --min-confidence 70 --objective cost
+"""
+
+import heapq
+import time
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog, iter_bits
+from costs import get_cost_model
+from engine import confidence_score
+
+OBJECTIVES = ("cost", "complexity")
+DEFAULT_TIME_BUDGET_S = 1.0
+
+
+
+class _Problem:
+    """The catalog's rules as per-slider interval options over Python int bitsets."""
+
+    def __init__(self, catalog, service_costs):
+        self.catalog = catalog
+        cat = catalog
+        self.costs = service_costs
+        bit = lambda names: sum(1 << cat.service_index[s] for s in names)  # noqa: E731
+        self.always = bit(cat.always_services)
+        self.ml_always = cat.ml_always_bits
+        self.pillar_masks = cat.pillar_ints
+        self.pillar_thresholds = cat.pillar_threshold_ints
+        self.area_masks = cat.ml_area_ints
+        self.security_mask = cat.security_int
+        # options[k]: [(low value, high value, service bits, ml bits)] per threshold interval of slider k
+        self.options = []
+        for k, cuts in enumerate(cat.slider_thresholds()):
+            lows = [SLIDER_MIN] + [t + 1 for t in cuts]
+            highs = [t for t in cuts] + [SLIDER_MAX]
+            self.options.append([(lo, hi, bit(cat.value_services[k][lo]), cat.value_ml_bits[k][lo]) for lo, hi in zip(lows, highs)])
+
+    def cost(self, services):
+        return sum(self.costs[b] for b in iter_bits(services))
+
+    def confidence(self, services, ml, security_high):
+        """engine.confidence_score() of a service / ML bitset; security_high None counts as aligned (an upper bound)."""
+        n_passed = sum((services & m).bit_count() >= t for m, t in zip(self.pillar_masks, self.pillar_thresholds))
+        n_complete = sum(ml & m == m for m in self.area_masks)
+        aligned = security_high is not True or bool(services & self.security_mask)
+        return confidence_score(n_passed, n_complete, aligned, self.catalog)
+
+
+def _explain_infeasible(problem, pillars, areas, min_confidence, services, ml):
+    cat = problem.catalog
+    reasons = []
+    for p in pillars:
+        reach = (services & problem.pillar_masks[p]).bit_count()
+        if reach < problem.pillar_thresholds[p]:
+            name = list(cat.pillar_rules)[p]
+            reasons.append(f"pillar {name} can have at most {reach} of its required services "
+                           f"(needs {problem.pillar_thresholds[p]})")
+    for a in areas:
+        missing = problem.area_masks[a] & ~ml
+        if missing:
+            names = ", ".join(cat.ml_components[b] for b in iter_bits(missing))
+            reasons.append(f"ML area {list(cat.ml_expected)[a]} can never be complete (no rule produces {names})")
+    if not reasons:
+        reasons.append(f"no setting reaches confidence {min_confidence:g}")
+    return "; ".join(reasons)
+
+def solve(pillars=(), ml_areas=(), min_confidence=0.0, objective="cost", k=5,
+          time_budget_s=DEFAULT_TIME_BUDGET_S, region=None, catalog=None):
+    """Top-k cheapest (or simplest) distinct architectures meeting the targets.
+
+    Returns {"solutions": [...], "complete": bool, "nodes": int, "pruned": int, "elapsed_ms": float,
+    "infeasible": reason or None}. Each solution has "cost", "services" (count), "confidence",
+    "ranges" (slider -> allowed values), "params" (one concrete settings dict), "selected_services",
+    "pillars_passed" and "ml_complete".
+    """
+    cat = catalog or get_catalog()
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+    pillar_names, area_names = list(cat.pillar_rules), list(cat.ml_expected)
+    for name in pillars:
+        if name not in pillar_names:
+            raise ValueError(f"unknown pillar {name!r} (expected one of {', '.join(pillar_names)})")
+    for name in ml_areas:
+        if name not in area_names:
+            raise ValueError(f"unknown ML area {name!r} (expected one of {', '.join(area_names)})")
+    req_pillars = [pillar_names.index(p) for p in pillars]
+    req_areas = [area_names.index(a) for a in ml_areas]
+
+    cost_model = get_cost_model(region, cat)
+    service_costs = cost_model.service_costs.tolist() if objective == "cost" else [1.0] * len(cat.services)
+    problem = _Problem(cat, service_costs)
+    options = problem.options
+    n = len(options)
+    security_k, security_thr = cat.security_param, cat.security_threshold
+
+    # Branch on the sliders whose choice swings the objective most first, cheapest interval first
+    spread = [max(problem.cost(o[2]) for o in opts) - min(problem.cost(o[2]) for o in opts) for opts in options]
+    order = sorted(range(n), key=lambda j: (-spread[j], -len(options[j])))
+    for j in order:
+        options[j].sort(key=lambda o: problem.cost(o[2]))
+    # Optimistic reach of the sliders still to assign after depth d
+    reach_services, reach_ml = [0] * (n + 1), [0] * (n + 1)
+    for d in range(n - 1, -1, -1):
+        reach_services[d] = reach_services[d + 1]
+        reach_ml[d] = reach_ml[d + 1]
+        for _, _, s, m in options[order[d]]:
+            reach_services[d] |= s
+            reach_ml[d] |= m
+
+    start = time.perf_counter()
+    deadline = start + time_budget_s
+    best = []  # max-heap via negation: (-objective, confidence, counter, solution)
+    seen = set()
+    stats = {"nodes": 0, "pruned": 0, "timed_out": False}
+    counter = 0
+    choice = [None] * n
+
+    def bound_ok(services, ml, depth, security_high):
+        opt_s, opt_m = services | reach_services[depth], ml | reach_ml[depth]
+        for p in req_pillars:
+            if (opt_s & problem.pillar_masks[p]).bit_count() < problem.pillar_thresholds[p]:
+                return False
+        for a in req_areas:
+            if opt_m & problem.area_masks[a] != problem.area_masks[a]:
+                return False
+        if min_confidence > 0 and problem.confidence(opt_s, opt_m, security_high) < min_confidence:
+            return False
+        return True
+
+    def lower_bound(services, cost, depth):
+        extra = 0.0
+        for d in range(depth, n):
+            extra = max(extra, min(problem.cost(o[2] & ~services) for o in options[order[d]]))
+        return cost + extra
+
+    def visit(depth, services, ml, cost, security_high):
+        nonlocal counter
+        stats["nodes"] += 1
+        if stats["nodes"] % 256 == 0 and time.perf_counter() > deadline:
+            stats["timed_out"] = True
+            return
+        if not bound_ok(services, ml, depth, security_high):
+            stats["pruned"] += 1
+            return
+        if len(best) == k and lower_bound(services, cost, depth) > -best[0][0]:
+            stats["pruned"] += 1
+            return
+        if depth == n:
+            key = (services, ml)
+            conf = problem.confidence(services, ml, security_high)
+            if conf < min_confidence or key in seen:
+                return
+            seen.add(key)
+            counter += 1
+            entry = (-cost, conf, counter, (services, ml, list(choice)))
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif (cost, -conf) < (-best[0][0], -best[0][1]):
+                seen.discard((best[0][3][0], best[0][3][1]))
+                heapq.heapreplace(best, entry)
+            return
+        k_slider = order[depth]
+        for opt in options[k_slider]:
+            if stats["timed_out"]:
+                return
+            choice[k_slider] = opt
+            high = security_high
+            if k_slider == security_k:
+                high = opt[0] > security_thr
+            new = opt[2] & ~services
+            visit(depth + 1, services | opt[2], ml | opt[3], cost + sum(problem.costs[b] for b in iter_bits(new)), high)
+        choice[k_slider] = None
+
+    root_ok = bound_ok(problem.always, problem.ml_always, 0, None)
+    infeasible = None
+    if root_ok:
+        visit(0, problem.always, problem.ml_always, problem.cost(problem.always), None)
+    else:
+        infeasible = _explain_infeasible(problem, req_pillars, req_areas, min_confidence,
+                                         problem.always | reach_services[0], problem.ml_always | reach_ml[0])
+    elapsed = (time.perf_counter() - start) * 1000
+
+    solutions = []
+    for neg_obj, conf, _, (services, ml, chosen) in sorted(best, key=lambda e: (-e[0], -e[1], e[2])):
+        pillar_ok = [(services & m).bit_count() >= t for m, t in zip(problem.pillar_masks, problem.pillar_thresholds)]
+        names = [cat.services[b] for b in iter_bits(services)]
+        solutions.append({
+            "cost": round(cost_model.monthly_cost(names), 2),
+            "services": len(names),
+            "confidence": conf,
+            "ranges": {PARAM_NAMES[j]: (f"{lo}" if lo == hi else f"{lo}-{hi}") for j, (lo, hi, _, _) in enumerate(chosen)},
+            "params": {PARAM_KEYS[j]: lo for j, (lo, _, _, _) in enumerate(chosen)},
+            "selected_services": names,
+            "pillars_passed": [p for p, ok in zip(pillar_names, pillar_ok) if ok],
+            "ml_complete": [a for a, m in zip(area_names, problem.area_masks) if ml & m == m],
+        })
+    if root_ok and not solutions and not stats["timed_out"]:
+        infeasible = f"no setting meets all targets together (confidence {min_confidence:g} or more)"
+    return {"solutions": solutions, "complete": not stats["timed_out"], "nodes": stats["nodes"],
+            "pruned": stats["pruned"], "elapsed_ms": round(elapsed, 2), "infeasible": infeasible}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find the cheapest slider settings that meet validator targets.")
+    parser.add_argument("--pillars", nargs="*", default=[], help="pillars that must pass")
+    parser.add_argument("--ml-areas", nargs="*", default=[], help="ML areas that must be complete")
+    parser.add_argument("--min-confidence", type=float, default=0.0)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="cost")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET_S, help="seconds")
+    parser.add_argument("--region", help="pricing region for the cost objective")
+    args = parser.parse_args()
+
+    out = solve(args.pillars, args.ml_areas, args.min_confidence, args.objective, args.k, args.time_budget, args.region)
+    status = "optimal" if out["complete"] else "time budget hit; best found so far"
+    print(f"{len(out['solutions'])} solutions ({status}), {out['nodes']} nodes, {out['pruned']} pruned, {out['elapsed_ms']} ms")
+    if out["infeasible"]:
+        print(f"infeasible: {out['infeasible']}")
+    for i, s in enumerate(out["solutions"], 1):
+        print(f"#{i}  ${s['cost']:,.2f}/mo  {s['services']} services  confidence {s['confidence']}%")
+        print("    " + ", ".join(f"{name} {vals}" for name, vals in s["ranges"].items()))
@@ -0,0 +1,220 @@
+"""
+Static export of the whole architecture page: one self-contained HTML file with inlined SVGs.
+- Covers the sliders, the agent proposals, the selected services and cost estimate, the three
+  Graphviz diagrams (matplotlib SVG when the `dot` executable is missing), the CTO graph, the
+  validator results, role ownership and the JSON report. No scripts or external assets, so the
+  file opens anywhere without the live app.
+- Exports are content-addressed on their inputs (catalog version, agent backend, pricing
+  region, sliders) and
+  kept in the diagram cache (and its persistent backing, if configured): a repeat export of
+  the same configuration is a cache hit, and concurrent requests for it render once.
+- ExportJobs builds them on a background thread pool, so the page can poll for the result
+  instead of blocking its rerun.
+
+    python static_export.py --params '{"Model Complexity": 9}' -o architecture.html
+"""
+
+import html
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+
+from agents import AGENT_TIMEOUT_S, get_backend, run_agents
+from catalog import PARAM_KEYS, PARAM_NAMES, get_catalog
+from costs import get_cost_model
+from diagram_cache import DIAGRAM_CACHE, content_key
+from diagrams import CTO_PNG_ARGS, SECTION_GRAPHS
+from engine import build_report
+from graph import to_plot_svg, to_svg
+from regions import get_region_table
+
+# Bump when the page layout changes, so cached exports are rebuilt
+EXPORT_VERSION = 1
+EXPORT_WORKERS = 2
+MAX_JOBS = 64
+
+STYLE = """
+body { font-family: system-ui, -apple-system, "Segoe UI", sans-serif; max-width: 1100px; margin: 2rem auto;
+       padding: 0 1rem; color: #1f2933; line-height: 1.45; }
+h1 { margin-bottom: 0.2rem; } h2 { border-bottom: 1px solid #d9dee5; padding-bottom: 0.3rem; margin-top: 2.2rem; }
+.meta { color: #616e7c; } .pass { color: #1b7f3b; font-weight: 600; } .warn { color: #b54708; font-weight: 600; }
+table { border-collapse: collapse; margin: 0.5rem 0; } td, th { border: 1px solid #d9dee5; padding: 0.3rem 0.6rem; text-align: left; }
+.agents { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
+.agent { border: 1px solid #d9dee5; border-radius: 8px; padding: 0.2rem 1rem; }
+figure { margin: 1rem 0; } figure svg { max-width: 100%; height: auto; }
+pre { background: #f5f7fa; padding: 1rem; overflow-x: auto; }
+"""
+
+
+def export_key(params, catalog=None, backend=None, region=None):
+    """Content hash of everything an export depends on (region None: the cost model's default)."""
+    cat = catalog or get_catalog()
+    backend = backend or get_backend()
+    region = get_cost_model(region, cat).region
+    return content_key("static-html", EXPORT_VERSION, cat.version, backend.name, region, [params[k] for k in PARAM_KEYS])
+
+def _e(text):
+    return html.escape(str(text))
+
+def _inline_svg(svg):
+    """The <svg> element of a rendered document, or None if there is none."""
+    # Drop the XML prolog and DOCTYPE; an <svg> element can be embedded in HTML as-is
+    start = svg.find("<svg") if svg else -1
+    return svg[start:] if start >= 0 else None
+
+def _figure(caption, svg):
+    body = svg or '<p class="meta">Diagram unavailable.</p>'
+    return f"<figure>{body}<figcaption>{_e(caption)}</figcaption></figure>"
+
+def _diagram(caption, graph):
+    # Graphviz SVG when it renders, else matplotlib SVG
+    return _figure(caption, _inline_svg(to_svg(graph)) or _inline_svg(to_plot_svg(graph, seed=42)))
+
+def _list(items):
+    return "<ul>" + "".join(f"<li>{_e(x)}</li>" for x in items) + "</ul>" if items else "<p>None.</p>"
+
+def _status(ok, yes="PASS", no="WARN"):
+    return f'<span class="pass">{yes}</span>' if ok else f'<span class="warn">{no}</span>'
+
+def render_html(params, catalog=None, backend=None, region=None, timeout_s=AGENT_TIMEOUT_S):
+    """The export page as an HTML string (uncached; see export_html).
+
+    Raises RuntimeError when an agent does not answer, so no incomplete page gets cached.
+    """
+    cat = catalog or get_catalog()
+    backend = backend or get_backend()
+    result = get_region_table(cat).lookup(params)
+    services = result["selected_services"]
+    proposals = [None] * len(cat.agents)
+    for i, proposal, _ in run_agents(params, set(services), backend, timeout_s, cat):
+        if proposal["status"] != "ok":
+            raise RuntimeError(f"{proposal['role']} agent {proposal['status']}: {proposal['error']}")
+        proposals[i] = proposal
+    report = build_report(params, result, cat)
+    cost = get_cost_model(region, cat)
+    ml_graph, ml_stages = SECTION_GRAPHS["ml_diagrams"](result, cat)
+    cto = SECTION_GRAPHS["cto"](result, cat)
+
+    out = [
+        "<!DOCTYPE html>",
+        '<html lang="en"><head><meta charset="utf-8">',
+        '<meta name="viewport" content="width=device-width, initial-scale=1">',
+        f"<title>{_e(report['title'])}</title><style>{STYLE}</style></head><body>",
+        f"<h1>🏗️ {_e(report['title'])}</h1>",
+        f'<p class="meta">Generated {_e(report["generated_at"])} · catalog {_e(cat.version)} · '
+        f"agent backend {_e(backend.name)} · confidence {_e(result['confidence'])}%</p>",
+        "<h2>🎚️ Architecture parameters</h2><table>",
+        *(f"<tr><th>{_e(name)}</th><td>{_e(params[key])}</td></tr>" for name, key in zip(PARAM_NAMES, PARAM_KEYS)),
+        "</table>",
+        f"<h2>🔎 {len(proposals)} Agent Proposals</h2>",
+        '<div class="agents">',
+    ]
+    for i, p in enumerate(proposals):
+        out += [f'<div class="agent"><h3>{i + 1}. {_e(p["role"])}</h3>',
+                f"<p><b>Candidate Services:</b> {_e(', '.join(p['services']) or 'none beyond the shared platform')}</p>",
+                _list(p["reasoning"]), "</div>"]
+    out += [
+        "</div>",
+        "<h2>🏗️ Synthesized AWS Architecture</h2>",
+        f"<p>{_e(', '.join(services))}</p>",
+        f"<p><b>Estimated monthly cost</b> (reference workload, on-demand list prices, {_e(cost.region)}): "
+        f"${cost.monthly_cost(services):,.2f}</p>",
+        "<h2>🗺️ Diagrams</h2>",
+        _diagram("AWS architecture", SECTION_GRAPHS["services_diagram"](result, cat)),
+        _diagram("ML lifecycle pipeline", ml_graph),
+        _diagram("ML lifecycle stages", ml_stages),
+        _figure("CTO-grade AWS ML architecture", _inline_svg(to_plot_svg(cto, **CTO_PNG_ARGS))),
+        "<h2>🏁 Validator</h2><h3>✅ Well-Architected Pillar Check</h3><table>",
+        "<tr><th>Pillar</th><th>Status</th><th>Notes</th><th>Missing</th></tr>",
+        *(f"<tr><td>{_e(name)}</td><td>{_status(r['passed'])}</td><td>{_e(r['notes'])}</td>"
+          f"<td>{_e(', '.join(r['missing_required']))}</td></tr>" for name, r in result["pillar_checks"].items()),
+        "</table><h3>✅ ML Lifecycle Coverage</h3><table>",
+        "<tr><th>Area</th><th>Status</th><th>Missing components</th></tr>",
+        *(f"<tr><td>{_e(area)}</td><td>{_status(c['complete'], 'COMPLETE', 'INCOMPLETE')}</td>"
+          f"<td>{_e(', '.join(c['missing']))}</td></tr>" for area, c in result["ml_coverage"].items()),
+        "</table>",
+        f"<h3>🧾 Final Confidence Score</h3><p><b>{_e(result['confidence'])}%</b> (heuristic)</p>",
+        "<h3>🛠️ Remediation Suggestions</h3>",
+        _list(result["remediation"]),
+        "<h3>👥 Suggested Role Ownership</h3><table>",
+        *(f"<tr><td>{_e(svc)}</td><td>{_e(role)}</td></tr>" for svc, role in sorted(result["role_mapping"].items())),
+        "</table>",
+        "<h2>📄 Report</h2>",
+        f"<details><summary>architecture_report.json</summary><pre>{_e(json.dumps(report, indent=2))}</pre></details>",
+        "</body></html>",
+    ]
+    return "\n".join(out)
+
+def export_html(params, catalog=None, backend=None, region=None, cache=DIAGRAM_CACHE):
+    """Cached render_html: built once per distinct configuration."""
+    cat = catalog or get_catalog()
+    backend = backend or get_backend()
+    return cache.get_or_render(export_key(params, cat, backend, region), lambda: render_html(params, cat, backend, region))
+
+
+class ExportJobs:
+    """Background export builds, one Future per configuration (content key)."""
+
+    def __init__(self, workers=EXPORT_WORKERS, cache=DIAGRAM_CACHE):
+        self.workers = workers
+        self.cache = cache
+        self._pool = None
+        self._jobs = OrderedDict()  # key -> Future
+        self._lock = threading.Lock()
+
+    def submit(self, params, catalog=None, backend=None, region=None):
+        """(key, Future of the HTML); an export already built or building is reused, a failed one retried."""
+        cat = catalog or get_catalog()
+        backend = backend or get_backend()
+        key = export_key(params, cat, backend, region)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or (job.done() and job.exception() is not None):
+                html_text = self.cache.get(key)
+                if html_text is not None:
+                    job = Future()
+                    job.set_result(html_text)
+                else:
+                    if self._pool is None:
+                        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="export")
+                    job = self._pool.submit(export_html, dict(params), cat, backend, region, self.cache)
+                self._jobs[key] = job
+            self._jobs.move_to_end(key)
+            # Finished builds live on in the cache; only keep recent handles
+            while len(self._jobs) > MAX_JOBS:
+                oldest = next(iter(self._jobs))
+                if not self._jobs[oldest].done():
+                    break
+                del self._jobs[oldest]
+        return key, job
+
+    def get(self, key):
+        """The Future for a submitted key, or None."""
+        with self._lock:
+            return self._jobs.get(key)
+
+
+EXPORTS = ExportJobs()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from engine import normalize_params
+
+    parser = argparse.ArgumentParser(description="Write the architecture page as a self-contained HTML file.")
+    parser.add_argument("--params", default="{}", help="sliders as JSON (others take the defaults)")
+    parser.add_argument("--region", help="pricing region (default: the cost profile's)")
+    parser.add_argument("-o", "--output", default="architecture_report.html")
+    args = parser.parse_args()
+
+    try:
+        page = export_html(normalize_params(json.loads(args.params)), region=args.region)
+    except (ValueError, RuntimeError) as e:
+        sys.exit(f"error: {e}")
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(page)
+    print(f"wrote {args.output} ({len(page.encode()) / 1024:.0f} KiB)")
@@ -0,0 +1,139 @@
+"""
+What-if sweeps around a baseline slider setting.
+- sweep_sliders() moves one slider at a time through all its values (10 x 10 scenarios) and
+  lists every step where the design flips: services and ML nodes added or removed, pillar
+  checks changing state, confidence moving.
+- sweep_pairs() moves every pair of sliders jointly over their full 10 x 10 grid
+  (45 pairs, 4,500 scenarios) for heatmaps.
+- Both build the scenario matrix in one go and score it with engine.evaluate_batch, so a full
+  pairwise sweep is a few milliseconds of vectorized bitmap work (no per-scenario Python).
+
+    python sweep.py --params '{"Security & Compliance": 9}' --pairs
+"""
+
+import time
+from itertools import combinations
+
+import numpy as np
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog
+from engine import decode_ml_nodes, decode_services, evaluate_batch, pillar_status, popcount
+
+VALUES = np.arange(SLIDER_MIN, SLIDER_MAX + 1)
+PAIRS = list(combinations(range(len(PARAM_KEYS)), 2))
+# Per-scenario numbers every sweep reports, in display order
+METRICS = ("confidence", "services_changed", "ml_changed", "pillars_passed")
+
+
+def _score(values, baseline, cat):
+    """Metric arrays (one entry per row of values) plus the raw batch outputs."""
+    out = evaluate_batch(values, cat)
+    passed = pillar_status(out["services"], cat)["passed"]
+    metrics = {
+        "confidence": out["confidence"],
+        "services_changed": popcount(out["services"] ^ baseline["services"]),
+        "ml_changed": popcount(out["ml_nodes"] ^ baseline["ml_nodes"]),
+        "pillars_passed": passed.sum(axis=-1),
+    }
+    return metrics, out, passed
+
+def _baseline(params, cat):
+    base = np.array([[params[k] for k in PARAM_KEYS]], dtype=np.int64)
+    out = evaluate_batch(base, cat)
+    return base[0], {"services": out["services"][0], "ml_nodes": out["ml_nodes"][0],
+                     "confidence": float(out["confidence"][0])}
+
+def sweep_sliders(params, catalog=None):
+    """One-at-a-time sweep: every value of every slider, the others held at params.
+
+    Returns {"baseline": {...}, "values": [1..10], metric: (10 sliders, 10 values) array for
+    each of METRICS, "flips": [...], "elapsed_ms"}. A flip is one step v-1 -> v of one slider
+    that changes the outcome; it names what was added, removed and changed.
+    """
+    cat = catalog or get_catalog()
+    start = time.perf_counter()
+    base, baseline = _baseline(params, cat)
+    n, m = len(PARAM_KEYS), len(VALUES)
+    values = np.broadcast_to(base, (n, m, n)).copy()
+    for k in range(n):
+        values[k, :, k] = VALUES
+    metrics, out, passed = _score(values.reshape(-1, n), baseline, cat)
+    services = out["services"].reshape(n, m, -1)
+    ml = out["ml_nodes"].reshape(n, m, -1)
+    passed = passed.reshape(n, m, -1)
+    confidence = out["confidence"].reshape(n, m)
+
+    # Steps where anything differs from the previous value of the same slider
+    changed = ((services[:, 1:] != services[:, :-1]).any(axis=-1) | (ml[:, 1:] != ml[:, :-1]).any(axis=-1)
+               | (passed[:, 1:] != passed[:, :-1]).any(axis=-1) | (confidence[:, 1:] != confidence[:, :-1]))
+    pillars = list(cat.pillar_rules)
+    flips = []
+    for k, i in zip(*np.nonzero(changed)):
+        a, b = i, i + 1
+        flips.append({
+            "slider": PARAM_NAMES[k],
+            "from": int(VALUES[a]),
+            "to": int(VALUES[b]),
+            "added_services": decode_services(services[k, b] & ~services[k, a], cat),
+            "removed_services": decode_services(services[k, a] & ~services[k, b], cat),
+            "added_ml_nodes": decode_ml_nodes(ml[k, b] & ~ml[k, a], cat),
+            "removed_ml_nodes": decode_ml_nodes(ml[k, a] & ~ml[k, b], cat),
+            "pillars": {p: "PASS" if passed[k, b, j] else "WARN" for j, p in enumerate(pillars) if passed[k, a, j] != passed[k, b, j]},
+            "confidence": [float(confidence[k, a]), float(confidence[k, b])],
+        })
+    return {
+        "baseline": {"params": {k: int(v) for k, v in zip(PARAM_KEYS, base)}, "confidence": baseline["confidence"],
+                     "services": decode_services(baseline["services"], cat), "ml_nodes": decode_ml_nodes(baseline["ml_nodes"], cat)},
+        "values": VALUES.tolist(),
+        **{name: metrics[name].reshape(n, m) for name in METRICS},
+        "flips": flips,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+def sweep_pairs(params, catalog=None):
+    """Pairwise sweep: for each slider pair (PAIRS order), every joint setting of the two.
+
+    Returns {"pairs": [(name a, name b)], "values": [1..10], metric: (45 pairs, 10 values of a,
+    10 values of b) array for each of METRICS, "elapsed_ms"}; the other sliders stay at params.
+    """
+    cat = catalog or get_catalog()
+    start = time.perf_counter()
+    base, baseline = _baseline(params, cat)
+    n, m = len(PARAM_KEYS), len(VALUES)
+    values = np.broadcast_to(base, (len(PAIRS), m, m, n)).copy()
+    first, second = np.array(PAIRS).T
+    pair = np.arange(len(PAIRS))
+    values[pair, :, :, first] = VALUES[:, None]
+    values[pair, :, :, second] = VALUES[None, :]
+    metrics, _, _ = _score(values.reshape(-1, n), baseline, cat)
+    return {
+        "pairs": [(PARAM_NAMES[a], PARAM_NAMES[b]) for a, b in PAIRS],
+        "values": VALUES.tolist(),
+        **{name: metrics[name].reshape(len(PAIRS), m, m) for name in METRICS},
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from engine import normalize_params
+
+    parser = argparse.ArgumentParser(description="Show where each slider flips the architecture around a baseline.")
+    parser.add_argument("--params", default="{}", help='baseline sliders as JSON, e.g. \'{"Automation": 9}\' (others take the defaults)')
+    parser.add_argument("--pairs", action="store_true", help="also run the pairwise sweep and print its timing")
+    args = parser.parse_args()
+
+    params = normalize_params(json.loads(args.params))
+    out = sweep_sliders(params)
+    print(f"baseline confidence {out['baseline']['confidence']}%, {len(out['baseline']['services'])} services; "
+          f"{len(out['flips'])} flips ({out['elapsed_ms']} ms)")
+    for f in out["flips"]:
+        parts = [f"+{s}" for s in f["added_services"] + f["added_ml_nodes"]]
+        parts += [f"-{s}" for s in f["removed_services"] + f["removed_ml_nodes"]]
+        parts += [f"{p} {state}" for p, state in f["pillars"].items()]
+        print(f"  {f['slider']} {f['from']}->{f['to']}: confidence {f['confidence'][0]} -> {f['confidence'][1]}  {' '.join(parts)}")
+    if args.pairs:
+        pairs = sweep_pairs(params)
+        print(f"pairwise: {len(pairs['pairs'])} pairs x {len(pairs['values']) ** 2} settings in {pairs['elapsed_ms']} ms")
@@ -0,0 +1,37 @@
+import threading
+import time
+
+from agents import run_agents
+from catalog import get_catalog
+from engine import map_services, normalize_params
+
+
+class StaggeredBackend:
+    """Agent i answers after 20*i ms; agent 0 hangs until released."""
+
+    name = "test-staggered"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def propose(self, catalog, i, params, services):
+        if i == 0:
+            self.release.wait(5)
+        else:
+            time.sleep(0.02 * i)
+        return {"services": [], "reasoning": [f"agent {i}"]}
+
+
+def test_timeout_is_per_agent_and_ignores_time_spent_between_yields():
+    cat = get_catalog()
+    params = normalize_params({"Automation": 7, "Data Volume": 3})
+    backend = StaggeredBackend()
+    statuses = {}
+    try:
+        for i, proposal, _ in run_agents(params, map_services(params, cat), backend, 0.3, cat):
+            statuses[i] = proposal["status"]
+            if len(statuses) == 1:
+                time.sleep(0.5)  # a slow render of the first panel
+    finally:
+        backend.release.set()
+    assert statuses == {i: "timeout" if i == 0 else "ok" for i in range(len(cat.agents))}
@@ -0,0 +1,91 @@
+import csv
+import gzip
+import io
+import json
+
+import numpy as np
+import pytest
+
+from bulk import export_file, parquet_available, read_chunks, summarize
+from catalog import PARAM_KEYS, PARAM_NAMES, get_catalog
+from engine import array_to_params, evaluate, normalize_params
+
+ROWS = np.random.default_rng(3).integers(1, 11, size=(250, len(PARAM_KEYS)))
+
+
+def csv_bytes(rows, names=PARAM_NAMES):
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(names)  # full param keys contain commas, so they get quoted
+    writer.writerows(rows.tolist())
+    return text.getvalue().encode()
+
+def jsonl_bytes(rows):
+    return "".join(json.dumps(dict(zip(PARAM_NAMES, map(int, row)))) + "\n" for row in rows).encode()
+
+def read_reports(fileobj):
+    return [json.loads(line) for line in gzip.decompress(fileobj.read()).decode().splitlines()]
+
+
+@pytest.mark.parametrize("fmt, data", [
+    ("csv", csv_bytes(ROWS)),
+    ("csv", gzip.compress(csv_bytes(ROWS, PARAM_KEYS))),
+    ("jsonl", jsonl_bytes(ROWS)),
+    ("jsonl", gzip.compress(jsonl_bytes(ROWS))),
+], ids=["csv", "csv-gz-full-keys", "jsonl", "jsonl-gz"])
+def test_jsonl_gz_round_trip(fmt, data):
+    cat = get_catalog()
+    reports = read_reports(export_file(io.BytesIO(data), fmt, "jsonl.gz", cat))
+    assert len(reports) == len(ROWS)
+    for row, report in zip(ROWS, reports):
+        params = array_to_params(row)
+        assert report["brief_parameters"] == params
+        expected = evaluate(params, cat)
+        assert report["confidence"] == expected["confidence"]
+        assert report["selected_services"] == expected["selected_services"]
+
+
+def test_chunks_and_summary_cover_every_row():
+    chunks = list(read_chunks(io.BytesIO(csv_bytes(ROWS)), "csv", chunk_rows=100))
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert (np.concatenate(chunks) == ROWS).all()
+    summary = summarize(iter(chunks))
+    confidences = [evaluate(array_to_params(row))["confidence"] for row in ROWS]
+    assert summary["rows"] == len(ROWS)
+    assert summary["min_confidence"] == min(confidences)
+    assert summary["max_confidence"] == max(confidences)
+
+
+def test_missing_columns_take_the_defaults():
+    data = b"Automation\n9\n"
+    report, = read_reports(export_file(io.BytesIO(data), "csv", "jsonl.gz"))
+    assert report["brief_parameters"] == normalize_params({"Automation": 9})
+
+
+@pytest.mark.parametrize("fmt, data, message", [
+    ("csv", b"Automation,Data Volume\n5,5\n5,11\n", "row 3: slider values must be between"),
+    ("csv", b"Automation,Data Volume\n5,5\n5,x\n", "row 3: slider values must be integers"),
+    ("csv", b"Automation,Data Volume\n5,5\n5\n", "row 3: expected 2 fields, got 1"),
+    ("csv", b"Automation,Nonsense\n5,5\n", "unknown slider column 'Nonsense'"),
+    ("jsonl", b'{"Automation": 5}\n\n{"Automation": 0}\n', "line 3: Automation must be an integer"),
+    ("jsonl", b'{"Automation": 5}\nnot json\n', "line 2: "),
+])
+def test_bad_rows_are_reported_by_position(fmt, data, message):
+    with pytest.raises(ValueError, match=message):
+        export_file(io.BytesIO(data), fmt, "jsonl.gz")
+
+
+@pytest.mark.skipif(not parquet_available(), reason="needs pyarrow")
+def test_parquet_round_trip():
+    import pyarrow.parquet as pq
+
+    cat = get_catalog()
+    out = export_file(io.BytesIO(jsonl_bytes(ROWS)), "jsonl", "parquet", cat)
+    table = pq.read_table(out).to_pydict()
+    assert len(table["confidence"]) == len(ROWS)
+    for i, row in enumerate(ROWS):
+        expected = evaluate(array_to_params(row), cat)
+        assert [table[name][i] for name in PARAM_NAMES] == row.tolist()
+        assert table["confidence"][i] == expected["confidence"]
+        assert table["selected_services"][i] == expected["selected_services"]
+        assert table["pillars_passed"][i] == [p for p, v in expected["pillar_checks"].items() if v["passed"]]
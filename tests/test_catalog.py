@@ -0,0 +1,99 @@
+import copy
+import json
+
+import pytest
+
+import catalog
+from catalog import DEFAULT_CATALOG_PATH, Catalog, CatalogError, catalog_error, get_catalog, load_spec
+
+
+@pytest.fixture
+def spec():
+    return json.loads(DEFAULT_CATALOG_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def catalog_file(tmp_path, spec, monkeypatch):
+    # Check the file on every call instead of at most once a second
+    monkeypatch.setattr(catalog, "RELOAD_CHECK_SECONDS", 0)
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+def test_edit_is_picked_up_with_a_new_version(catalog_file, spec):
+    first = get_catalog(catalog_file)
+    assert get_catalog(catalog_file) is first
+    spec["service_rules"][0]["threshold"] = 3
+    catalog_file.write_text(json.dumps(spec, indent=1), encoding="utf-8")
+    second = get_catalog(catalog_file)
+    assert second.version != first.version
+    assert second.service_rules[0][1] == 3
+    assert catalog_error(catalog_file) is None
+
+
+def test_broken_edit_keeps_last_good_catalog(catalog_file, spec):
+    good = get_catalog(catalog_file)
+    catalog_file.write_text("{ not json", encoding="utf-8")
+    assert get_catalog(catalog_file) is good
+    assert "invalid JSON" in catalog_error(catalog_file)
+
+    spec["service_rules"][0]["param"] = "Nonsense"
+    catalog_file.write_text(json.dumps(spec), encoding="utf-8")
+    assert get_catalog(catalog_file) is good
+    assert "service_rules[0]: unknown param 'Nonsense'" in catalog_error(catalog_file)
+
+    spec["service_rules"][0]["param"] = "Data Volume"
+    spec["service_rules"][0]["threshold"] = 4
+    catalog_file.write_text(json.dumps(spec, indent=1), encoding="utf-8")
+    fixed = get_catalog(catalog_file)
+    assert fixed is not good and fixed.service_rules[0][1] == 4
+    assert catalog_error(catalog_file) is None
+
+
+def test_first_load_errors_raise(tmp_path):
+    with pytest.raises(CatalogError, match="cannot read rule catalog"):
+        get_catalog(tmp_path / "missing.json")
+    bad = tmp_path / "bad.json"
+    bad.write_text("[1, 2]", encoding="utf-8")
+    with pytest.raises(CatalogError, match="top level must be a mapping"):
+        load_spec(bad)
+
+
+def _edit(spec, path, value):
+    spec = copy.deepcopy(spec)
+    *parents, last = path
+    node = spec
+    for key in parents:
+        node = node[key]
+    node[last] = value
+    return spec
+
+
+@pytest.mark.parametrize("path, value, message", [
+    (("service_rules", 0, "param"), "Nonsense", r"service_rules\[0\]: unknown param 'Nonsense'"),
+    (("service_rules", 0, "threshold"), "7", r"service_rules\[0\]: threshold must be an integer, got '7'"),
+    (("service_rules", 0, "threshold"), True, r"threshold must be an integer, got True"),
+    (("service_rules", 0, "above"), "Redshift", r"service_rules\[0\]\.above: expected a list of names"),
+    (("ml_pipeline", 0, "node"), None, r"ml_pipeline\[0\]: missing node name"),
+    (("pillar_rules", "Security", "required"), [], "pillar_rules.Security: needs at least one required service"),
+    (("pillar_rules",), {}, "catalog needs pillar_rules and ml_expected"),
+    (("agents", 0, "role"), 5, r"agents\[0\]: missing role name"),
+    (("ml_stages", 0, "nodes"), ["Not A Node"], r"ml_stages\[0\]: 'Not A Node' is not an ml_pipeline node"),
+])
+def test_schema_errors(spec, path, value, message):
+    with pytest.raises(CatalogError, match=message):
+        Catalog(_edit(spec, path, value))
+
+
+def test_ml_when_must_be_above_or_not_above(spec):
+    i = next(i for i, step in enumerate(spec["ml_pipeline"]) if "param" in step)
+    with pytest.raises(CatalogError, match=rf"ml_pipeline\[{i}\]: when must be 'above' or 'not_above'"):
+        Catalog(_edit(spec, ("ml_pipeline", i, "when"), "below"))
+
+
+def test_node_in_two_stages_is_rejected(spec):
+    node = spec["ml_stages"][0]["nodes"][0]
+    spec["ml_stages"][1]["nodes"].append(node)
+    with pytest.raises(CatalogError, match=rf"ml_stages\[1\]: '{node}' is already in another stage"):
+        Catalog(spec)
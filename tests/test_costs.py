@@ -0,0 +1,33 @@
+import pytest
+
+from catalog import get_catalog
+from costs import SAMPLE_PRICE_LIST, CostModel, PriceIndex, build_index, load_profile, normalize_usage_type
+
+
+@pytest.fixture(scope="module")
+def sample_index(tmp_path_factory):
+    return PriceIndex(build_index([SAMPLE_PRICE_LIST], tmp_path_factory.mktemp("index") / "sample"))
+
+
+def test_every_profiled_service_is_priced_in_every_sample_region(sample_index):
+    catalog, profile = get_catalog(), load_profile()
+    regions = [r for r in sample_index.regions if r != "global"]
+    assert regions
+    for region in regions:
+        model = CostModel(sample_index, profile, catalog, region)
+        assert model.unpriced == [], region
+        for service, items in profile["services"].items():
+            if items and service in catalog.service_index:
+                assert model.monthly_cost([service]) > 0, (region, service)
+
+
+@pytest.mark.parametrize("usage_type, region, expected", [
+    ("EU-TimedStorage-ByteHrs", "eu-west-1", "TimedStorage-ByteHrs"),
+    ("APS2-ETL-DPU-Hour", "ap-southeast-2", "ETL-DPU-Hour"),
+    ("ETL-DPU-Hour", "us-east-1", "ETL-DPU-Hour"),
+    ("KMS-Keys", "us-east-1", "KMS-Keys"),
+    ("QS-User-Enterprise-Month", "us-east-1", "QS-User-Enterprise-Month"),
+    ("US-DataTransfer-Out-Bytes", "global", "US-DataTransfer-Out-Bytes"),
+])
+def test_only_region_prefixes_are_stripped(usage_type, region, expected):
+    assert normalize_usage_type(usage_type, region) == expected
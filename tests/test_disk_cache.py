@@ -0,0 +1,86 @@
+import multiprocessing
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        self.now += 1.0
+        return self.now
+
+
+def test_lru_eviction_keeps_under_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "time", SimpleNamespace(time=Clock().time))
+    monkeypatch.setattr(disk_cache, "TOUCH_INTERVAL_S", 0)
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=10_000)
+    value = b"x" * 900  # about 1 KB a row with the key and overhead
+    for i in range(8):
+        cache.put(f"k{i}", value)
+    assert cache.get("k0") == value  # k0 is now the most recently used
+    for i in range(8, 12):
+        cache.put(f"k{i}", value)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= cache.max_bytes
+    assert stats["evictions"] > 0
+    assert cache.get("k0") == value
+    assert cache.get("k1") is None  # least recently used goes first
+    assert cache.get("k11") == value
+    # The size counter matches the rows that are left
+    conn = sqlite3.connect(cache.path)
+    assert conn.execute("SELECT SUM(size) FROM entries").fetchone()[0] == stats["bytes"]
+
+
+def test_oversized_and_unstorable_values_are_skipped(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_bytes=1_000)
+    cache.put("big", b"x" * 2_000)
+    cache.put("obj", object())
+    assert cache.get("big") is None and cache.get("obj") is None
+    assert cache.stats()["entries"] == 0
+
+
+def _worker(path, worker, n, errors):
+    cache = DiskCache(path, max_bytes=64 * 1024 * 1024)
+    try:
+        for i in range(n):
+            cache.put(f"w{worker}:{i}", {"worker": worker, "i": i, "pad": "x" * 200})
+            cache.put("shared", {"worker": worker, "i": i})
+            assert cache.get(f"w{worker}:{i}") == {"worker": worker, "i": i, "pad": "x" * 200}
+            shared = cache.get("shared")
+            assert shared is not None and set(shared) == {"worker", "i"}
+        assert cache.stats()["errors"] == 0
+    except AssertionError as e:
+        errors.put(f"worker {worker}: {e!r}")
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_processes_share_one_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    DiskCache(path)  # create the schema up front
+    ctx = multiprocessing.get_context("fork")
+    errors = ctx.Queue()
+    workers, n = 4, 150
+    procs = [ctx.Process(target=_worker, args=(path, w, n, errors)) for w in range(workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0] * workers
+    assert errors.empty(), errors.get()
+
+    cache = DiskCache(path)
+    for w in range(workers):
+        for i in range(n):
+            assert cache.get(f"w{w}:{i}")["i"] == i
+    stats = cache.stats()
+    assert stats["entries"] == workers * n + 1
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT SUM(size) FROM entries").fetchone()[0] == stats["bytes"]
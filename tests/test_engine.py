@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from catalog import PARAM_KEYS, PARAM_NAMES, SLIDER_MAX, SLIDER_MIN, get_catalog
+from engine import (DEFAULT_VALUES, array_to_params, decode_ml_nodes, decode_services, evaluate, evaluate_batch,
+                    ml_status, normalize_params, pillar_status)
+
+
+def edge_vectors(cat):
+    """All-min, all-max, the defaults, and every slider on both sides of each of its thresholds."""
+    rows = [[SLIDER_MIN] * len(PARAM_KEYS), [SLIDER_MAX] * len(PARAM_KEYS), DEFAULT_VALUES]
+    for k, cuts in enumerate(cat.slider_thresholds()):
+        for t in cuts:
+            for base in (SLIDER_MIN, SLIDER_MAX):
+                for v in (t, t + 1):
+                    row = [base] * len(PARAM_KEYS)
+                    row[k] = v
+                    rows.append(row)
+    return np.array(rows)
+
+
+def test_scalar_validator_matches_batch_path():
+    cat = get_catalog()
+    values = np.random.default_rng(0).integers(1, 11, size=(500, 10))
+    batch = evaluate_batch(values, cat)
+    passed = pillar_status(batch["services"], cat)["passed"]
+    complete = ml_status(batch["ml_nodes"], cat)["complete"]
+    for i, row in enumerate(values):
+        result = evaluate(array_to_params(row), cat)
+        assert result["confidence"] == float(batch["confidence"][i])
+        assert [r["passed"] for r in result["pillar_checks"].values()] == passed[i].tolist()
+        assert [c["complete"] for c in result["ml_coverage"].values()] == complete[i].tolist()
+
+
+@pytest.mark.parametrize("kind", ["random", "edges"])
+def test_evaluate_batch_matches_evaluate(kind):
+    cat = get_catalog()
+    if kind == "random":
+        values = np.random.default_rng(1).integers(SLIDER_MIN, SLIDER_MAX + 1, size=(1000, len(PARAM_KEYS)))
+    else:
+        values = edge_vectors(cat)
+    batch = evaluate_batch(values, cat)
+    for i, row in enumerate(values):
+        result = evaluate(array_to_params(row), cat)
+        assert batch["confidence"][i] == result["confidence"], row
+        assert decode_services(batch["services"][i], cat) == result["selected_services"], row
+        assert decode_ml_nodes(batch["ml_nodes"][i], cat) == result["ml_pipeline"], row
+
+
+def test_evaluate_batch_rejects_bad_shapes_and_ranges():
+    with pytest.raises(ValueError):
+        evaluate_batch(np.ones((3, len(PARAM_KEYS) - 1), dtype=int))
+    with pytest.raises(ValueError):
+        evaluate_batch(np.full((1, len(PARAM_KEYS)), SLIDER_MAX + 1))
+
+
+def test_normalize_params_accepts_full_keys_and_short_names():
+    params = normalize_params({PARAM_KEYS[0]: 4, "Automation": 9})
+    assert list(params) == PARAM_KEYS
+    assert params[PARAM_KEYS[0]] == 4
+    assert params[PARAM_KEYS[PARAM_NAMES.index("Automation")]] == 9
+    assert normalize_params({}) == dict(zip(PARAM_KEYS, DEFAULT_VALUES))
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"Nonsense": 3}, "unknown slider"),
+    ({"Automation": True}, "must be an integer"),
+    ({"Automation": 5.0}, "must be an integer"),
+    ({"Automation": "5"}, "must be an integer"),
+    ({"Automation": SLIDER_MIN - 1}, "between"),
+    ({"Automation": SLIDER_MAX + 1}, "between"),
+    ([{"Automation": 5}], "expected an object"),
+])
+def test_normalize_params_rejects_bad_input(raw, message):
+    with pytest.raises(ValueError, match=message):
+        normalize_params(raw)
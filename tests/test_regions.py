@@ -0,0 +1,39 @@
+import numpy as np
+
+from catalog import PARAM_KEYS, SLIDER_MAX, get_catalog
+from engine import array_to_params, evaluate
+from regions import get_region_table
+
+
+def test_region_count():
+    table = get_region_table(get_catalog())
+    assert table.n_regions == 2304
+    assert len(table.representatives) == 2304
+    assert table.region_points.sum() == 10 ** len(PARAM_KEYS)
+
+
+def test_lookup_matches_evaluate_for_every_region():
+    cat = get_catalog()
+    table = get_region_table(cat)
+    for region, row in enumerate(table.representatives):
+        params = array_to_params(row)
+        assert table.region_index(params) == region
+        assert table.lookup(params) == evaluate(params, cat), params
+        # The top of each slider's interval lands in the same region
+        top = {k: int(table.lows[j][i] + table.widths[j][i] - 1)
+               for j, (k, i) in enumerate(zip(PARAM_KEYS, table.region_intervals[region]))}
+        assert table.region_index(top) == region
+
+
+def test_lookup_matches_evaluate_at_threshold_boundaries():
+    cat = get_catalog()
+    table = get_region_table(cat)
+    rng = np.random.default_rng(2)
+    for k, cuts in enumerate(table.thresholds):
+        for t in cuts:
+            for v in (t, t + 1):
+                for _ in range(5):
+                    row = rng.integers(1, SLIDER_MAX + 1, size=len(PARAM_KEYS))
+                    row[k] = v
+                    params = array_to_params(row)
+                    assert table.lookup(params) == evaluate(params, cat), params
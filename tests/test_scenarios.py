@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from catalog import PARAM_NAMES, get_catalog
+from engine import array_to_params, evaluate, normalize_params
+from scenarios import ScenarioStore, parse_filter
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ScenarioStore(tmp_path / "scenarios.sqlite", get_catalog())
+
+
+@pytest.fixture
+def saved(store):
+    values = np.random.default_rng(3).integers(1, 11, size=(60, len(PARAM_NAMES)))
+    params = [array_to_params(row) for row in values]
+    ids = store.save_many([(f"s{i}", p) for i, p in enumerate(params)])
+    return {sid: evaluate(p, store.catalog) for sid, p in zip(ids, params)}
+
+
+def _expected(saved, contains=(), excludes=(), lo=None, hi=None):
+    hits = [(r["confidence"], sid) for sid, r in saved.items()
+            if set(contains) <= set(r["selected_services"]) and not set(excludes) & set(r["selected_services"])
+            and (lo is None or r["confidence"] >= lo) and (hi is None or r["confidence"] <= hi)]
+    return [sid for _, sid in sorted(hits, reverse=True)]
+
+
+def test_save_and_get_round_trip(store):
+    params = normalize_params({"Automation": 9, "Security & Compliance": 8})
+    sid = store.save("mine", params)
+    got, result = store.get(sid), evaluate(params, store.catalog)
+    assert got["name"] == "mine" and got["params"] == params
+    assert got["services"] == result["selected_services"]
+    assert got["ml_nodes"] == result["ml_pipeline"]
+    assert got["pillars"] == {p: r["passed"] for p, r in result["pillar_checks"].items()}
+    assert got["confidence"] == result["confidence"]
+    assert store.count() == 1
+    store.delete(sid)
+    with pytest.raises(KeyError):
+        store.get(sid)
+
+
+def test_find_with_parsed_filters(store, saved):
+    services = sorted({s for r in saved.values() for s in r["selected_services"]})
+    common = max(services, key=lambda s: sum(s in r["selected_services"] for r in saved.values()))
+    rare = min(services, key=lambda s: sum(s in r["selected_services"] for r in saved.values()))
+    median = float(np.median([r["confidence"] for r in saved.values()]))
+    cases = [
+        (common, _expected(saved, contains=[common])),
+        (f"not {rare}", _expected(saved, excludes=[rare])),
+        (f"{common} and -{rare}", _expected(saved, contains=[common], excludes=[rare])),
+        (f"confidence >= {median}", _expected(saved, lo=median)),
+        (f"{common.upper()}, confidence <= {median}", _expected(saved, contains=[common], hi=median)),
+        ("", _expected(saved)),
+    ]
+    for text, want in cases:
+        assert [s["id"] for s in store.find(**parse_filter(text, store.catalog))] == want, text
+
+
+def test_find_strict_and_equal_bounds(store, saved):
+    c = next(iter(saved.values()))["confidence"]
+    assert {s["id"] for s in store.find(min_confidence=(">", c))} == {i for i, r in saved.items() if r["confidence"] > c}
+    equal = store.find(**parse_filter(f"confidence = {c}"))
+    assert {s["id"] for s in equal} == {i for i, r in saved.items() if r["confidence"] == c}
+    assert len(store.find(limit=5)) == 5
+
+
+def test_parse_filter_terms():
+    cat = get_catalog()
+    a, b = cat.services[0], cat.services[1]
+    assert parse_filter(f"{a.lower()}, not {b}, confidence > 80", cat) == {
+        "contains": [a], "excludes": [b], "min_confidence": (">", 80.0)}
+    assert parse_filter(f"!{a} AND confidence < 50.5", cat) == {
+        "contains": [], "excludes": [a], "max_confidence": ("<", 50.5)}
+    assert parse_filter("confidence == 70", cat)["min_confidence"] == ("=", 70.0)
+
+
+@pytest.mark.parametrize("text", ["Not A Service", "confidence ~ 80", "confidence > high", "not", f"{get_catalog().services[0]}, bogus"])
+def test_parse_filter_rejects_bad_terms(text):
+    with pytest.raises(ValueError, match="unknown filter term"):
+        parse_filter(text, get_catalog())
+
+
+def test_diff_uses_stored_bitmasks(store):
+    pa = normalize_params({"Security & Compliance": 2, "Model Complexity": 3})
+    pb = normalize_params({"Security & Compliance": 10, "Model Complexity": 9, "Automation": 10})
+    a, b = store.save("a", pa), store.save("b", pb)
+    ra, rb = evaluate(pa, store.catalog), evaluate(pb, store.catalog)
+    d = store.diff(a, b)
+    assert d["sliders"] == {PARAM_NAMES[k]: [pa[key], pb[key]] for k, key in enumerate(pa) if pa[key] != pb[key]}
+    sa, sb = set(ra["selected_services"]), set(rb["selected_services"])
+    assert set(d["services"]["added"]) == sb - sa and set(d["services"]["removed"]) == sa - sb
+    assert d["services"]["added"] or d["services"]["removed"]
+    ma, mb = set(ra["ml_pipeline"]), set(rb["ml_pipeline"])
+    assert set(d["ml_nodes"]["added"]) == mb - ma and set(d["ml_nodes"]["removed"]) == ma - mb
+    assert d["pillars"] == {p: ["PASS" if ra["pillar_checks"][p]["passed"] else "WARN",
+                                "PASS" if rb["pillar_checks"][p]["passed"] else "WARN"]
+                            for p in ra["pillar_checks"] if ra["pillar_checks"][p]["passed"] != rb["pillar_checks"][p]["passed"]}
+    assert d["confidence"] == [ra["confidence"], rb["confidence"]]
+    same = store.diff(a, a)
+    assert same["sliders"] == {} and same["services"] == {"added": [], "removed": []} and same["pillars"] == {}
+
+
+def test_compare_counts_bit_differences(store, saved):
+    ref = next(iter(saved))
+    rows = {r["id"]: r for r in store.compare(ref)}
+    base = set(saved[ref]["selected_services"])
+    for sid, r in saved.items():
+        assert rows[sid]["services_changed"] == len(base ^ set(r["selected_services"]))
+    assert store.compare(ref, limit=1)[0]["id"] == ref
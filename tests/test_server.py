@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+
+from server import ScoringServer
+
+
+def failing_scorer(requests):
+    raise RuntimeError("scorer exploded")
+
+
+async def _request(port, method, path, body=b"", length=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    length = len(body) if length is None else length
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+    length = int(next(line.split(":")[1] for line in head.split("\r\n") if line.lower().startswith("content-length")))
+    payload = json.loads(await reader.readexactly(length))
+    writer.close()
+    return int(head.split()[1]), payload
+
+
+def test_scorer_failure_returns_500_and_server_keeps_serving(caplog):
+    async def run():
+        app = ScoringServer(window_ms=1, scorer=failing_scorer)
+        server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            failed = await _request(port, "POST", "/score", b'{"Automation": 9}')
+            health = await _request(port, "GET", "/healthz")
+        finally:
+            server.close()
+            await server.wait_closed()
+            app.batcher.close()
+        return failed, health
+
+    (status, payload), (health_status, _) = asyncio.run(run())
+    assert status == 500
+    assert payload == {"error": "internal server error"}
+    assert health_status == 200
+    assert "scorer exploded" in caplog.text
+
+
+@pytest.mark.parametrize("length", ["-5", "abc"])
+def test_invalid_content_length_is_a_400(length):
+    async def run():
+        app = ScoringServer(window_ms=1)
+        server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await _request(port, "POST", "/score", b'{"Automation": 9}', length=length)
+        finally:
+            server.close()
+            await server.wait_closed()
+            app.batcher.close()
+
+    assert asyncio.run(run()) == (400, {"error": "invalid Content-Length"})
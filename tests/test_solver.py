@@ -0,0 +1,83 @@
+import pytest
+
+from catalog import get_catalog
+from costs import get_cost_model
+from engine import evaluate_batch, ml_status, pillar_status
+from regions import get_region_table
+from solver import solve
+
+
+def brute_force(pillars, areas, min_confidence, objective):
+    """Every feasible distinct architecture over the region table, best first: [(objective, confidence)]."""
+    cat = get_catalog()
+    cost_model = get_cost_model(None, cat)
+    pillar_names, area_names = list(cat.pillar_rules), list(cat.ml_expected)
+    table = get_region_table(cat)
+    assert table.n_regions == 2304
+    out = evaluate_batch(table.representatives, cat)
+    passed = pillar_status(out["services"], cat)["passed"]
+    complete = ml_status(out["ml_nodes"], cat)["complete"]
+    best = {}
+    for r in range(table.n_regions):
+        if out["confidence"][r] < min_confidence:
+            continue
+        if not all(passed[r, pillar_names.index(p)] for p in pillars):
+            continue
+        if not all(complete[r, area_names.index(a)] for a in areas):
+            continue
+        key = (out["services"][r].tobytes(), out["ml_nodes"][r].tobytes())
+        names = [cat.services[b] for b in range(len(cat.services)) if int(out["services"][r][b // 64]) >> (b % 64) & 1]
+        value = round(cost_model.monthly_cost(names), 2) if objective == "cost" else len(names)
+        best[key] = max(best.get(key, (value, -1.0)), (value, float(out["confidence"][r])), key=lambda e: e[1])
+    return sorted(best.values(), key=lambda e: (e[0], -e[1]))
+
+
+TARGETS = [
+    ((), (), 0.0, "cost"),
+    (("Security",), (), 0.0, "cost"),
+    (("Security", "Reliability"), (), 70.0, "cost"),
+    (("Performance", "Operational Excellence"), ("Data",), 0.0, "cost"),
+    (("Cost Optimization",), ("Deployment",), 60.0, "complexity"),
+    ((), ("Data", "Deployment"), 75.0, "complexity"),
+]
+
+
+@pytest.mark.parametrize("pillars, areas, min_confidence, objective", TARGETS)
+def test_solve_returns_the_brute_force_top_k(pillars, areas, min_confidence, objective):
+    k = 5
+    expected = brute_force(pillars, areas, min_confidence, objective)
+    out = solve(pillars, areas, min_confidence, objective, k=k, time_budget_s=60)
+    assert out["complete"] and out["infeasible"] is None
+    assert expected, "target set should be feasible"
+    key = "cost" if objective == "cost" else "services"
+    got = [s[key] for s in out["solutions"]]
+    assert got == pytest.approx([v for v, _ in expected[:k]])
+    for s in out["solutions"]:
+        assert s["confidence"] >= min_confidence
+        assert set(pillars) <= set(s["pillars_passed"]) and set(areas) <= set(s["ml_complete"])
+
+
+def test_solve_params_reproduce_the_solution():
+    cat = get_catalog()
+    out = solve(("Security", "Reliability"), (), 70.0, k=3, time_budget_s=60)
+    table = get_region_table(cat)
+    for s in out["solutions"]:
+        assert table.lookup(s["params"])["selected_services"] == s["selected_services"]
+
+
+def test_solve_explains_infeasible_targets():
+    out = solve(min_confidence=101, time_budget_s=60)
+    assert out["solutions"] == [] and out["infeasible"] == "no setting reaches confidence 101"
+    out = solve(ml_areas=("Modeling",), time_budget_s=60)
+    assert out["solutions"] == []
+    assert out["infeasible"].startswith("ML area Modeling can never be complete (no rule produces ")
+    assert brute_force((), ("Modeling",), 0.0, "cost") == []
+
+
+def test_solve_rejects_unknown_targets():
+    with pytest.raises(ValueError, match="unknown pillar"):
+        solve(pillars=("Speed",))
+    with pytest.raises(ValueError, match="unknown ML area"):
+        solve(ml_areas=("Training",))
+    with pytest.raises(ValueError, match="objective"):
+        solve(objective="latency")
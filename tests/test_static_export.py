@@ -0,0 +1,23 @@
+import static_export
+from costs import get_cost_model, get_price_index
+from engine import normalize_params
+from static_export import export_key, render_html
+
+
+def test_export_is_priced_and_keyed_by_region():
+    params = normalize_params({"Model Complexity": 9})
+    default = get_cost_model().region
+    other = next(r for r in get_price_index().regions if r not in ("global", default))
+    assert export_key(params) == export_key(params, region=default)
+    assert export_key(params, region=other) != export_key(params)
+    page = render_html(params, region=other)
+    assert f"on-demand list prices, {other})" in page
+
+
+def test_bad_renderer_output_falls_back(monkeypatch):
+    monkeypatch.setattr(static_export, "to_svg", lambda graph: "<html>dot failed</html>")
+    monkeypatch.setattr(static_export, "to_plot_svg", lambda graph, **kwargs: '<?xml version="1.0"?>\n<svg id="plot"></svg>')
+    assert static_export._inline_svg("no element") is None
+    assert '<svg id="plot"></svg>' in static_export._diagram("AWS architecture", None)
+    monkeypatch.setattr(static_export, "to_plot_svg", lambda graph, **kwargs: "")
+    assert "Diagram unavailable." in static_export._diagram("AWS architecture", None)
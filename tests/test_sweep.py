@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from catalog import PARAM_KEYS, PARAM_NAMES, get_catalog
+from engine import evaluate, evaluate_batch, normalize_params, pillar_status, popcount
+from sweep import PAIRS, sweep_pairs, sweep_sliders
+
+BASELINES = [{}, {"Security & Compliance": 9, "Model Complexity": 8}, {name: 10 for name in PARAM_NAMES}]
+
+
+def _outcome(params, cat):
+    r = evaluate(params, cat)
+    return r["selected_services"], r["ml_pipeline"], [v["passed"] for v in r["pillar_checks"].values()], r["confidence"]
+
+
+@pytest.mark.parametrize("raw", BASELINES)
+def test_flips_sit_on_slider_thresholds(raw):
+    cat = get_catalog()
+    params = normalize_params(raw)
+    out = sweep_sliders(params, cat)
+    flips = {(f["slider"], f["from"]) for f in out["flips"]}
+    assert all(f["to"] == f["from"] + 1 for f in out["flips"])
+    for k, cuts in enumerate(cat.slider_thresholds()):
+        for v in range(1, 10):
+            below = _outcome({**params, PARAM_KEYS[k]: v}, cat)
+            above = _outcome({**params, PARAM_KEYS[k]: v + 1}, cat)
+            # A step flips exactly when it crosses a threshold that changes the outcome
+            assert ((PARAM_NAMES[k], v) in flips) == (below != above), (PARAM_NAMES[k], v)
+            if below != above:
+                assert v in cuts
+
+
+def test_flip_details_match_evaluate():
+    cat = get_catalog()
+    params = normalize_params({"Security & Compliance": 9})
+    for f in sweep_sliders(params, cat)["flips"]:
+        k = PARAM_NAMES.index(f["slider"])
+        a = evaluate({**params, PARAM_KEYS[k]: f["from"]}, cat)
+        b = evaluate({**params, PARAM_KEYS[k]: f["to"]}, cat)
+        assert f["added_services"] == sorted(set(b["selected_services"]) - set(a["selected_services"]))
+        assert f["removed_services"] == sorted(set(a["selected_services"]) - set(b["selected_services"]))
+        assert f["confidence"] == [a["confidence"], b["confidence"]]
+
+
+@pytest.mark.parametrize("raw", BASELINES)
+def test_pairwise_grid_equals_evaluate_batch(raw):
+    cat = get_catalog()
+    params = normalize_params(raw)
+    base = np.array([params[k] for k in PARAM_KEYS])
+    out = sweep_pairs(params, cat)
+    assert len(out["pairs"]) == len(PAIRS) == 45
+    rows = []
+    for a, b in PAIRS:
+        for va in range(1, 11):
+            for vb in range(1, 11):
+                row = base.copy()
+                row[a], row[b] = va, vb
+                rows.append(row)
+    batch = evaluate_batch(np.array(rows), cat)
+    base_batch = evaluate_batch(base[None, :], cat)
+    shape = (len(PAIRS), 10, 10)
+    assert (out["confidence"] == batch["confidence"].reshape(shape)).all()
+    assert (out["services_changed"] == popcount(batch["services"] ^ base_batch["services"]).reshape(shape)).all()
+    assert (out["ml_changed"] == popcount(batch["ml_nodes"] ^ base_batch["ml_nodes"]).reshape(shape)).all()
+    passed = pillar_status(batch["services"], cat)["passed"].sum(axis=-1)
+    assert (out["pillars_passed"] == passed.reshape(shape)).all()